@@ -9,12 +9,56 @@ from .models import (
     Performance,
     Ticket
 )
+from .pagination import EstimatedCountPaginator
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Changelist that neither counts nor sorts the whole table."""
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+
+
+@admin.register(Play)
+class PlayAdmin(admin.ModelAdmin):
+    search_fields = ("title",)
+
+
+@admin.register(Performance)
+class PerformanceAdmin(LargeTableAdmin):
+    list_display = ("id", "play", "theatre_hall", "show_time", "tickets_sold")
+    list_select_related = ("play", "theatre_hall")
+    list_filter = ("theatre_hall",)
+    date_hierarchy = "show_time"
+    ordering = ("-show_time", "-id")
+    autocomplete_fields = ("play",)
+    search_fields = ("play__title",)
+
+
+@admin.register(Reservation)
+class ReservationAdmin(LargeTableAdmin):
+    list_display = ("id", "user", "created_at")
+    list_select_related = ("user",)
+    date_hierarchy = "created_at"
+    ordering = ("-created_at", "-id")
+    autocomplete_fields = ("user",)
+    search_fields = ("=user__email",)
+
+
+@admin.register(Ticket)
+class TicketAdmin(LargeTableAdmin):
+    list_display = ("id", "row", "seat", "performance", "reservation")
+    list_select_related = (
+        "performance__play",
+        "reservation__user",
+    )
+    ordering = ("-id",)
+    autocomplete_fields = ("performance",)
+    raw_id_fields = ("reservation",)
+    search_fields = ("=reservation__user__email",)
 
 
-admin.site.register(Reservation)
 admin.site.register(Genre)
 admin.site.register(Actor)
-admin.site.register(Play)
 admin.site.register(TheatreHall)
-admin.site.register(Performance)
-admin.site.register(Ticket)
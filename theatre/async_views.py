@@ -0,0 +1,216 @@
+from asgiref.sync import sync_to_async
+from django.http import Http404, HttpResponse, JsonResponse
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.utils.encoders import JSONEncoder
+
+from .cache import CachedListMixin
+from .conditional import NotModified
+from .db import primary_pinning
+from .models import Performance, Play
+from .occupancy import get_occupancy
+from .pagination import PerformancePagination, PlayPagination
+from .seat_map import build_seat_map, get_seat_map_encoding
+from .serializers import (
+    PerformanceDetailSerializer,
+    PerformanceListSerializer,
+    PlayDetailSerializer,
+    PlayListSerializer,
+)
+from .views import (
+    PerformanceViewSet,
+    PlayViewSet,
+    filter_performances,
+    filter_plays,
+)
+
+
+class AsyncReadView(View):
+    """Read-only endpoint running natively under ASGI.
+
+    ``viewset`` and ``action`` name the DRF action the endpoint mirrors.
+    Its authentication, permissions, throttling, ETags and list response
+    cache run in one worker thread hop; the queries use the async ORM and
+    the serializers only see prefetched data.
+    """
+
+    http_method_names = ["get"]
+    viewset = None
+    action = None
+
+    def initialize_request(self, request, kwargs):
+        api_view = self.viewset(
+            action_map={"get": self.action},
+            args=(),
+            kwargs=kwargs,
+            headers={},
+            format_kwarg=None,
+        )
+        api_view.request = api_view.initialize_request(request)
+        self.api_view = api_view
+        api_view.initial(api_view.request)
+
+        self.cache_key = self.cached_data = None
+        if self.action == "list" and isinstance(api_view, CachedListMixin):
+            self.cache_key, self.cached_data = api_view.get_cached_data(
+                api_view.request
+            )
+
+        return api_view.request
+
+    def error_response(self, exc):
+        """Render the error the way the viewset does, with the same body,
+        status and headers."""
+        response = self.api_view.handle_exception(exc)
+        headers = {
+            name: value
+            for name, value in response.items()
+            if name.lower() != "content-type"
+        }
+
+        return JsonResponse(
+            response.data,
+            status=response.status_code,
+            headers=headers,
+            encoder=JSONEncoder,
+            safe=False,
+        )
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            drf_request = await sync_to_async(self.initialize_request)(
+                request, kwargs
+            )
+            if self.cache_key is None:
+                response = JsonResponse(
+                    await self.get_data(drf_request, **kwargs),
+                    encoder=JSONEncoder,
+                    safe=False,
+                )
+            else:
+                response = await self.get_cached_response(
+                    drf_request, **kwargs
+                )
+        except NotModified:
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+        except (exceptions.APIException, Http404) as exc:
+            response = self.error_response(exc)
+
+        return self.api_view.add_validators(response)
+
+    async def get_cached_response(self, request, **kwargs):
+        """Serve the data cached by the viewset, or build it from the
+        primary and cache it."""
+        data, cache_status = self.cached_data, "HIT"
+
+        if data is None:
+            with primary_pinning(True):
+                data = await self.get_data(request, **kwargs)
+            await sync_to_async(self.api_view.set_cached_data)(
+                self.cache_key, data
+            )
+            cache_status = "MISS"
+
+        response = JsonResponse(data, encoder=JSONEncoder, safe=False)
+        response["X-Cache"] = cache_status
+        return response
+
+    async def get_data(self, request, **kwargs):
+        raise NotImplementedError
+
+
+async def _paginate(paginator, queryset, request):
+    page = paginator.get_page_queryset(queryset, request)
+    return paginator.paginate_results([item async for item in page])
+
+
+async def _get_object(queryset, pk):
+    try:
+        return await queryset.aget(pk=pk)
+    except (queryset.model.DoesNotExist, ValueError):
+        raise Http404
+
+
+class PerformanceListView(AsyncReadView):
+    viewset = PerformanceViewSet
+    action = "list"
+
+    async def get_data(self, request):
+        paginator = PerformancePagination()
+        queryset = filter_performances(
+            Performance.objects.select_related("play", "theatre_hall"),
+            request.query_params,
+        )
+        performances = await _paginate(paginator, queryset, request)
+        serializer = PerformanceListSerializer(
+            performances, many=True, context={"request": request}
+        )
+
+        return paginator.get_paginated_data(serializer.data)
+
+
+class PerformanceDetailView(AsyncReadView):
+    viewset = PerformanceViewSet
+    action = "retrieve"
+
+    async def get_data(self, request, pk):
+        performance = await _get_object(
+            Performance.objects.select_related(
+                "play", "theatre_hall"
+            ).prefetch_related("play__genres", "play__actors"),
+            pk,
+        )
+        occupancy = await sync_to_async(get_occupancy)(performance)
+        serializer = PerformanceDetailSerializer(
+            performance,
+            context={"request": request, "occupancy": occupancy},
+        )
+
+        return serializer.data
+
+
+class PerformanceSeatMapView(AsyncReadView):
+    viewset = PerformanceViewSet
+    action = "seat_map"
+
+    async def get_data(self, request, pk):
+        encoding = get_seat_map_encoding(request.query_params)
+        performance = await _get_object(
+            Performance.objects.select_related("theatre_hall"), pk
+        )
+        occupancy = await sync_to_async(get_occupancy)(performance)
+
+        return await sync_to_async(build_seat_map)(
+            performance, occupancy, encoding
+        )
+
+
+class PlayListView(AsyncReadView):
+    viewset = PlayViewSet
+    action = "list"
+
+    async def get_data(self, request):
+        paginator = PlayPagination()
+        queryset = await sync_to_async(filter_plays)(
+            Play.objects.prefetch_related("genres", "actors"),
+            request.query_params,
+        )
+        plays = await _paginate(paginator, queryset, request)
+        serializer = PlayListSerializer(
+            plays, many=True, context={"request": request}
+        )
+
+        return paginator.get_paginated_data(serializer.data)
+
+
+class PlayDetailView(AsyncReadView):
+    viewset = PlayViewSet
+    action = "retrieve"
+
+    async def get_data(self, request, pk):
+        play = await _get_object(
+            Play.objects.prefetch_related("genres", "actors"), pk
+        )
+        serializer = PlayDetailSerializer(play, context={"request": request})
+
+        return serializer.data
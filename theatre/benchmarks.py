@@ -0,0 +1,289 @@
+import json
+import logging
+import math
+import subprocess
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from contextlib import contextmanager
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework.views import APIView
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .models import Performance, Play, Reservation, TheatreHall
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+
+    index = max(math.ceil(fraction * len(sorted_values)) - 1, 0)
+    return sorted_values[index]
+
+
+def summarize(latencies, elapsed, errors=0):
+    """Latency percentiles in milliseconds and throughput per second."""
+    latencies = sorted(latencies)
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput": round(len(latencies) / elapsed, 2) if elapsed else None,
+        "p50_ms": _to_ms(percentile(latencies, 0.50)),
+        "p95_ms": _to_ms(percentile(latencies, 0.95)),
+        "p99_ms": _to_ms(percentile(latencies, 0.99)),
+    }
+
+
+def _to_ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+def auth_headers(user):
+    return {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(user)}"}
+
+
+def asgi_headers(headers):
+    """Header arguments of ``AsyncClient`` for ``HTTP_*`` environ keys."""
+    return {
+        key.removeprefix("HTTP_").lower().replace("_", "-"): value
+        for key, value in headers.items()
+    }
+
+
+@contextmanager
+def timed():
+    timer = {"start": time.perf_counter()}
+    yield timer
+    timer["elapsed"] = time.perf_counter() - timer["start"]
+
+
+@contextmanager
+def throttling_disabled():
+    """Keep request throttles from turning a benchmark into 429s."""
+    with mock.patch.object(APIView, "throttle_classes", ()):
+        yield
+
+
+@contextmanager
+def benchmark_environment():
+    """Settings the test clients need outside of the test runner."""
+    request_logger = logging.getLogger("django.request")
+    level = request_logger.level
+    request_logger.setLevel(logging.ERROR)
+
+    try:
+        with override_settings(ALLOWED_HOSTS=["testserver"]):
+            yield
+    finally:
+        request_logger.setLevel(level)
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class ClientTransport:
+    """In-process requests through the Django test client."""
+
+    def __init__(self, headers):
+        self.client = Client(**headers)
+        self.client.raise_request_exception = False
+
+    def request(self, method, path, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(
+                path, data, content_type="application/json"
+            )
+
+        return response.status_code, len(queries.captured_queries)
+
+    def close(self):
+        connection.close()
+
+
+class HttpTransport:
+    """Requests against a running server, without query counts."""
+
+    def __init__(self, base_url, headers):
+        self.base_url = base_url.rstrip("/")
+        self.headers = {
+            "Content-Type": "application/json",
+            **{
+                key.removeprefix("HTTP_").title().replace("_", "-"): value
+                for key, value in headers.items()
+            },
+        }
+
+    def request(self, method, path, data=None):
+        body = None if data is None else json.dumps(data).encode()
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=body,
+            headers=self.headers,
+            method=method.upper(),
+        )
+
+        try:
+            with urllib.request.urlopen(request) as response:
+                response.read()
+                return response.status, None
+        except urllib.error.HTTPError as error:
+            return error.code, None
+        except urllib.error.URLError:
+            return None, None
+
+    def close(self):
+        pass
+
+
+class RequestStats:
+    def __init__(self):
+        self.latencies = []
+        self.statuses = Counter()
+        self.queries = []
+
+    def add(self, latency, status_code, queries):
+        self.latencies.append(latency)
+        self.statuses[status_code] += 1
+        if queries is not None:
+            self.queries.append(queries)
+
+    def merge(self, other):
+        self.latencies += other.latencies
+        self.statuses.update(other.statuses)
+        self.queries += other.queries
+
+    def summarize(self, elapsed):
+        errors = sum(
+            count
+            for status_code, count in self.statuses.items()
+            if status_code is None or status_code >= 500
+        )
+        summary = summarize(self.latencies, elapsed, errors)
+        summary["statuses"] = {
+            str(status_code): count
+            for status_code, count in sorted(
+                self.statuses.items(), key=lambda item: str(item[0])
+            )
+        }
+        summary["queries_per_request"] = (
+            round(sum(self.queries) / len(self.queries), 2)
+            if self.queries
+            else None
+        )
+        return summary
+
+
+def seed_catalog(halls, plays, performances, users, prefix="Bench"):
+    """Create the halls, plays, performances and staff users to load.
+
+    Objects are looked up by their ``prefix`` names first, so repeated
+    runs reuse the existing data. Reservations of the benchmark users are
+    dropped to start every run from the same empty halls.
+    """
+    hall_objects = [
+        TheatreHall.objects.get_or_create(
+            name=f"{prefix} hall {index}",
+            defaults={"rows": 20, "seats_in_row": 30},
+        )[0]
+        for index in range(halls)
+    ]
+    play_objects = [
+        Play.objects.get_or_create(
+            title=f"{prefix} play {index}",
+            defaults={"description": f"{prefix} description"},
+        )[0]
+        for index in range(plays)
+    ]
+
+    existing = Performance.objects.filter(play__in=play_objects).count()
+    start = timezone.now() + timedelta(days=1)
+    Performance.objects.bulk_create(
+        [
+            Performance(
+                play=play_objects[index % plays],
+                theatre_hall=hall_objects[index % halls],
+                show_time=start + timedelta(hours=index),
+            )
+            for index in range(existing, performances)
+        ]
+    )
+
+    user_model = get_user_model()
+    user_objects = []
+    for index in range(users):
+        user, created = user_model.objects.get_or_create(
+            email=f"{prefix.lower()}-user-{index}@example.com",
+            defaults={"is_staff": True},
+        )
+        if created:
+            user.set_unusable_password()
+            user.save(update_fields=["password"])
+        user_objects.append(user)
+
+    Reservation.objects.filter(user__in=user_objects).delete()
+
+    performance_ids = list(
+        Performance.objects.filter(play__in=play_objects)
+        .order_by("id")
+        .values_list("id", flat=True)[:performances]
+    )
+    return performance_ids, user_objects
+
+
+def load_catalog(performances, users, prefix="Bench"):
+    """The performance ids and users of a catalog seeded earlier, without
+    writing anything."""
+    performance_ids = list(
+        Performance.objects.filter(play__title__startswith=f"{prefix} play ")
+        .order_by("id")
+        .values_list("id", flat=True)[:performances]
+    )
+    user_objects = list(
+        get_user_model()
+        .objects.filter(
+            email__in=[
+                f"{prefix.lower()}-user-{index}@example.com"
+                for index in range(users)
+            ]
+        )
+        .order_by("id")
+    )
+    return performance_ids, user_objects
+
+
+def compare_results(current, baseline):
+    """Relative change of every endpoint metric against ``baseline``."""
+    changes = {}
+
+    for name, stats in current["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(name)
+        if previous is None:
+            continue
+
+        changes[name] = {
+            metric: round(
+                (stats[metric] - previous[metric]) / previous[metric], 3
+            )
+            for metric in ("throughput", "p50_ms", "p95_ms", "p99_ms")
+            if stats.get(metric) and previous.get(metric)
+        }
+
+    return changes
@@ -0,0 +1,142 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .cache import bump_version
+from .models import Performance, Reservation, SeatHold, Ticket
+from .rollups import adjust_rollup_seats
+
+
+def _seat_error(performance_id, row, seat, detail):
+    return {
+        "performance": performance_id,
+        "row": row,
+        "seat": seat,
+        "detail": detail,
+    }
+
+
+def adjust_tickets_sold(performance_id, delta):
+    Performance.objects.filter(pk=performance_id).update(
+        tickets_sold=Greatest(F("tickets_sold") + delta, 0)
+    )
+    adjust_rollup_seats(performance_id, delta)
+
+
+def validate_seats(seats, hold_token=None):
+    """Validate (performance_id, row, seat) triples in a fixed number of
+    queries and return the loaded performances with every seat error.
+
+    Seats held by anyone except the owner of ``hold_token`` count as taken.
+    """
+    performances = Performance.objects.select_related(
+        "theatre_hall"
+    ).in_bulk({performance_id for performance_id, _, _ in seats})
+    errors = []
+    requested = set()
+
+    for performance_id, row, seat in seats:
+        performance = performances.get(performance_id)
+
+        if performance is None:
+            errors.append(
+                _seat_error(
+                    performance_id, row, seat, "Performance does not exist."
+                )
+            )
+            continue
+
+        if (performance_id, row, seat) in requested:
+            errors.append(
+                _seat_error(
+                    performance_id, row, seat, "Seat is requested twice."
+                )
+            )
+            continue
+
+        requested.add((performance_id, row, seat))
+
+        try:
+            Ticket.validate_seat(
+                row, seat, performance.theatre_hall, ValidationError
+            )
+        except ValidationError as error:
+            for details in error.detail.values():
+                errors.append(
+                    _seat_error(performance_id, row, seat, " ".join(details))
+                )
+
+    seat_filter = {
+        "performance_id__in": performances.keys(),
+        "row__in": {row for _, row, _ in requested},
+        "seat__in": {seat for _, _, seat in requested},
+    }
+    taken = set(
+        Ticket.objects.filter(**seat_filter).values_list(
+            "performance_id", "row", "seat"
+        )
+    )
+    for performance_id, row, seat in sorted(requested & taken):
+        errors.append(
+            _seat_error(performance_id, row, seat, "Seat is already taken.")
+        )
+
+    held = set(
+        SeatHold.objects.filter(expires_at__gt=timezone.now(), **seat_filter)
+        .exclude(token=hold_token)
+        .values_list("performance_id", "row", "seat")
+    )
+    for performance_id, row, seat in sorted((requested & held) - taken):
+        errors.append(
+            _seat_error(performance_id, row, seat, "Seat is on hold.")
+        )
+
+    return performances, errors
+
+
+def create_reservation(user, tickets, hold_token=None):
+    """Create a reservation with all its tickets in one bulk insert.
+
+    Every conflicting seat is reported at once in a ValidationError.
+    """
+    seats = [
+        (ticket["performance_id"], ticket["row"], ticket["seat"])
+        for ticket in tickets
+    ]
+    _, errors = validate_seats(seats, hold_token=hold_token)
+
+    if errors:
+        raise ValidationError({"tickets": errors})
+
+    seats_by_performance = {}
+    for performance_id, row, seat in seats:
+        seats_by_performance.setdefault(performance_id, []).append(
+            (row, seat)
+        )
+
+    try:
+        with transaction.atomic():
+            reservation = Reservation.objects.create(user=user)
+            Ticket.objects.bulk_create(
+                [
+                    Ticket(
+                        performance_id=performance_id,
+                        row=row,
+                        seat=seat,
+                        reservation=reservation,
+                    )
+                    for performance_id, row, seat in seats
+                ]
+            )
+            for performance_id, taken in seats_by_performance.items():
+                adjust_tickets_sold(performance_id, len(taken))
+                bump_version((Performance, performance_id))
+            bump_version(Ticket)
+    except IntegrityError:
+        raise ValidationError(
+            {"tickets": ["Some of the seats were taken by another booking."]}
+        )
+
+    return reservation
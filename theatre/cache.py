@@ -0,0 +1,163 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from .db import primary_pinning
+
+VERSION_KEY = "theatre:version:{label}"
+RESPONSE_KEY = "theatre:response:{digest}"
+STATS_KEY = "theatre:response-cache:{event}"
+CACHE_EVENTS = ("hit", "miss")
+
+
+def get_response_cache():
+    return caches[getattr(settings, "THEATRE_RESPONSE_CACHE", "default")]
+
+
+def get_version_cache():
+    return caches[getattr(settings, "THEATRE_VERSION_CACHE", "default")]
+
+
+def _version_key(source):
+    if isinstance(source, tuple):
+        model, pk = source
+        return VERSION_KEY.format(label=f"{model._meta.label_lower}:{pk}")
+
+    return VERSION_KEY.format(label=source._meta.label_lower)
+
+
+def _version_timeout(source):
+    """Row stamps expire, any pk in a URL would otherwise keep its key
+    forever. A stamp created again is newer, so nothing stale matches."""
+    if isinstance(source, tuple):
+        return getattr(settings, "THEATRE_ROW_VERSION_TIMEOUT", 86_400)
+
+    return None
+
+
+def get_versions(sources):
+    """Return the current version stamp of every source, in order.
+
+    A source is a model class or a ``(model, pk)`` pair for one row.
+    Stamps live in the version cache shared by every worker and are
+    nanosecond timestamps, so a version evicted from the cache is never
+    replaced by a value that was already used before.
+    """
+    cache = get_version_cache()
+    keys = [_version_key(source) for source in sources]
+    versions = cache.get_many(keys)
+
+    for source, key in zip(sources, keys):
+        if key not in versions:
+            cache.add(key, time.time_ns(), timeout=_version_timeout(source))
+            versions[key] = cache.get(key)
+
+    return [versions[key] for key in keys]
+
+
+def _set_version(key, timeout):
+    get_version_cache().set(key, time.time_ns(), timeout=timeout)
+
+
+def bump_version(source):
+    """Invalidate responses built from the model or ``(model, pk)`` row.
+
+    The version changes right away and once more after commit, so a
+    response cached from data read before the commit is not reused.
+    """
+    key, timeout = _version_key(source), _version_timeout(source)
+    _set_version(key, timeout)
+    transaction.on_commit(lambda: _set_version(key, timeout))
+
+
+def record_cache_event(event):
+    cache = get_response_cache()
+    key = STATS_KEY.format(event=event)
+    cache.add(key, 0, timeout=None)
+
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def get_cache_stats():
+    cache = get_response_cache()
+    keys = {event: STATS_KEY.format(event=event) for event in CACHE_EVENTS}
+    values = cache.get_many(keys.values())
+
+    return {event: values.get(key, 0) for event, key in keys.items()}
+
+
+def reset_cache_stats():
+    get_response_cache().delete_many(
+        [STATS_KEY.format(event=event) for event in CACHE_EVENTS]
+    )
+
+
+class CachedListMixin:
+    """Cache list responses of read-mostly catalog viewsets.
+
+    Cache keys include the versions of ``cache_models``, which are bumped
+    by signals whenever one of those models changes. Misses read from the
+    primary, a lagging replica would otherwise be cached under the new
+    version.
+    """
+
+    cache_models = ()
+
+    def get_response_cache_key(self, request):
+        versions = get_versions(self.cache_models)
+        raw_key = ":".join(
+            [
+                self.action,
+                request.accepted_renderer.format,
+                request.build_absolute_uri(),
+                *map(str, versions),
+            ]
+        )
+
+        return RESPONSE_KEY.format(
+            digest=hashlib.md5(raw_key.encode()).hexdigest()
+        )
+
+    def get_cached_data(self, request):
+        """Return the cache key of the request and the data cached under
+        it, ``None`` on a miss."""
+        key = self.get_response_cache_key(request)
+        data = get_response_cache().get(key)
+        record_cache_event("miss" if data is None else "hit")
+
+        return key, data
+
+    def set_cached_data(self, key, data):
+        get_response_cache().set(
+            key,
+            data,
+            timeout=getattr(settings, "THEATRE_RESPONSE_CACHE_TIMEOUT", 600),
+        )
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        key, data = self.get_cached_data(request)
+
+        if data is not None:
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+            return response
+
+        with primary_pinning(True):
+            response = handler(request, *args, **kwargs)
+
+        if response.status_code == status.HTTP_200_OK:
+            self.set_cached_data(key, response.data)
+
+        response["X-Cache"] = "MISS"
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
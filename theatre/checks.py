@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+# Caches every worker has to see the same writes in: version stamps, and
+# the users resolved from JWTs with their is_active and is_staff flags
+SHARED_CACHE_SETTINGS = ("THEATRE_VERSION_CACHE", "USER_AUTH_CACHE")
+
+
+@checks.register(checks.Tags.caches, deploy=True)
+def check_shared_caches(app_configs, **kwargs):
+    """Caches kept per process leave the other workers serving stale
+    data after a write."""
+    errors = []
+
+    for setting in SHARED_CACHE_SETTINGS:
+        alias = getattr(settings, setting, "default")
+
+        if isinstance(caches[alias], (DummyCache, LocMemCache)):
+            errors.append(
+                checks.Warning(
+                    f"{setting} uses the process-local cache '{alias}'.",
+                    hint=(
+                        "Point it at a cache every worker shares, e.g. a "
+                        "file, database, Redis or Memcached backend."
+                    ),
+                    id="theatre.W001",
+                )
+            )
+
+    return errors
@@ -0,0 +1,92 @@
+import hashlib
+
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+from .cache import get_versions
+
+
+class NotModified(APIException):
+    status_code = status.HTTP_304_NOT_MODIFIED
+
+
+class ConditionalGetMixin:
+    """Answer conditional GETs from version stamps before any DB query.
+
+    ``get_version_sources`` lists the models (or ``(model, pk)`` rows)
+    a response is built from. Their stamps produce the ETag and
+    Last-Modified headers, and a matching If-None-Match request is
+    answered with 304 right after the permission checks.
+    """
+
+    cache_models = ()
+    conditional_actions = ("list", "retrieve")
+
+    def get_version_sources(self):
+        return self.cache_models
+
+    def _set_validators(self, request):
+        self.etag = self.last_modified = None
+
+        if request.method != "GET" or self.action not in (
+            self.conditional_actions
+        ):
+            return
+
+        versions = get_versions(self.get_version_sources())
+        raw_etag = ":".join(
+            [
+                self.action,
+                request.accepted_renderer.format,
+                *map(str, versions),
+            ]
+        )
+        self.etag = f'"{hashlib.md5(raw_etag.encode()).hexdigest()}"'
+        self.last_modified = -(-max(versions) // 10**9)
+
+    def _is_not_modified(self, request):
+        """If-Modified-Since is not honoured: Last-Modified has one-second
+        resolution and would hide a write made in the same second as the
+        previous response, while the ETag always changes."""
+        if_none_match = request.headers.get("If-None-Match")
+
+        if not if_none_match:
+            return False
+
+        etags = [
+            etag.strip().removeprefix("W/")
+            for etag in if_none_match.split(",")
+        ]
+        return self.etag in etags or "*" in etags
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._set_validators(request)
+
+        if self.etag and self._is_not_modified(request):
+            raise NotModified()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+
+        return super().handle_exception(exc)
+
+    def add_validators(self, response):
+        if getattr(self, "etag", None) and response.status_code in (
+            status.HTTP_200_OK,
+            status.HTTP_304_NOT_MODIFIED,
+        ):
+            response["ETag"] = self.etag
+            response["Last-Modified"] = http_date(self.last_modified)
+
+        return response
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+
+        return self.add_validators(response)
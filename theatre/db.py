@@ -0,0 +1,108 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+STICKY_COOKIE = "theatre_db_sticky"
+
+_primary_pinned = ContextVar("theatre_primary_pinned", default=False)
+
+
+def get_replicas():
+    return list(getattr(settings, "THEATRE_DB_REPLICAS", ()))
+
+
+def is_pinned_to_primary():
+    return _primary_pinned.get()
+
+
+def pin_to_primary():
+    """Send the reads of the current request or task to the primary."""
+    _primary_pinned.set(True)
+
+
+@contextmanager
+def primary_pinning(pinned=False):
+    token = _primary_pinned.set(pinned)
+    try:
+        yield
+    finally:
+        _primary_pinned.reset(token)
+
+
+class ReplicaRouter:
+    """Spread reads over ``THEATRE_DB_REPLICAS`` and write to the primary.
+
+    Reads stay on the primary inside its transactions and while the
+    request is pinned to it, see ``PrimaryPinningMiddleware``.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = get_replicas()
+
+        if (
+            not replicas
+            or is_pinned_to_primary()
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *get_replicas()}
+
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in get_replicas():
+            return False
+
+        return None
+
+
+def get_sticky_seconds():
+    return getattr(settings, "THEATRE_DB_STICKY_SECONDS", 10)
+
+
+def mark_sticky(response):
+    """Keep the next reads of this client on the primary for a while,
+    so it reads its own writes despite replication lag.
+
+    The mark travels in a signed cookie, every process and node sees it.
+    """
+    response.set_signed_cookie(
+        STICKY_COOKIE,
+        "1",
+        salt=STICKY_COOKIE,
+        max_age=get_sticky_seconds(),
+        httponly=True,
+        samesite="Lax",
+    )
+
+
+def is_sticky(request):
+    return (
+        request.get_signed_cookie(
+            STICKY_COOKIE,
+            default=None,
+            salt=STICKY_COOKIE,
+            max_age=get_sticky_seconds(),
+        )
+        is not None
+    )
+
+
+def enable_sqlite_wal(connection):
+    """Let readers work next to the single writer of a SQLite file."""
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
@@ -0,0 +1,135 @@
+import csv
+from datetime import timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Exists, OuterRef
+
+from .models import Reservation, Ticket
+
+EXPORT_FORMATS = ("csv", "ndjson")
+EXPORT_CHUNK_SIZE = 2000
+CONTENT_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+# Column name and lookup of every exported value
+TICKET_EXPORT_FIELDS = (
+    ("id", "id"),
+    ("row", "row"),
+    ("seat", "seat"),
+    ("performance", "performance_id"),
+    ("show_time", "performance__show_time"),
+    ("play", "performance__play__title"),
+    ("theatre_hall", "performance__theatre_hall__name"),
+    ("reservation", "reservation_id"),
+    ("reserved_at", "reservation__created_at"),
+    ("user", "reservation__user__email"),
+)
+RESERVATION_EXPORT_FIELDS = (
+    ("id", "id"),
+    ("created_at", "created_at"),
+    ("user", "user__email"),
+    ("tickets", "ticket_count"),
+)
+
+
+def _filter_performances(performance_id, date_from, date_to, prefix=""):
+    lookups = {}
+
+    if performance_id:
+        lookups[f"{prefix}performance_id"] = performance_id
+
+    if date_from:
+        lookups[f"{prefix}performance__show_time__gte"] = date_from
+
+    if date_to:
+        lookups[f"{prefix}performance__show_time__lt"] = (
+            date_to + timedelta(days=1)
+        )
+
+    return lookups
+
+
+def ticket_export_rows(performance_id=None, date_from=None, date_to=None):
+    """Tickets of a performance or of the performances shown between
+    the start of ``date_from`` and the end of ``date_to``."""
+    return (
+        Ticket.objects.filter(
+            **_filter_performances(performance_id, date_from, date_to)
+        )
+        .order_by("id")
+        .values_list(*(lookup for _, lookup in TICKET_EXPORT_FIELDS))
+    )
+
+
+def reservation_export_rows(
+    performance_id=None, date_from=None, date_to=None
+):
+    """Reservations holding tickets of the selected performances."""
+    reservations = Reservation.objects.all()
+    lookups = _filter_performances(performance_id, date_from, date_to)
+
+    if lookups:
+        reservations = reservations.filter(
+            Exists(
+                Ticket.objects.filter(reservation_id=OuterRef("pk"), **lookups)
+            )
+        )
+
+    return (
+        reservations.annotate(ticket_count=Count("tickets"))
+        .order_by("id")
+        .values_list(*(lookup for _, lookup in RESERVATION_EXPORT_FIELDS))
+    )
+
+
+EXPORTS = {
+    "tickets": (TICKET_EXPORT_FIELDS, ticket_export_rows),
+    "reservations": (RESERVATION_EXPORT_FIELDS, reservation_export_rows),
+}
+
+
+class _Echo:
+    """File-like object handing back what csv.writer writes to it."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_lines(columns, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def _ndjson_lines(columns, rows):
+    encoder = DjangoJSONEncoder()
+
+    for row in rows:
+        yield encoder.encode(dict(zip(columns, row))) + "\n"
+
+
+def stream_export(
+    kind,
+    export_format="csv",
+    chunk_size=EXPORT_CHUNK_SIZE,
+    **filters,
+):
+    """Lines of the export, fetched ``chunk_size`` rows at a time and
+    never held in memory as a whole."""
+    fields, get_rows = EXPORTS[kind]
+    columns = [column for column, _ in fields]
+    rows = get_rows(**filters).iterator(chunk_size=chunk_size)
+
+    if export_format == "ndjson":
+        return _ndjson_lines(columns, rows)
+
+    return _csv_lines(columns, rows)
+
+
+def get_export_filename(kind, export_format, performance_id=None):
+    suffix = f"-performance-{performance_id}" if performance_id else ""
+    return f"{kind}{suffix}.{export_format}"
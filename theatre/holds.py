@@ -0,0 +1,118 @@
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .booking import create_reservation, validate_seats
+from .models import SeatHold
+
+DEFAULT_HOLD_TTL = 300
+
+
+def get_hold_ttl():
+    return timedelta(
+        seconds=getattr(settings, "THEATRE_SEAT_HOLD_TTL", DEFAULT_HOLD_TTL)
+    )
+
+
+def hold_seats(user, tickets):
+    """Hold the requested seats for the user until the hold TTL expires.
+
+    Returns the hold token and its expiration time.
+    """
+    seats = [
+        (ticket["performance_id"], ticket["row"], ticket["seat"])
+        for ticket in tickets
+    ]
+    _, errors = validate_seats(seats)
+
+    if errors:
+        raise ValidationError({"tickets": errors})
+
+    token = uuid.uuid4()
+    now = timezone.now()
+    expires_at = now + get_hold_ttl()
+
+    try:
+        with transaction.atomic():
+            SeatHold.objects.filter(
+                performance_id__in={seat[0] for seat in seats},
+                row__in={seat[1] for seat in seats},
+                seat__in={seat[2] for seat in seats},
+                expires_at__lte=now,
+            ).delete()
+            SeatHold.objects.bulk_create(
+                [
+                    SeatHold(
+                        token=token,
+                        user=user,
+                        performance_id=performance_id,
+                        row=row,
+                        seat=seat,
+                        expires_at=expires_at,
+                    )
+                    for performance_id, row, seat in seats
+                ]
+            )
+    except IntegrityError:
+        raise ValidationError(
+            {"tickets": ["Some of the seats were held by another booking."]}
+        )
+
+    return token, expires_at
+
+
+def release_hold(user, token):
+    return SeatHold.objects.filter(token=token, user=user).delete()[0]
+
+
+def confirm_hold(user, token):
+    """Turn an active hold into a reservation and release its seats."""
+    with transaction.atomic():
+        holds = list(
+            SeatHold.objects.filter(
+                token=token, user=user, expires_at__gt=timezone.now()
+            )
+        )
+
+        if not holds:
+            raise ValidationError(
+                {"token": ["Hold does not exist or has expired."]}
+            )
+
+        reservation = create_reservation(
+            user,
+            [
+                {
+                    "performance_id": hold.performance_id,
+                    "row": hold.row,
+                    "seat": hold.seat,
+                }
+                for hold in holds
+            ],
+            hold_token=token,
+        )
+        SeatHold.objects.filter(token=token).delete()
+
+    return reservation
+
+
+def sweep_expired_holds(batch_size=1000):
+    """Delete expired holds in batches and return how many were removed."""
+    now = timezone.now()
+    removed = 0
+
+    while True:
+        batch = list(
+            SeatHold.objects.filter(expires_at__lte=now).values_list(
+                "id", flat=True
+            )[:batch_size]
+        )
+
+        if not batch:
+            return removed
+
+        removed += SeatHold.objects.filter(id__in=batch).delete()[0]
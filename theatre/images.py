@@ -0,0 +1,104 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from threading import Lock
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection
+from PIL import Image
+
+from .cache import bump_version
+from .models import Play
+
+logger = logging.getLogger(__name__)
+
+# Longest side in pixels of every generated variant
+IMAGE_VARIANTS = {"thumbnail": 160, "card": 480, "full": 1280}
+VARIANT_FORMAT = "WEBP"
+VARIANT_QUALITY = 80
+
+_executor = None
+_executor_lock = Lock()
+
+
+def get_image_workers():
+    return getattr(settings, "THEATRE_IMAGE_WORKERS", 2)
+
+
+def _get_executor():
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=get_image_workers(),
+                thread_name_prefix="play-images",
+            )
+
+    return _executor
+
+
+def variant_path(image_name, variant):
+    stem, _ = os.path.splitext(os.path.basename(image_name))
+    return os.path.join(
+        os.path.dirname(image_name), "variants", f"{stem}-{variant}.webp"
+    )
+
+
+def _render_variant(image, size):
+    variant = image.copy()
+    variant.thumbnail((size, size), Image.LANCZOS)
+    content = BytesIO()
+    variant.save(content, VARIANT_FORMAT, quality=VARIANT_QUALITY)
+    return ContentFile(content.getvalue())
+
+
+def generate_variants(play_id):
+    """Render every image variant of the play and store their paths."""
+    play = Play.objects.filter(pk=play_id).only("id", "image").first()
+
+    if play is None or not play.image:
+        return
+
+    image_name = play.image.name
+    with play.image.open("rb") as image_file:
+        image = Image.open(image_file)
+        image.load()
+
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+    variants = {}
+    for variant, size in IMAGE_VARIANTS.items():
+        path = variant_path(image_name, variant)
+        default_storage.delete(path)
+        variants[variant] = default_storage.save(
+            path, _render_variant(image, size)
+        )
+
+    # Skip the update if another image was uploaded in the meantime
+    if Play.objects.filter(pk=play_id, image=image_name).update(
+        image_variants=variants
+    ):
+        bump_version(Play)
+
+
+def _generate_in_worker(play_id):
+    try:
+        generate_variants(play_id)
+    except Exception:
+        logger.exception("Failed to render images of play %s", play_id)
+    finally:
+        connection.close()
+
+
+def schedule_variants(play_id):
+    """Generate the variants on the worker pool, or inline without one."""
+    if get_image_workers() <= 0:
+        generate_variants(play_id)
+        return
+
+    _get_executor().submit(_generate_in_worker, play_id)
@@ -0,0 +1,160 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import AsyncClient, Client
+from django.urls import reverse
+
+from theatre.benchmarks import (
+    asgi_headers,
+    auth_headers,
+    benchmark_environment,
+    current_commit,
+    summarize,
+    throttling_disabled,
+    timed,
+)
+from theatre.models import Performance, Play
+
+
+class Command(BaseCommand):
+    help = "Compare read throughput of the WSGI and ASGI views"  # noqa: VNE003
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=20)
+        parser.add_argument(
+            "--email", help="User to authenticate as (default: first user)"
+        )
+        parser.add_argument("--output", help="Save results as JSON")
+
+    def get_endpoints(self):
+        performance = Performance.objects.first()
+        play = Play.objects.first()
+
+        if performance is None or play is None:
+            raise CommandError("Create at least one performance to benchmark")
+
+        return {
+            "performance-list": (
+                reverse("theatre:performance-list"),
+                reverse("theatre:async-performance-list"),
+            ),
+            "performance-detail": (
+                reverse("theatre:performance-detail", args=[performance.id]),
+                reverse(
+                    "theatre:async-performance-detail", args=[performance.id]
+                ),
+            ),
+            "play-list": (
+                reverse("theatre:play-list"),
+                reverse("theatre:async-play-list"),
+            ),
+            "play-detail": (
+                reverse("theatre:play-detail", args=[play.id]),
+                reverse("theatre:async-play-detail", args=[play.id]),
+            ),
+        }
+
+    def run_sync(self, url, headers, requests, concurrency):
+        def worker(count):
+            client = Client(**headers)
+            latencies, errors = [], 0
+            for _ in range(count):
+                start = time.perf_counter()
+                response = client.get(url)
+                latencies.append(time.perf_counter() - start)
+                errors += response.status_code != 200
+            connection.close()
+            return latencies, errors
+
+        with timed() as timer:
+            with ThreadPoolExecutor(concurrency) as executor:
+                chunks = list(
+                    executor.map(worker, _split(requests, concurrency))
+                )
+
+        return _summarize_chunks(chunks, timer["elapsed"])
+
+    def run_async(self, url, headers, requests, concurrency):
+        async def worker(count):
+            client = AsyncClient()
+            latencies, errors = [], 0
+            for _ in range(count):
+                start = time.perf_counter()
+                response = await client.get(url, **asgi_headers(headers))
+                latencies.append(time.perf_counter() - start)
+                errors += response.status_code != 200
+            return latencies, errors
+
+        async def run():
+            return await asyncio.gather(
+                *[worker(count) for count in _split(requests, concurrency)]
+            )
+
+        with timed() as timer:
+            chunks = asyncio.run(run())
+
+        return _summarize_chunks(chunks, timer["elapsed"])
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.order_by("id")
+        if options["email"]:
+            users = users.filter(email=options["email"])
+        user = users.first()
+
+        if user is None:
+            raise CommandError("No user to authenticate as")
+
+        headers = auth_headers(user)
+        requests, concurrency = options["requests"], options["concurrency"]
+        results = {
+            "commit": current_commit(),
+            "requests": requests,
+            "concurrency": concurrency,
+            "endpoints": {},
+        }
+
+        with benchmark_environment(), throttling_disabled():
+            for name, (sync_url, async_url) in self.get_endpoints().items():
+                sync_stats = self.run_sync(
+                    sync_url, headers, requests, concurrency
+                )
+                async_stats = self.run_async(
+                    async_url, headers, requests, concurrency
+                )
+                gain = (
+                    async_stats["throughput"] / sync_stats["throughput"]
+                    if sync_stats["throughput"]
+                    else None
+                )
+                results["endpoints"][name] = {
+                    "wsgi": sync_stats,
+                    "asgi": async_stats,
+                    "throughput_gain": gain and round(gain, 2),
+                }
+                self.stdout.write(
+                    f"{name:20} wsgi {sync_stats['throughput']:>8} req/s  "
+                    f"asgi {async_stats['throughput']:>8} req/s  "
+                    f"x{results['endpoints'][name]['throughput_gain']}"
+                )
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2)
+
+
+def _split(total, parts):
+    return [
+        total // parts + (1 if index < total % parts else 0)
+        for index in range(parts)
+    ]
+
+
+def _summarize_chunks(chunks, elapsed):
+    latencies = [value for chunk, _ in chunks for value in chunk]
+    return summarize(latencies, elapsed, sum(errors for _, errors in chunks))
@@ -0,0 +1,242 @@
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+
+from theatre.benchmarks import (
+    ClientTransport,
+    HttpTransport,
+    RequestStats,
+    auth_headers,
+    benchmark_environment,
+    compare_results,
+    current_commit,
+    load_catalog,
+    seed_catalog,
+    throttling_disabled,
+    timed,
+)
+
+PERFORMANCE_URL = reverse("theatre:performance-list")
+RESERVATION_URL = reverse("theatre:reservation-list")
+
+
+class Command(BaseCommand):
+    help = "Load-test reservations with simulated users"  # noqa: VNE003
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10)
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=20,
+            help="Reservation attempts of every simulated user",
+        )
+        parser.add_argument("--halls", type=int, default=2)
+        parser.add_argument("--plays", type=int, default=5)
+        parser.add_argument(
+            "--performances",
+            type=int,
+            default=3,
+            help="Performances the users compete for",
+        )
+        parser.add_argument(
+            "--hot-rows",
+            type=int,
+            default=2,
+            help="Rows the users pick seats from, fewer means more conflicts",
+        )
+        parser.add_argument("--seats-per-order", type=int, default=2)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--url",
+            help="Base URL of a running server (default: in-process)",
+        )
+        parser.add_argument(
+            "--create-catalog",
+            action="store_true",
+            help="Create the benchmark halls, plays, performances and staff "
+            "users in the default database and drop their reservations",
+        )
+        parser.add_argument("--output", help="Save results as JSON")
+        parser.add_argument(
+            "--compare", help="JSON results of a previous run to compare"
+        )
+
+    def get_transport(self, user, options):
+        headers = auth_headers(user)
+
+        if options["url"]:
+            return HttpTransport(options["url"], headers)
+
+        return ClientTransport(headers)
+
+    def simulate_user(self, index, user, performance_ids, options):
+        rng = random.Random(options["seed"] + index)
+        transport = self.get_transport(user, options)
+        stats = {
+            "performance-list": RequestStats(),
+            "performance-detail": RequestStats(),
+            "reservation-create": RequestStats(),
+        }
+
+        def send(name, method, path, data=None):
+            start = time.perf_counter()
+            status_code, queries = transport.request(method, path, data)
+            stats[name].add(time.perf_counter() - start, status_code, queries)
+
+        try:
+            for _ in range(options["iterations"]):
+                performance_id = rng.choice(performance_ids)
+                send("performance-list", "get", PERFORMANCE_URL)
+                send(
+                    "performance-detail",
+                    "get",
+                    reverse(
+                        "theatre:performance-detail", args=[performance_id]
+                    ),
+                )
+                send(
+                    "reservation-create",
+                    "post",
+                    RESERVATION_URL,
+                    {
+                        "tickets": [
+                            {
+                                "row": rng.randint(1, options["hot_rows"]),
+                                "seat": rng.randint(1, 30),
+                                "performance": performance_id,
+                            }
+                            for _ in range(options["seats_per_order"])
+                        ]
+                    },
+                )
+        finally:
+            transport.close()
+
+        return stats
+
+    def run(self, users, performance_ids, options):
+        totals = {}
+
+        with timed() as timer:
+            with ThreadPoolExecutor(len(users)) as executor:
+                futures = [
+                    executor.submit(
+                        self.simulate_user,
+                        index,
+                        user,
+                        performance_ids,
+                        options,
+                    )
+                    for index, user in enumerate(users)
+                ]
+                for future in futures:
+                    for name, stats in future.result().items():
+                        totals.setdefault(name, RequestStats()).merge(stats)
+
+        return totals, timer["elapsed"]
+
+    def handle(self, *args, **options):
+        if options["users"] < 1 or options["performances"] < 1:
+            raise CommandError("Need at least one user and one performance")
+
+        if options["create_catalog"]:
+            if options["url"]:
+                raise CommandError(
+                    "--create-catalog writes to the local database, "
+                    "seed the database of the server at --url instead"
+                )
+
+            self.stdout.write(
+                "Seeding the benchmark catalog into "
+                f"{connection.settings_dict['NAME']}"
+            )
+            performance_ids, users = seed_catalog(
+                options["halls"],
+                options["plays"],
+                options["performances"],
+                options["users"],
+            )
+        else:
+            performance_ids, users = load_catalog(
+                options["performances"], options["users"]
+            )
+
+        if not performance_ids or len(users) < options["users"]:
+            raise CommandError(
+                "No benchmark catalog found, run with --create-catalog"
+            )
+
+        with benchmark_environment(), throttling_disabled():
+            totals, elapsed = self.run(users, performance_ids, options)
+
+        reservations = totals["reservation-create"].statuses
+        attempts = sum(reservations.values())
+        results = {
+            "commit": current_commit(),
+            "created_at": timezone.now().isoformat(),
+            "target": options["url"] or "in-process",
+            "config": {
+                key: options[key]
+                for key in (
+                    "users",
+                    "iterations",
+                    "performances",
+                    "hot_rows",
+                    "seats_per_order",
+                    "seed",
+                )
+            },
+            "elapsed_s": round(elapsed, 3),
+            "endpoints": {
+                name: stats.summarize(elapsed)
+                for name, stats in totals.items()
+            },
+            "reservations": {
+                "attempts": attempts,
+                "booked": reservations[201],
+                "conflicts": reservations[400],
+                "conflict_rate": (
+                    round(reservations[400] / attempts, 3)
+                    if attempts
+                    else None
+                ),
+            },
+        }
+
+        for name, summary in results["endpoints"].items():
+            self.stdout.write(
+                f"{name:20} {summary['throughput']:>8} req/s  "
+                f"p50 {summary['p50_ms']} ms  p95 {summary['p95_ms']} ms  "
+                f"p99 {summary['p99_ms']} ms  "
+                f"queries {summary['queries_per_request']}  "
+                f"errors {summary['errors']}"
+            )
+        self.stdout.write(
+            f"Conflict rate: {results['reservations']['conflict_rate']} "
+            f"({results['reservations']['conflicts']} of {attempts})"
+        )
+
+        if options["compare"]:
+            with open(options["compare"]) as baseline:
+                results["comparison"] = compare_results(
+                    results, json.load(baseline)
+                )
+            for name, changes in results["comparison"].items():
+                self.stdout.write(
+                    f"{name:20} "
+                    + "  ".join(
+                        f"{metric} {change:+.1%}"
+                        for metric, change in changes.items()
+                    )
+                )
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2)
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from theatre.schema import get_schema_file, write_schema_file
+
+
+class Command(BaseCommand):
+    help = "Write the OpenAPI schema served by the docs"  # noqa: VNE003
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--file", help="Schema path (default: THEATRE_SCHEMA_FILE)"
+        )
+
+    def handle(self, *args, **options):
+        if not (options["file"] or get_schema_file()):
+            raise CommandError("Pass --file or set THEATRE_SCHEMA_FILE")
+
+        path = write_schema_file(options["file"])
+        self.stdout.write(self.style.SUCCESS(f"Wrote the schema to {path}"))
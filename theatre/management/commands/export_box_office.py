@@ -0,0 +1,71 @@
+from datetime import date, datetime, time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from theatre.exports import (
+    EXPORT_CHUNK_SIZE,
+    EXPORT_FORMATS,
+    EXPORTS,
+    stream_export,
+)
+
+
+def _start_of_day(value):
+    return timezone.make_aware(
+        datetime.combine(date.fromisoformat(value), time.min)
+    )
+
+
+class Command(BaseCommand):
+    help = "Stream tickets or reservations as CSV or NDJSON"  # noqa: VNE003
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(EXPORTS))
+        parser.add_argument(
+            "--format", choices=EXPORT_FORMATS, default="csv"
+        )
+        parser.add_argument("--performance", type=int)
+        parser.add_argument(
+            "--date-from",
+            type=_start_of_day,
+            help="Performances shown from this day on (YYYY-MM-DD)",
+        )
+        parser.add_argument(
+            "--date-to",
+            type=_start_of_day,
+            help="Performances shown until the end of this day (YYYY-MM-DD)",
+        )
+        parser.add_argument(
+            "--output", help="Write to this file instead of stdout"
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help="Rows fetched from the database at a time",
+        )
+
+    def handle(self, *args, **options):
+        lines = stream_export(
+            options["kind"],
+            options["format"],
+            chunk_size=options["chunk_size"],
+            performance_id=options["performance"],
+            date_from=options["date_from"],
+            date_to=options["date_to"],
+        )
+
+        if not options["output"]:
+            for line in lines:
+                self.stdout.write(line, ending="")
+            return
+
+        with open(options["output"], "w", newline="") as export_file:
+            export_file.writelines(lines)
+
+        self.stderr.write(
+            self.style.SUCCESS(
+                f"Exported {options['kind']} to {options['output']}"
+            )
+        )
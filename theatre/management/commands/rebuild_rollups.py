@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from theatre.models import Performance
+from theatre.rollups import refresh_rollups
+
+
+class Command(BaseCommand):
+    help = "Recount the sales rollups of every performance"  # noqa: VNE003
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of rollups written per query",
+        )
+
+    def handle(self, *args, **options):
+        refreshed = refresh_rollups(
+            Performance.objects.all(),
+            recount=True,
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {refreshed} performance rollups")
+        )
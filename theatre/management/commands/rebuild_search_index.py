@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from theatre.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index of plays"  # noqa: VNE003
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+
+        with transaction.atomic():
+            backend.rebuild()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt play search index ({type(backend).__name__})"
+            )
+        )
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F
+
+from theatre.cache import bump_version
+from theatre.models import Performance, Ticket
+from theatre.rollups import refresh_rollups
+
+
+class Command(BaseCommand):
+    help = "Recount sold tickets of drifted performances"  # noqa: VNE003
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report performances with a drifted counter",
+        )
+
+    def handle(self, *args, **options):
+        drifted = list(
+            Performance.objects.annotate(actual_sold=Count("tickets"))
+            .exclude(tickets_sold=F("actual_sold"))
+            .only("id", "tickets_sold")
+        )
+
+        for performance in drifted:
+            self.stdout.write(
+                f"Performance {performance.id}: "
+                f"{performance.tickets_sold} -> {performance.actual_sold}"
+            )
+            performance.tickets_sold = performance.actual_sold
+
+        if drifted and not options["dry_run"]:
+            # bulk_update sends no signals, so refresh what they would
+            with transaction.atomic():
+                Performance.objects.bulk_update(
+                    drifted, ["tickets_sold"], batch_size=500
+                )
+                refresh_rollups(
+                    Performance.objects.filter(
+                        pk__in=[performance.id for performance in drifted]
+                    )
+                )
+                bump_version(Performance)
+                bump_version(Ticket)
+                for performance in drifted:
+                    bump_version((Performance, performance.id))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Found {len(drifted)} performances with drifted counters"
+            )
+        )
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from theatre.cache import get_cache_stats, reset_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Show hit and miss counts of the response cache"  # noqa: VNE003
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Reset the counters after reporting them",
+        )
+
+    def handle(self, *args, **options):
+        stats = get_cache_stats()
+        total = stats["hit"] + stats["miss"]
+        hit_rate = stats["hit"] / total if total else 0
+
+        self.stdout.write(
+            f"hits: {stats['hit']}, misses: {stats['miss']}, "
+            f"hit rate: {hit_rate:.1%}"
+        )
+
+        if options["reset"]:
+            reset_cache_stats()
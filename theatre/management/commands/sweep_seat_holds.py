@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from theatre.holds import sweep_expired_holds
+
+
+class Command(BaseCommand):
+    help = "Delete expired seat holds in batches"  # noqa: VNE003
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of holds deleted per query",
+        )
+
+    def handle(self, *args, **options):
+        removed = sweep_expired_holds(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Removed {removed} expired seat holds")
+        )
@@ -0,0 +1,222 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject
+from rest_framework.permissions import SAFE_METHODS
+
+from .db import (
+    get_replicas,
+    is_sticky,
+    mark_sticky,
+    pin_to_primary,
+    primary_pinning,
+)
+
+logger = logging.getLogger(__name__)
+
+_current_recorder = ContextVar("theatre_query_recorder", default=None)
+
+
+class QueryRecorder:
+    """Execute wrapper collecting the SQL and DB time of a request."""
+
+    def __init__(self):
+        self.statements = Counter()
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.statements[sql] += 1
+
+    @property
+    def count(self):
+        return sum(self.statements.values())
+
+    @property
+    def duplicates(self):
+        return {
+            sql: count for sql, count in self.statements.items() if count > 1
+        }
+
+
+def record_queries(execute, sql, params, many, context):
+    """Execute wrapper of every connection, feeding the recorder of the
+    current request or task if there is one.
+
+    The recorder travels in a context variable, so it also sees the
+    queries the async ORM runs in worker threads.
+    """
+    recorder = _current_recorder.get()
+
+    if recorder is None:
+        return execute(sql, params, many, context)
+
+    return recorder(execute, sql, params, many, context)
+
+
+def install_query_recorder(connection):
+    # Outermost, so execute_wrapper() blocks still pop their own wrapper
+    if record_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_queries)
+
+
+@contextmanager
+def recording_queries():
+    recorder = QueryRecorder()
+    token = _current_recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current_recorder.reset(token)
+
+
+def get_query_budget(view_name):
+    budgets = getattr(settings, "THEATRE_QUERY_BUDGETS", {})
+    return budgets.get(
+        view_name, getattr(settings, "THEATRE_DEFAULT_QUERY_BUDGET", None)
+    )
+
+
+def _is_staff(request):
+    user = getattr(request, "user", None)
+    return user is not None and user.is_staff
+
+
+class QueryBudgetMiddleware:
+    """Count the queries of every request and police per-view budgets.
+
+    Staff users get the numbers back in ``X-DB-*`` response headers,
+    safe requests going over the budget of their URL name are logged
+    together with the statements they repeated.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+        if asyncio.iscoroutinefunction(get_response):
+            # Tells the handler to await __call__, like MiddlewareMixin
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+
+        with recording_queries() as recorder:
+            response = self.get_response(request)
+
+        self.report(request, response, recorder, _is_staff(request))
+        return response
+
+    async def __acall__(self, request):
+        with recording_queries() as recorder:
+            response = await self.get_response(request)
+
+        if isinstance(getattr(request, "user", None), SimpleLazyObject):
+            # Loading a session user takes a query
+            is_staff = await sync_to_async(_is_staff)(request)
+        else:
+            is_staff = _is_staff(request)
+
+        self.report(request, response, recorder, is_staff)
+        return response
+
+    def report(self, request, response, recorder, is_staff):
+        if is_staff:
+            response["X-DB-Queries"] = recorder.count
+            response["X-DB-Time-Ms"] = round(recorder.duration * 1000, 2)
+            response["X-DB-Duplicates"] = sum(recorder.duplicates.values())
+
+        match = request.resolver_match
+        if match is None or request.method not in SAFE_METHODS:
+            return
+
+        budget = get_query_budget(match.view_name)
+        if budget is not None and recorder.count > budget:
+            logger.warning(
+                "%s %s ran %d queries (budget %d) in %.1f ms, repeated: %s",
+                request.method,
+                request.path,
+                recorder.count,
+                budget,
+                recorder.duration * 1000,
+                recorder.duplicates or "none",
+            )
+
+
+def _pin_view_to_primary(view_func):
+    view_class = getattr(view_func, "cls", None) or getattr(
+        view_func, "view_class", None
+    )
+
+    if getattr(view_class, "use_primary_db", False):
+        pin_to_primary()
+
+
+class PrimaryPinningMiddleware:
+    """Keep the reads that must see the latest writes on the primary.
+
+    Unsafe requests, views setting ``use_primary_db`` and clients that
+    wrote within ``THEATRE_DB_STICKY_SECONDS`` read from the primary,
+    other reads go to the replicas picked by ``ReplicaRouter``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+            # Awaited in the event loop rather than in a worker thread
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+
+        with primary_pinning(self.is_pinned(request)):
+            response = self.get_response(request)
+
+        self.stick_after_write(request, response)
+        return response
+
+    async def __acall__(self, request):
+        with primary_pinning(self.is_pinned(request)):
+            response = await self.get_response(request)
+
+        self.stick_after_write(request, response)
+        return response
+
+    def is_pinned(self, request):
+        if request.method not in SAFE_METHODS:
+            return True
+
+        return bool(get_replicas()) and is_sticky(request)
+
+    def stick_after_write(self, request, response):
+        if (
+            get_replicas()
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+        ):
+            mark_sticky(response)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        _pin_view_to_primary(view_func)
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        _pin_view_to_primary(view_func)
@@ -0,0 +1,34 @@
+# Generated by Django 4.1 on 2026-10-18 15:11
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_sold_tickets(apps, schema_editor):
+    Performance = apps.get_model("theatre", "Performance")  # noqa: N806
+    Ticket = apps.get_model("theatre", "Ticket")  # noqa: N806
+
+    sold = (
+        Ticket.objects.filter(performance=OuterRef("pk"))
+        .order_by()
+        .values("performance")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    Performance.objects.update(tickets_sold=Coalesce(Subquery(sold), 0))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("theatre", "0005_seathold"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="performance",
+            name="tickets_sold",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_sold_tickets, migrations.RunPython.noop),
+    ]
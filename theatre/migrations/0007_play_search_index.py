@@ -0,0 +1,58 @@
+# Generated by Django 4.1 on 2026-10-18 15:40
+
+from django.db import migrations
+
+CREATE_INDEX = """
+CREATE VIRTUAL TABLE IF NOT EXISTS theatre_play_fts USING fts5(
+    title, description, actors, genres,
+    tokenize = 'unicode61 remove_diacritics 2'
+)
+"""
+
+POPULATE_INDEX = """
+INSERT INTO theatre_play_fts (rowid, title, description, actors, genres)
+SELECT
+    play.id,
+    play.title,
+    play.description,
+    (
+        SELECT group_concat(actor.first_name || ' ' || actor.last_name, ' ')
+        FROM theatre_actor actor
+        JOIN theatre_play_actors play_actor
+            ON play_actor.actor_id = actor.id
+        WHERE play_actor.play_id = play.id
+    ),
+    (
+        SELECT group_concat(genre.name, ' ')
+        FROM theatre_genre genre
+        JOIN theatre_play_genres play_genre
+            ON play_genre.genre_id = genre.id
+        WHERE play_genre.play_id = play.id
+    )
+FROM theatre_play play
+"""
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+
+    schema_editor.execute(CREATE_INDEX)
+    schema_editor.execute(POPULATE_INDEX)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+
+    schema_editor.execute("DROP TABLE IF EXISTS theatre_play_fts")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("theatre", "0006_performance_tickets_sold"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.1 on 2026-10-18 16:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("theatre", "0007_play_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="play",
+            name="image_variants",
+            field=models.JSONField(default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.1 on 2026-10-18 15:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("theatre", "0008_play_image_variants"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="performance",
+            index=models.Index(
+                fields=["show_time"], name="theatre_per_show_ti_6fef99_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="performance",
+            index=models.Index(
+                fields=["play", "show_time"], name="theatre_per_play_id_1e3e93_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="performance",
+            index=models.Index(
+                fields=["theatre_hall", "show_time"],
+                name="theatre_per_theatre_2b9613_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.1 on 2026-10-18 15:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("theatre", "0009_performance_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                fields=["created_at", "id"], name="theatre_res_created_a6ef5c_idx"
+            ),
+        ),
+    ]
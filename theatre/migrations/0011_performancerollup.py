@@ -0,0 +1,93 @@
+# Generated by Django 4.1 on 2026-10-18 15:45
+
+from django.db import migrations, models
+from django.utils import timezone
+import django.db.models.deletion
+
+
+def fill_rollups(apps, schema_editor):
+    Performance = apps.get_model("theatre", "Performance")  # noqa: N806
+    PerformanceRollup = apps.get_model(  # noqa: N806
+        "theatre", "PerformanceRollup"
+    )
+
+    PerformanceRollup.objects.bulk_create(
+        (
+            PerformanceRollup(
+                performance_id=performance.id,
+                day=timezone.localdate(performance.show_time),
+                play_id=performance.play_id,
+                theatre_hall_id=performance.theatre_hall_id,
+                seats_sold=performance.tickets_sold,
+                capacity=performance.theatre_hall.rows
+                * performance.theatre_hall.seats_in_row,
+            )
+            for performance in Performance.objects.select_related(
+                "theatre_hall"
+            ).iterator(chunk_size=500)
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("theatre", "0010_reservation_created_at_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PerformanceRollup",
+            fields=[
+                (
+                    "performance",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="rollup",
+                        serialize=False,
+                        to="theatre.performance",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("seats_sold", models.PositiveIntegerField(default=0)),
+                ("capacity", models.PositiveIntegerField()),
+                (
+                    "play",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="theatre.play",
+                    ),
+                ),
+                (
+                    "theatre_hall",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="theatre.theatrehall",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["day"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="performancerollup",
+            index=models.Index(fields=["day"], name="theatre_per_day_b7eb4d_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="performancerollup",
+            index=models.Index(
+                fields=["play", "day"], name="theatre_per_play_id_44e401_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="performancerollup",
+            index=models.Index(
+                fields=["theatre_hall", "day"], name="theatre_per_theatre_39c234_idx"
+            ),
+        ),
+        migrations.RunPython(fill_rollups, migrations.RunPython.noop),
+    ]
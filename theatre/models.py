@@ -7,6 +7,9 @@ from rest_framework.exceptions import ValidationError
 
 from user.models import User
 
+# Largest primary key of the BigAutoField tables
+MAX_ID = 2**63 - 1
+
 
 def movie_image_file_path(instance, filename):
     _, extension = os.path.splitext(filename)
@@ -22,6 +25,7 @@ class Reservation(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["created_at", "id"])]
 
     def __str__(self):
         return f"Reservation for {self.user}"
@@ -58,6 +62,7 @@ class Play(models.Model):
     genres = models.ManyToManyField(Genre, related_name="plays")
     actors = models.ManyToManyField(Actor, related_name="plays")
     image = models.ImageField(null=True, upload_to=movie_image_file_path)
+    image_variants = models.JSONField(default=dict, editable=False)
 
     class Meta:
         ordering = ["title"]
@@ -86,9 +91,19 @@ class Performance(models.Model):
     play = models.ForeignKey(Play, on_delete=models.CASCADE)
     theatre_hall = models.ForeignKey(TheatreHall, on_delete=models.CASCADE)
     show_time = models.DateTimeField()
+    tickets_sold = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ["show_time"]
+        indexes = [
+            models.Index(fields=["show_time"]),
+            models.Index(fields=["play", "show_time"]),
+            models.Index(fields=["theatre_hall", "show_time"]),
+        ]
+
+    @property
+    def tickets_available(self):
+        return self.theatre_hall.capacity - self.tickets_sold
 
     def __str__(self):
         return f"{self.play.title} - {self.show_time}"
@@ -108,23 +123,30 @@ class Ticket(models.Model):
         ordering = ["performance"]
         unique_together = ("row", "seat", "performance")
 
-    def clean(self):
+    @staticmethod
+    def validate_seat(row, seat, theatre_hall, error_to_raise):
         for ticket_attr_value, ticket_attr_name, theatre_hall_attr_name in [
-            (self.row, "row", "rows"),
-            (self.seat, "seat", "seats_in_row"),
+            (row, "row", "rows"),
+            (seat, "seat", "seats_in_row"),
         ]:
-            count_attrs = getattr(
-                self.performance.theatre_hall, theatre_hall_attr_name
-            )
-        if not (1 <= ticket_attr_value <= count_attrs):
-            raise ValidationError(
-                {
-                    ticket_attr_name: f"{ticket_attr_name} "
-                    f"number must be in available range: "
-                    f"(1, {theatre_hall_attr_name}): "
-                    f"(1, {count_attrs})"
-                }
-            )
+            count_attrs = getattr(theatre_hall, theatre_hall_attr_name)
+            if not (1 <= ticket_attr_value <= count_attrs):
+                raise error_to_raise(
+                    {
+                        ticket_attr_name: f"{ticket_attr_name} "
+                        f"number must be in available range: "
+                        f"(1, {theatre_hall_attr_name}): "
+                        f"(1, {count_attrs})"
+                    }
+                )
+
+    def clean(self):
+        Ticket.validate_seat(
+            self.row,
+            self.seat,
+            self.performance.theatre_hall,
+            ValidationError,
+        )
 
     def save(
         self,
@@ -141,3 +163,51 @@ class Ticket(models.Model):
     def __str__(self):
         return (f"Ticket {self.row}-{self.seat} "
                 f"for {self.performance.play.title}")
+
+
+class SeatHold(models.Model):
+    token = models.UUIDField(default=uuid.uuid4, db_index=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    performance = models.ForeignKey(
+        Performance, on_delete=models.CASCADE, related_name="holds"
+    )
+    row = models.IntegerField()
+    seat = models.IntegerField()
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        ordering = ["expires_at"]
+        unique_together = ("row", "seat", "performance")
+
+    def __str__(self):
+        return f"Hold {self.row}-{self.seat} until {self.expires_at}"
+
+
+class PerformanceRollup(models.Model):
+    """Sales summary of a performance, kept up to date by the booking
+    code so analytics never aggregate the tickets table."""
+
+    performance = models.OneToOneField(
+        Performance,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="rollup",
+    )
+    day = models.DateField()
+    play = models.ForeignKey(Play, on_delete=models.CASCADE, related_name="+")
+    theatre_hall = models.ForeignKey(
+        TheatreHall, on_delete=models.CASCADE, related_name="+"
+    )
+    seats_sold = models.PositiveIntegerField(default=0)
+    capacity = models.PositiveIntegerField()
+
+    class Meta:
+        ordering = ["day"]
+        indexes = [
+            models.Index(fields=["day"]),
+            models.Index(fields=["play", "day"]),
+            models.Index(fields=["theatre_hall", "day"]),
+        ]
+
+    def __str__(self):
+        return f"Rollup of performance {self.performance_id}"
@@ -0,0 +1,174 @@
+from django.conf import settings
+from django.core.cache import caches
+
+from .cache import get_versions
+from .db import primary_pinning
+from .models import Performance, Ticket
+
+OCCUPANCY_CACHE_KEY = "theatre:occupancy:{performance_id}:{version}"
+
+
+class SeatOccupancy:
+    """Bit-packed seat map of a performance, one bit per hall seat."""
+
+    def __init__(self, rows, seats_in_row, bits=None):
+        self.rows = rows
+        self.seats_in_row = seats_in_row
+        size = (rows * seats_in_row + 7) // 8
+        self.bits = bytearray(bits) if bits else bytearray(size)
+
+    @classmethod
+    def from_seats(cls, rows, seats_in_row, seats):
+        occupancy = cls(rows, seats_in_row)
+        for row, seat in seats:
+            occupancy.take(row, seat)
+        return occupancy
+
+    def _index(self, row, seat):
+        if not (1 <= row <= self.rows and 1 <= seat <= self.seats_in_row):
+            raise ValueError(f"Seat {row}-{seat} is outside of the hall")
+        return (row - 1) * self.seats_in_row + seat - 1
+
+    def is_taken(self, row, seat):
+        index = self._index(row, seat)
+        return bool(self.bits[index >> 3] & (1 << (index & 7)))
+
+    def take(self, row, seat):
+        index = self._index(row, seat)
+        self.bits[index >> 3] |= 1 << (index & 7)
+
+    def release(self, row, seat):
+        index = self._index(row, seat)
+        self.bits[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+    @property
+    def taken_count(self):
+        return sum(bin(byte).count("1") for byte in self.bits)
+
+    def taken_places(self):
+        places = []
+        for byte_index, byte in enumerate(self.bits):
+            if not byte:
+                continue
+            for bit in range(8):
+                if byte & (1 << bit):
+                    row, seat = divmod(byte_index * 8 + bit, self.seats_in_row)
+                    places.append({"row": row + 1, "seat": seat + 1})
+        return places
+
+    def to_cache(self):
+        return self.rows, self.seats_in_row, bytes(self.bits)
+
+    @classmethod
+    def from_cache(cls, value):
+        rows, seats_in_row, bits = value
+        return cls(rows, seats_in_row, bits)
+
+
+def get_occupancy_cache():
+    return caches[getattr(settings, "THEATRE_OCCUPANCY_CACHE", "default")]
+
+
+def _cache_timeout():
+    return getattr(settings, "THEATRE_OCCUPANCY_CACHE_TIMEOUT", 3600)
+
+
+def _cache_keys(performance_ids):
+    """Keys of the seat maps under the current ``(Performance, pk)``
+    version stamps, which every ticket write bumps in the shared version
+    cache. A write made by any worker therefore moves the key."""
+    versions = get_versions(
+        [(Performance, performance_id) for performance_id in performance_ids]
+    )
+
+    return {
+        performance_id: OCCUPANCY_CACHE_KEY.format(
+            performance_id=performance_id, version=version
+        )
+        for performance_id, version in zip(performance_ids, versions)
+    }
+
+
+def build_occupancy(performance, key):
+    theatre_hall = performance.theatre_hall
+
+    # Cached under the current version, so it must not come from a replica
+    with primary_pinning(True):
+        seats = list(
+            Ticket.objects.filter(performance_id=performance.id).values_list(
+                "row", "seat"
+            )
+        )
+
+    occupancy = SeatOccupancy.from_seats(
+        theatre_hall.rows, theatre_hall.seats_in_row, seats
+    )
+    get_occupancy_cache().set(
+        key, occupancy.to_cache(), timeout=_cache_timeout()
+    )
+    return occupancy
+
+
+def _is_current(occupancy, performance):
+    theatre_hall = performance.theatre_hall
+    return (occupancy.rows, occupancy.seats_in_row) == (
+        theatre_hall.rows,
+        theatre_hall.seats_in_row,
+    )
+
+
+def get_occupancy(performance):
+    """Return the seat map of the performance, rebuilding it on a miss
+    or when it disagrees with the hall size."""
+    key = _cache_keys([performance.id])[performance.id]
+    cached = get_occupancy_cache().get(key)
+
+    if cached is not None:
+        occupancy = SeatOccupancy.from_cache(cached)
+        if _is_current(occupancy, performance):
+            return occupancy
+
+    return build_occupancy(performance, key)
+
+
+def get_occupancies(performances):
+    """Seat maps of many performances keyed by id, loading the tickets of
+    every stale or missing one in a single query."""
+    cache = get_occupancy_cache()
+    keys = _cache_keys([performance.id for performance in performances])
+    cached = cache.get_many(keys.values())
+    occupancies = {}
+    missing = {}
+
+    for performance in performances:
+        value = cached.get(keys[performance.id])
+        occupancy = value and SeatOccupancy.from_cache(value)
+
+        if occupancy and _is_current(occupancy, performance):
+            occupancies[performance.id] = occupancy
+        else:
+            missing[performance.id] = SeatOccupancy(
+                performance.theatre_hall.rows,
+                performance.theatre_hall.seats_in_row,
+            )
+
+    if missing:
+        with primary_pinning(True):
+            seats = list(
+                Ticket.objects.filter(performance_id__in=missing)
+                .order_by()
+                .values_list("performance_id", "row", "seat")
+            )
+        for performance_id, row, seat in seats:
+            missing[performance_id].take(row, seat)
+
+        cache.set_many(
+            {
+                keys[performance_id]: occupancy.to_cache()
+                for performance_id, occupancy in missing.items()
+            },
+            timeout=_cache_timeout(),
+        )
+        occupancies.update(missing)
+
+    return occupancies
@@ -0,0 +1,297 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Max, Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .models import MAX_ID
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination that seeks past the last row of the previous page.
+
+    The cursor stores the values of every ``ordering`` field of the edge
+    row, so any page costs one indexed range query and no COUNT(*).
+    The last ordering field must be unique.
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    ordering = ("-id",)
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_ordering(self, request, queryset, view):
+        return self.ordering
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        if page_size <= 0:
+            return self.page_size
+
+        return min(page_size, self.max_page_size)
+
+    def encode_cursor(self, values, reverse):
+        payload = json.dumps(
+            [
+                [
+                    value.isoformat() if hasattr(value, "isoformat") else value
+                    for value in values
+                ],
+                reverse,
+            ]
+        )
+        cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, cursor
+        )
+
+    def decode_cursor(self, request, queryset):
+        cursor = request.query_params.get(self.cursor_query_param)
+
+        if not cursor:
+            return None
+
+        try:
+            values, reverse = json.loads(base64.urlsafe_b64decode(cursor))
+            if len(values) != len(self.current_ordering):
+                raise ValueError
+            values = [
+                self._model_field(queryset, field).to_python(value)
+                for field, value in zip(self.current_ordering, values)
+            ]
+            for value in values:
+                if value is None or (
+                    isinstance(value, int) and not -MAX_ID <= value <= MAX_ID
+                ):
+                    raise ValueError
+        except (binascii.Error, TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return values, bool(reverse)
+
+    @staticmethod
+    def _field_name(field):
+        return field.lstrip("-")
+
+    def _model_field(self, queryset, field):
+        name = self._field_name(field)
+
+        if name in queryset.query.annotations:
+            return queryset.query.annotations[name].output_field
+
+        return queryset.model._meta.get_field(name)
+
+    def _get_value(self, item, field):
+        name = self._field_name(field)
+
+        if isinstance(item, dict):
+            return item[name]
+
+        return getattr(item, name)
+
+    def _seek_filter(self, ordering, values):
+        condition = Q()
+
+        for index, field in enumerate(ordering):
+            lookup = "lt" if field.startswith("-") else "gt"
+            term = Q(**{f"{self._field_name(field)}__{lookup}": values[index]})
+
+            for previous_field, value in zip(ordering[:index], values):
+                term &= Q(**{self._field_name(previous_field): value})
+
+            condition |= term
+
+        return condition
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """Return the sliced queryset of the requested page.
+
+        The result has to be passed to ``paginate_results``, which lets
+        callers evaluate the queryset themselves (e.g. asynchronously).
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.current_page_size = self.get_page_size(request)
+        self.current_ordering = tuple(
+            self.get_ordering(request, queryset, view)
+        )
+        self.cursor = self.decode_cursor(request, queryset)
+
+        ordering = self.current_ordering
+        if self.cursor and self.cursor[1]:
+            ordering = tuple(
+                field[1:] if field.startswith("-") else f"-{field}"
+                for field in ordering
+            )
+
+        queryset = queryset.order_by(*ordering)
+
+        if self.cursor:
+            queryset = queryset.filter(
+                self._seek_filter(ordering, self.cursor[0])
+            )
+
+        return queryset[: self.current_page_size + 1]
+
+    def paginate_results(self, results):
+        results = list(results)
+        has_more = len(results) > self.current_page_size
+        results = results[: self.current_page_size]
+        reverse = bool(self.cursor and self.cursor[1])
+
+        if reverse:
+            results.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+
+        self.page = results
+        return results
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.paginate_results(
+            self.get_page_queryset(queryset, request, view)
+        )
+
+    def _edge_values(self, item):
+        return [
+            self._get_value(item, field) for field in self.current_ordering
+        ]
+
+    def get_next_link(self):
+        if not (self.has_next and self.page):
+            return None
+
+        return self.encode_cursor(self._edge_values(self.page[-1]), False)
+
+    def get_previous_link(self):
+        if not (self.has_previous and self.page):
+            return None
+
+        return self.encode_cursor(self._edge_values(self.page[0]), True)
+
+    def get_paginated_data(self, data):
+        return OrderedDict(
+            [
+                ("next", self.get_next_link()),
+                ("previous", self.get_previous_link()),
+                ("results", data),
+            ]
+        )
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True},
+                "previous": {"type": "string", "nullable": True},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+
+class PerformancePagination(KeysetPagination):
+    ordering = ("show_time", "id")
+
+
+class PlayPagination(KeysetPagination):
+    ordering = ("title", "id")
+
+    def get_ordering(self, request, queryset, view):
+        if "search_rank" in queryset.query.annotations:
+            return "search_rank", "id"
+
+        return self.ordering
+
+
+class TicketPagination(KeysetPagination):
+    ordering = ("performance_id", "id")
+
+
+class ReservationPagination(KeysetPagination):
+    ordering = ("-created_at", "-id")
+
+
+def estimate_row_count(model, using):
+    """Row count of the model table from planner statistics, or from the
+    largest primary key where the database keeps none."""
+    connection = connections[using]
+
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class "
+                "WHERE oid = %s::regclass",
+                [model._meta.db_table],
+            )
+            row = cursor.fetchone()
+
+        # reltuples is -1 until the table is first analyzed
+        if row and row[0] >= 0:
+            return row[0]
+
+    return (
+        model._default_manager.using(using).aggregate(last=Max("pk"))["last"]
+        or 0
+    )
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator for admin changelists of big tables.
+
+    Unfiltered lists past ``exact_count_limit`` rows use an estimate
+    instead of COUNT(*), filtered counts stop at ``max_count`` rows.
+    """
+
+    exact_count_limit = 10_000
+    max_count = 100_000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+
+        if not queryset.query.where:
+            estimate = estimate_row_count(queryset.model, queryset.db)
+            if estimate > self.exact_count_limit:
+                return estimate
+
+        return queryset.order_by()[: self.max_count].count()
@@ -0,0 +1,117 @@
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import Performance, PerformanceRollup
+
+ROLLUP_GROUPS = {
+    "day": ("day",),
+    "play": ("play", "play__title"),
+    "theatre_hall": ("theatre_hall", "theatre_hall__name"),
+}
+
+
+def _save_rollups(rollups):
+    # Replace instead of bulk_create(update_conflicts=True), which
+    # Django 4.1 cannot aim at a primary key that is also a relation
+    with transaction.atomic():
+        PerformanceRollup.objects.filter(
+            performance_id__in=[rollup.performance_id for rollup in rollups]
+        ).delete()
+        PerformanceRollup.objects.bulk_create(rollups)
+
+
+def build_rollup(performance, seats_sold=None):
+    return PerformanceRollup(
+        performance_id=performance.id,
+        day=timezone.localdate(performance.show_time),
+        play_id=performance.play_id,
+        theatre_hall_id=performance.theatre_hall_id,
+        seats_sold=(
+            performance.tickets_sold if seats_sold is None else seats_sold
+        ),
+        capacity=performance.theatre_hall.capacity,
+    )
+
+
+def create_rollups(performances, batch_size=500):
+    """Rollups of performances just inserted with bulk_create."""
+    PerformanceRollup.objects.bulk_create(
+        [build_rollup(performance) for performance in performances],
+        batch_size=batch_size,
+    )
+
+
+def refresh_rollups(performances, recount=False, batch_size=500):
+    """Write the rollups of a ``Performance`` queryset, return how many.
+
+    Seats sold come from the ``tickets_sold`` counters, ``recount``
+    counts the tickets instead when rebuilding from scratch.
+    """
+    performances = performances.select_related("theatre_hall").order_by()
+    if recount:
+        performances = performances.annotate(ticket_count=Count("tickets"))
+
+    rollups = []
+    refreshed = 0
+
+    for performance in performances.iterator(chunk_size=batch_size):
+        rollups.append(
+            build_rollup(
+                performance,
+                performance.ticket_count if recount else None,
+            )
+        )
+
+        if len(rollups) == batch_size:
+            _save_rollups(rollups)
+            refreshed += len(rollups)
+            rollups = []
+
+    if rollups:
+        _save_rollups(rollups)
+        refreshed += len(rollups)
+
+    return refreshed
+
+
+def adjust_rollup_seats(performance_id, delta):
+    updated = PerformanceRollup.objects.filter(
+        performance_id=performance_id
+    ).update(seats_sold=Greatest(F("seats_sold") + delta, 0))
+
+    if not updated and delta > 0:
+        # Performances inserted without signals have no rollup yet. Ticket
+        # deletions never recreate one: when a performance is deleted its
+        # rollup is cascaded away before its tickets.
+        refresh_rollups(Performance.objects.filter(pk=performance_id))
+
+
+def occupancy_report(rollups, group_by):
+    """Seats sold, capacity and fill rate of the rollups per group."""
+    fields = [field for group in group_by for field in ROLLUP_GROUPS[group]]
+    rows = (
+        rollups.values(*fields)
+        .annotate(
+            performance_count=Count("pk"),
+            total_sold=Sum("seats_sold"),
+            total_capacity=Sum("capacity"),
+        )
+        .order_by(*fields)
+    )
+
+    return [
+        {
+            **{field.replace("__", "_"): row[field] for field in fields},
+            "performances": row["performance_count"],
+            "seats_sold": row["total_sold"],
+            "capacity": row["total_capacity"],
+            "fill_rate": (
+                round(row["total_sold"] / row["total_capacity"], 4)
+                if row["total_capacity"]
+                else 0
+            ),
+        }
+        for row in rows
+    ]
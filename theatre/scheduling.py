@@ -0,0 +1,115 @@
+from bisect import bisect_left
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .cache import bump_version
+from .models import Performance, TheatreHall
+from .rollups import create_rollups
+
+DEFAULT_PERFORMANCE_DURATION = 180
+MAX_SCHEDULE_DAYS = 366
+MAX_REPORTED_CONFLICTS = 20
+
+
+def get_performance_duration():
+    return timedelta(
+        minutes=getattr(
+            settings,
+            "THEATRE_PERFORMANCE_DURATION",
+            DEFAULT_PERFORMANCE_DURATION,
+        )
+    )
+
+
+def expand_recurrence(start_date, end_date, weekdays, times):
+    """Every show time of the recurrence in the current time zone,
+    ``weekdays`` counting from 0 for Monday."""
+    show_times = []
+    day = start_date
+
+    while day <= end_date:
+        if day.weekday() in weekdays:
+            show_times += [
+                timezone.make_aware(datetime.combine(day, show_time))
+                for show_time in times
+            ]
+        day += timedelta(days=1)
+
+    return sorted(show_times)
+
+
+def _overlapping(show_times, busy_times, duration):
+    """Show times starting less than ``duration`` from a busy time."""
+    conflicts = []
+
+    for show_time in show_times:
+        index = bisect_left(busy_times, show_time)
+        neighbours = busy_times[max(index - 1, 0):index + 1]
+        if any(abs(show_time - busy) < duration for busy in neighbours):
+            conflicts.append(show_time)
+
+    return conflicts
+
+
+def find_hall_conflicts(theatre_hall, show_times):
+    """New show times overlapping each other or performances already
+    booked in the hall, checked with a single query."""
+    if not show_times:
+        return []
+
+    duration = get_performance_duration()
+    booked = sorted(
+        Performance.objects.filter(
+            theatre_hall=theatre_hall,
+            show_time__gt=show_times[0] - duration,
+            show_time__lt=show_times[-1] + duration,
+        ).values_list("show_time", flat=True)
+    )
+    conflicts = set(_overlapping(show_times, booked, duration))
+
+    for previous, show_time in zip(show_times, show_times[1:]):
+        if show_time - previous < duration:
+            conflicts.add(show_time)
+
+    return sorted(conflicts)
+
+
+def schedule_performances(play, theatre_hall, show_times):
+    """Create all performances of a season in one transaction."""
+    with transaction.atomic():
+        # Serialize concurrent schedulers of the same hall
+        TheatreHall.objects.select_for_update().only("id").get(
+            pk=theatre_hall.pk
+        )
+        conflicts = find_hall_conflicts(theatre_hall, show_times)
+
+        if conflicts:
+            raise ValidationError(
+                {
+                    "theatre_hall": [
+                        f"The hall is already booked at "
+                        f"{show_time.isoformat()}"
+                        for show_time in conflicts[:MAX_REPORTED_CONFLICTS]
+                    ]
+                }
+            )
+
+        performances = Performance.objects.bulk_create(
+            [
+                Performance(
+                    play=play, theatre_hall=theatre_hall, show_time=show_time
+                )
+                for show_time in show_times
+            ],
+            batch_size=500,
+        )
+        # bulk_create skips the post_save signals bumping this version
+        # and writing the rollups
+        bump_version(Performance)
+        create_rollups(performances)
+
+    return performances
@@ -0,0 +1,88 @@
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from drf_spectacular.renderers import OpenApiJsonRenderer
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SCHEMA_KWARGS, SpectacularAPIView
+
+
+def get_schema_file():
+    return getattr(settings, "THEATRE_SCHEMA_FILE", None)
+
+
+def generate_schema():
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    return generator.get_schema(request=None, public=True)
+
+
+def write_schema_file(path=None):
+    """Generate the schema into a JSON file served by the schema view."""
+    path = path or get_schema_file()
+    content = OpenApiJsonRenderer().render(generate_schema())
+
+    with open(path, "wb") as schema_file:
+        schema_file.write(content)
+
+    return path
+
+
+@lru_cache(maxsize=None)
+def load_schema():
+    """The schema from ``THEATRE_SCHEMA_FILE``, generated once per
+    process when the file is missing."""
+    path = get_schema_file()
+
+    if path and os.path.exists(path):
+        with open(path, "rb") as schema_file:
+            return json.load(schema_file)
+
+    return generate_schema()
+
+
+@lru_cache(maxsize=None)
+def render_schema(renderer_class):
+    content = renderer_class().render(load_schema(), renderer_context={})
+    return content, hashlib.md5(content).hexdigest()
+
+
+def clear_schema_cache():
+    load_schema.cache_clear()
+    render_schema.cache_clear()
+
+
+def warm_schema_cache():
+    """Build the schema before the first request when preloading is on."""
+    if getattr(settings, "THEATRE_SCHEMA_PRELOAD", False):
+        load_schema()
+
+
+def _schema_etag(request, *args, **kwargs):
+    return render_schema(type(request.accepted_renderer))[1]
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """``SpectacularAPIView`` rendering the schema once per process and
+    format instead of introspecting every view on each request.
+
+    Clients revalidate with the ETag, which only changes on deploy.
+    """
+
+    @extend_schema(**SCHEMA_KWARGS)
+    @method_decorator(condition(etag_func=_schema_etag))
+    def get(self, request, *args, **kwargs):
+        renderer = request.accepted_renderer
+        content, _ = render_schema(type(renderer))
+        response = HttpResponse(content, content_type=renderer.media_type)
+        response["Content-Disposition"] = (
+            f'inline; filename="{self._get_filename(request, None)}"'
+        )
+        response["Cache-Control"] = "no-cache"
+
+        return response
@@ -0,0 +1,172 @@
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+from .models import Play
+
+SQLITE_BACKEND = "theatre.search.SQLiteFTS5SearchBackend"
+DATABASE_BACKEND = "theatre.search.DatabaseSearchBackend"
+
+
+def _terms(query):
+    return re.findall(r"\w+", query)
+
+
+class BaseSearchBackend:
+    """Interface of the play search index."""
+
+    def index_plays(self, play_ids):
+        raise NotImplementedError
+
+    def remove_plays(self, play_ids):
+        raise NotImplementedError
+
+    def search(self, query, limit):
+        """Return ids of plays matching the query, best match first."""
+        raise NotImplementedError
+
+    def rebuild(self):
+        raise NotImplementedError
+
+
+class DatabaseSearchBackend(BaseSearchBackend):
+    """Unindexed fallback for databases without a full-text engine."""
+
+    def index_plays(self, play_ids):
+        pass
+
+    def remove_plays(self, play_ids):
+        pass
+
+    def search(self, query, limit):
+        condition = Q()
+
+        for term in _terms(query):
+            condition &= (
+                Q(title__icontains=term)
+                | Q(description__icontains=term)
+                | Q(actors__first_name__icontains=term)
+                | Q(actors__last_name__icontains=term)
+                | Q(genres__name__icontains=term)
+            )
+
+        if not condition:
+            return []
+
+        return list(
+            Play.objects.filter(condition)
+            .order_by("title")
+            .values_list("id", flat=True)
+            .distinct()[:limit]
+        )
+
+    def rebuild(self):
+        pass
+
+
+class SQLiteFTS5SearchBackend(BaseSearchBackend):
+    """Inverted index kept in an FTS5 virtual table of the same database.
+
+    Index writes share the transaction of the change that caused them.
+    """
+
+    table = "theatre_play_fts"
+    # bm25 weights of the title, description, actors and genres columns
+    weights = (10.0, 1.0, 5.0, 5.0)
+
+    def _documents(self, play_ids):
+        plays = Play.objects.prefetch_related("genres", "actors")
+
+        if play_ids is not None:
+            plays = plays.filter(id__in=play_ids)
+
+        for play in plays.iterator(chunk_size=500):
+            yield (
+                play.id,
+                play.title,
+                play.description,
+                " ".join(actor.full_name for actor in play.actors.all()),
+                " ".join(genre.name for genre in play.genres.all()),
+            )
+
+    def _delete(self, cursor, play_ids):
+        cursor.execute(
+            f"DELETE FROM {self.table} WHERE rowid IN "
+            f"({', '.join(['%s'] * len(play_ids))})",
+            play_ids,
+        )
+
+    def _insert(self, cursor, play_ids=None):
+        cursor.executemany(
+            f"INSERT INTO {self.table} "
+            f"(rowid, title, description, actors, genres) "
+            f"VALUES (%s, %s, %s, %s, %s)",
+            list(self._documents(play_ids)),
+        )
+
+    def index_plays(self, play_ids):
+        play_ids = list(play_ids)
+
+        if not play_ids:
+            return
+
+        with connection.cursor() as cursor:
+            self._delete(cursor, play_ids)
+            self._insert(cursor, play_ids)
+
+    def remove_plays(self, play_ids):
+        play_ids = list(play_ids)
+
+        if not play_ids:
+            return
+
+        with connection.cursor() as cursor:
+            self._delete(cursor, play_ids)
+
+    def search(self, query, limit):
+        terms = _terms(query)
+
+        if not terms:
+            return []
+
+        match = " ".join(f'"{term}"*' for term in terms)
+        weights = ", ".join(str(weight) for weight in self.weights)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {self.table} "
+                f"WHERE {self.table} MATCH %s "
+                f"ORDER BY bm25({self.table}, {weights}) LIMIT %s",
+                [match, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+            self._insert(cursor)
+
+
+@lru_cache(maxsize=None)
+def _load_backend(path):
+    return import_string(path)()
+
+
+def get_search_backend():
+    path = getattr(settings, "THEATRE_SEARCH_BACKEND", None)
+
+    if path is None:
+        path = (
+            SQLITE_BACKEND if connection.vendor == "sqlite"
+            else DATABASE_BACKEND
+        )
+
+    return _load_backend(path)
+
+
+def get_search_limit():
+    return getattr(settings, "THEATRE_SEARCH_LIMIT", 500)
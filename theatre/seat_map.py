@@ -0,0 +1,121 @@
+import base64
+from itertools import groupby
+
+from django.conf import settings
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+from .cache import get_versions
+from .models import TheatreHall
+from .occupancy import get_occupancy_cache
+
+HALL_LAYOUT_CACHE_KEY = "theatre:hall-layout:{id}:{rows}x{seats}:{version}"
+SEAT_MAP_ENCODINGS = ("rle", "bitmap")
+MAX_AVAILABILITY_PERFORMANCES = 100
+FREE_SEAT, TAKEN_SEAT = ".", "x"
+
+
+def get_hall_layout(theatre_hall):
+    """Static part of the seat map, cached per hall size and under the
+    TheatreHall version stamp, which every hall change bumps."""
+    cache = get_occupancy_cache()
+    key = HALL_LAYOUT_CACHE_KEY.format(
+        id=theatre_hall.id,
+        rows=theatre_hall.rows,
+        seats=theatre_hall.seats_in_row,
+        version=get_versions([TheatreHall])[0],
+    )
+    layout = cache.get(key)
+
+    if layout is None:
+        layout = {
+            "theatre_hall": theatre_hall.id,
+            "name": theatre_hall.name,
+            "rows": theatre_hall.rows,
+            "seats_in_row": theatre_hall.seats_in_row,
+            "capacity": theatre_hall.capacity,
+            "empty_row": f"{theatre_hall.seats_in_row}{FREE_SEAT}",
+        }
+        cache.set(
+            key,
+            layout,
+            timeout=getattr(settings, "THEATRE_OCCUPANCY_CACHE_TIMEOUT", 3600),
+        )
+
+    return layout
+
+
+def encode_rle(occupancy):
+    """One string of runs per row, e.g. ``2.1x27.`` for the third seat."""
+    seats = "".join(
+        format(byte, "08b")[::-1] for byte in occupancy.bits
+    ).translate({ord("0"): FREE_SEAT, ord("1"): TAKEN_SEAT})
+    seats_in_row = occupancy.seats_in_row
+
+    return [
+        "".join(
+            f"{len(list(run))}{symbol}"
+            for symbol, run in groupby(seats[start:start + seats_in_row])
+        )
+        for start in range(0, occupancy.rows * seats_in_row, seats_in_row)
+    ]
+
+
+def encode_bitmap(occupancy):
+    """Base64 of the occupancy bits, row-major and least significant first."""
+    return base64.b64encode(bytes(occupancy.bits)).decode()
+
+
+def get_seat_map_encoding(query_params):
+    encoding = query_params.get("encoding", "rle")
+
+    if encoding not in SEAT_MAP_ENCODINGS:
+        raise ValidationError(
+            {"encoding": f"Choose one of: {', '.join(SEAT_MAP_ENCODINGS)}"}
+        )
+
+    return encoding
+
+
+def build_seat_map(performance, occupancy, encoding="rle"):
+    layout = get_hall_layout(performance.theatre_hall)
+    taken = occupancy.taken_count
+
+    return {
+        "id": performance.id,
+        "layout": layout,
+        "encoding": encoding,
+        "seats": (
+            encode_rle(occupancy)
+            if encoding == "rle"
+            else encode_bitmap(occupancy)
+        ),
+        "taken": taken,
+        "available": occupancy.rows * occupancy.seats_in_row - taken,
+    }
+
+
+def build_availability(performance, occupancy=None):
+    """Free seat counts of a performance, with its bitmap when the
+    occupancy is passed."""
+    capacity = performance.theatre_hall.capacity
+    taken = (
+        occupancy.taken_count
+        if occupancy is not None
+        else performance.tickets_sold
+    )
+    availability = {
+        "id": performance.id,
+        "show_time": serializers.DateTimeField().to_representation(
+            performance.show_time
+        ),
+        "theatre_hall": performance.theatre_hall_id,
+        "capacity": capacity,
+        "taken": taken,
+        "available": capacity - taken,
+    }
+
+    if occupancy is not None:
+        availability["bitmap"] = encode_bitmap(occupancy)
+
+    return availability
@@ -1,6 +1,8 @@
-from django.db import transaction
+from django.core.files.storage import default_storage
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 from .models import (
+    MAX_ID,
     TheatreHall,
     Genre,
     Actor,
@@ -9,6 +11,16 @@ from .models import (
     Reservation,
     Ticket
 )
+from .booking import create_reservation
+from .holds import hold_seats
+from .images import IMAGE_VARIANTS
+from .occupancy import get_occupancy
+from .scheduling import (
+    MAX_SCHEDULE_DAYS,
+    expand_recurrence,
+    schedule_performances,
+)
+from .seat_map import SEAT_MAP_ENCODINGS
 
 
 class TheatreHallSerializer(serializers.ModelSerializer):
@@ -35,7 +47,32 @@ class PlaySerializer(serializers.ModelSerializer):
         fields = ("id", "title", "description", "genres", "actors")
 
 
-class PlayListSerializer(PlaySerializer):
+class PlayImageVariantsMixin(serializers.Serializer):
+    image_variants = serializers.SerializerMethodField()
+
+    @extend_schema_field(
+        {
+            "type": "object",
+            "properties": {
+                variant: {"type": "string", "format": "uri"}
+                for variant in IMAGE_VARIANTS
+            },
+        }
+    )
+    def get_image_variants(self, play):
+        request = self.context.get("request")
+        variants = {}
+
+        for variant, path in play.image_variants.items():
+            url = default_storage.url(path)
+            variants[variant] = (
+                request.build_absolute_uri(url) if request else url
+            )
+
+        return variants
+
+
+class PlayListSerializer(PlayImageVariantsMixin, PlaySerializer):
     genres = serializers.SlugRelatedField(
         many=True, read_only=True, slug_field="name"
     )
@@ -47,16 +84,32 @@ class PlayListSerializer(PlaySerializer):
 
     class Meta:
         model = Play
-        fields = ("id", "title", "description", "genres", "actors", "image")
+        fields = (
+            "id",
+            "title",
+            "description",
+            "genres",
+            "actors",
+            "image",
+            "image_variants",
+        )
 
 
-class PlayDetailSerializer(PlaySerializer):
+class PlayDetailSerializer(PlayImageVariantsMixin, PlaySerializer):
     genres = GenreSerializer(many=True, read_only=True)
     actors = ActorSerializer(many=True, read_only=True)
 
     class Meta:
         model = Play
-        fields = ("id", "title", "description", "genres", "actors", "image")
+        fields = (
+            "id",
+            "title",
+            "description",
+            "genres",
+            "actors",
+            "image",
+            "image_variants",
+        )
 
 
 class PerformanceSerializer(serializers.ModelSerializer):
@@ -65,6 +118,66 @@ class PerformanceSerializer(serializers.ModelSerializer):
         fields = ("id", "show_time", "play", "theatre_hall")
 
 
+class PerformanceScheduleSerializer(serializers.Serializer):
+    play = serializers.PrimaryKeyRelatedField(queryset=Play.objects.all())
+    theatre_hall = serializers.PrimaryKeyRelatedField(
+        queryset=TheatreHall.objects.all()
+    )
+    start_date = serializers.DateField(write_only=True)
+    end_date = serializers.DateField(write_only=True)
+    weekdays = serializers.ListField(
+        child=serializers.IntegerField(min_value=0, max_value=6),
+        allow_empty=False,
+        write_only=True,
+        help_text="Days of the week, 0 is Monday",
+    )
+    times = serializers.ListField(
+        child=serializers.TimeField(), allow_empty=False, write_only=True
+    )
+    created = serializers.IntegerField(read_only=True)
+    first_show_time = serializers.DateTimeField(read_only=True)
+    last_show_time = serializers.DateTimeField(read_only=True)
+
+    def validate(self, attrs):
+        days = (attrs["end_date"] - attrs["start_date"]).days
+
+        if days < 0:
+            raise serializers.ValidationError(
+                {"end_date": "The end date is before the start date"}
+            )
+        if days >= MAX_SCHEDULE_DAYS:
+            raise serializers.ValidationError(
+                {"end_date": f"Schedule at most {MAX_SCHEDULE_DAYS} days"}
+            )
+
+        attrs["show_times"] = expand_recurrence(
+            attrs["start_date"],
+            attrs["end_date"],
+            set(attrs["weekdays"]),
+            sorted(set(attrs["times"])),
+        )
+        if not attrs["show_times"]:
+            raise serializers.ValidationError(
+                {"weekdays": "No weekday falls into the date range"}
+            )
+
+        return attrs
+
+    def create(self, validated_data):
+        performances = schedule_performances(
+            validated_data["play"],
+            validated_data["theatre_hall"],
+            validated_data["show_times"],
+        )
+        return {
+            "play": validated_data["play"],
+            "theatre_hall": validated_data["theatre_hall"],
+            "created": len(performances),
+            "first_show_time": performances[0].show_time,
+            "last_show_time": performances[-1].show_time,
+        }
+
+
 class PerformanceListSerializer(serializers.ModelSerializer):
     play_title = serializers.CharField(source="play.title", read_only=True)
     theatre_hall_name = serializers.CharField(
@@ -73,6 +186,7 @@ class PerformanceListSerializer(serializers.ModelSerializer):
     theatre_hall_capacity = serializers.IntegerField(
         source="theatre_hall.capacity", read_only=True
     )
+    tickets_available = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Performance
@@ -82,21 +196,38 @@ class PerformanceListSerializer(serializers.ModelSerializer):
             "play_title",
             "theatre_hall_name",
             "theatre_hall_capacity",
+            "tickets_available",
         )
 
 
+class ReservationTicketSerializer(serializers.ModelSerializer):
+    performance = serializers.IntegerField(
+        source="performance_id", min_value=1, max_value=MAX_ID
+    )
+
+    class Meta:
+        model = Ticket
+        fields = ("id", "row", "seat", "performance")
+        extra_kwargs = {
+            "row": {"min_value": 1, "max_value": MAX_ID},
+            "seat": {"min_value": 1, "max_value": MAX_ID},
+        }
+
+
 class ReservationSerializer(serializers.ModelSerializer):
+    tickets = ReservationTicketSerializer(many=True, allow_empty=False)
+
     class Meta:
         model = Reservation
-        fields = "__all__"
+        fields = ("id", "tickets", "created_at")
 
     def create(self, validated_data):
-        with transaction.atomic():
-            tickets_data = validated_data.pop("tickets")
-            reservation = Reservation.objects.create(**validated_data)
-            for ticket_data in tickets_data:
-                Ticket.objects.create(reservation=reservation, **ticket_data)
-            return reservation
+        tickets_data = validated_data.pop("tickets")
+        return create_reservation(tickets=tickets_data, **validated_data)
+
+
+class ReservationUpdateSerializer(ReservationSerializer):
+    tickets = ReservationTicketSerializer(many=True, read_only=True)
 
 
 class TicketSerializer(serializers.ModelSerializer):
@@ -115,29 +246,172 @@ class TicketTakenSeatsSerializer(TicketSerializer):
         fields = ("row", "seat")
 
 
+class HallLayoutSerializer(serializers.Serializer):
+    theatre_hall = serializers.IntegerField()
+    name = serializers.CharField()
+    rows = serializers.IntegerField()
+    seats_in_row = serializers.IntegerField()
+    capacity = serializers.IntegerField()
+    empty_row = serializers.CharField()
+
+
+class SeatMapSerializer(serializers.Serializer):
+    id = serializers.IntegerField()  # noqa: VNE003
+    layout = HallLayoutSerializer()
+    encoding = serializers.ChoiceField(choices=SEAT_MAP_ENCODINGS)
+    seats = serializers.JSONField(
+        help_text="List of row run strings such as '2.1x27.', "
+        "or a base64 bitmap"
+    )
+    taken = serializers.IntegerField()
+    available = serializers.IntegerField()
+
+
+class PerformanceAvailabilitySerializer(serializers.Serializer):
+    id = serializers.IntegerField()  # noqa: VNE003
+    show_time = serializers.DateTimeField()
+    theatre_hall = serializers.IntegerField()
+    capacity = serializers.IntegerField()
+    taken = serializers.IntegerField()
+    available = serializers.IntegerField()
+    bitmap = serializers.CharField(
+        required=False,
+        help_text="Base64 occupancy bitmap, only with ?bitmap=true",
+    )
+
+
 class PerformanceDetailSerializer(PerformanceSerializer):
     play = PlayListSerializer(many=False, read_only=True)
     theatre_hall = TheatreHallSerializer(many=False, read_only=True)
-    taken_places = TicketTakenSeatsSerializer(
-        source="tickets", many=True, read_only=True
-    )
+    taken_places = serializers.SerializerMethodField()
 
     class Meta:
         model = Performance
         fields = (
             "id",
             "show_time",
-            "play_title",
+            "play",
             "theatre_hall",
             "taken_places",
         )
 
+    @extend_schema_field(TicketTakenSeatsSerializer(many=True))
+    def get_taken_places(self, performance):
+        occupancy = self.context.get("occupancy") or get_occupancy(
+            performance
+        )
+        return occupancy.taken_places()
+
 
 class ReservationListSerializer(ReservationSerializer):
     tickets = TicketListSerializer(many=True, read_only=True)
 
 
+RESERVATION_ROW_FIELDS = (
+    "id",
+    "created_at",
+    "tickets__id",
+    "tickets__row",
+    "tickets__seat",
+    "tickets__performance_id",
+    "tickets__performance__show_time",
+    "tickets__performance__tickets_sold",
+    "tickets__performance__play__title",
+    "tickets__performance__theatre_hall__name",
+    "tickets__performance__theatre_hall__rows",
+    "tickets__performance__theatre_hall__seats_in_row",
+)
+
+
+def group_reservation_rows(rows):
+    """Fold the ``RESERVATION_ROW_FIELDS`` rows into one dict per
+    reservation, keeping the row order."""
+    reservations = {}
+
+    for row in rows:
+        reservation = reservations.setdefault(
+            row["id"],
+            {"id": row["id"], "created_at": row["created_at"], "tickets": []},
+        )
+        if row["tickets__id"] is not None:
+            reservation["tickets"].append(row)
+
+    return list(reservations.values())
+
+
+def reservation_list_data(reservations):
+    """Same output as ``ReservationListSerializer``, built from rows."""
+    to_datetime = serializers.DateTimeField().to_representation
+    data = []
+
+    for reservation in reservations:
+        tickets = []
+        for row in reservation["tickets"]:
+            capacity = (
+                row["tickets__performance__theatre_hall__rows"]
+                * row["tickets__performance__theatre_hall__seats_in_row"]
+            )
+            tickets.append(
+                {
+                    "id": row["tickets__id"],
+                    "row": row["tickets__row"],
+                    "seat": row["tickets__seat"],
+                    "performance": {
+                        "id": row["tickets__performance_id"],
+                        "show_time": to_datetime(
+                            row["tickets__performance__show_time"]
+                        ),
+                        "play_title": row["tickets__performance__play__title"],
+                        "theatre_hall_name": row[
+                            "tickets__performance__theatre_hall__name"
+                        ],
+                        "theatre_hall_capacity": capacity,
+                        "tickets_available": capacity
+                        - row["tickets__performance__tickets_sold"],
+                    },
+                    "reservation": reservation["id"],
+                }
+            )
+        data.append(
+            {
+                "id": reservation["id"],
+                "tickets": tickets,
+                "created_at": to_datetime(reservation["created_at"]),
+            }
+        )
+
+    return data
+
+
 class PlayImageSerializer(serializers.ModelSerializer):
     class Meta:
         model = Play
         fields = ("id", "image")
+
+
+class SeatHoldSerializer(serializers.Serializer):
+    token = serializers.UUIDField(read_only=True)
+    expires_at = serializers.DateTimeField(read_only=True)
+    tickets = ReservationTicketSerializer(many=True, allow_empty=False)
+
+    def create(self, validated_data):
+        token, expires_at = hold_seats(
+            validated_data["user"], validated_data["tickets"]
+        )
+        return {
+            "token": token,
+            "expires_at": expires_at,
+            "tickets": validated_data["tickets"],
+        }
+
+
+class OccupancyReportSerializer(serializers.Serializer):
+    day = serializers.DateField(required=False)
+    play = serializers.IntegerField(required=False)
+    play_title = serializers.CharField(required=False)
+    theatre_hall = serializers.IntegerField(required=False)
+    theatre_hall_name = serializers.CharField(required=False)
+    performances = serializers.IntegerField()
+    seats_sold = serializers.IntegerField()
+    capacity = serializers.IntegerField()
+    fill_rate = serializers.FloatField()
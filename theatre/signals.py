@@ -0,0 +1,168 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from .booking import adjust_tickets_sold
+from .cache import bump_version
+from .db import enable_sqlite_wal
+from .middleware import install_query_recorder
+from .models import Actor, Genre, Performance, Play, TheatreHall, Ticket
+from .rollups import refresh_rollups
+from .search import get_search_backend
+
+
+@receiver(pre_save, sender=Ticket)
+def remember_previous_seat(sender, instance, **kwargs):
+    instance._previous_performance_id = None
+
+    if instance.pk:
+        instance._previous_performance_id = (
+            Ticket.objects.filter(pk=instance.pk)
+            .values_list("performance_id", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Ticket)
+def update_performance_on_save(sender, instance, created, **kwargs):
+    performance_id = instance.performance_id
+
+    if created:
+        adjust_tickets_sold(performance_id, 1)
+        return
+
+    previous_performance_id = instance._previous_performance_id
+
+    if previous_performance_id != performance_id:
+        adjust_tickets_sold(previous_performance_id, -1)
+        adjust_tickets_sold(performance_id, 1)
+
+
+@receiver(post_delete, sender=Ticket)
+def update_performance_on_delete(sender, instance, **kwargs):
+    adjust_tickets_sold(instance.performance_id, -1)
+
+
+@receiver(post_save, sender=Play)
+def index_play(sender, instance, **kwargs):
+    get_search_backend().index_plays([instance.id])
+
+
+@receiver(post_delete, sender=Play)
+def remove_play_from_index(sender, instance, **kwargs):
+    get_search_backend().remove_plays([instance.id])
+
+
+@receiver(m2m_changed, sender=Play.genres.through)
+@receiver(m2m_changed, sender=Play.actors.through)
+def index_play_relations(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == "pre_clear":
+        instance._indexed_play_ids = list(
+            instance.plays.values_list("id", flat=True)
+        )
+        return
+
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        play_ids = [instance.id]
+    elif action == "post_clear":
+        play_ids = instance._indexed_play_ids
+    else:
+        play_ids = pk_set
+
+    get_search_backend().index_plays(play_ids)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Actor)
+def index_related_plays(sender, instance, created, **kwargs):
+    if not created:
+        get_search_backend().index_plays(
+            instance.plays.values_list("id", flat=True)
+        )
+
+
+@receiver(pre_delete, sender=Genre)
+@receiver(pre_delete, sender=Actor)
+def remember_related_plays(sender, instance, **kwargs):
+    instance._indexed_play_ids = list(
+        instance.plays.values_list("id", flat=True)
+    )
+
+
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Actor)
+def index_plays_of_deleted_relation(sender, instance, **kwargs):
+    get_search_backend().index_plays(instance._indexed_play_ids)
+
+
+@receiver(post_save, sender=TheatreHall)
+@receiver(post_delete, sender=TheatreHall)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+@receiver(post_save, sender=Actor)
+@receiver(post_delete, sender=Actor)
+@receiver(post_save, sender=Play)
+@receiver(post_delete, sender=Play)
+def bump_catalog_version(sender, **kwargs):
+    bump_version(sender)
+
+
+@receiver(m2m_changed, sender=Play.genres.through)
+@receiver(m2m_changed, sender=Play.actors.through)
+def bump_play_relations_version(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_version(Play)
+
+
+@receiver(post_save, sender=Performance)
+@receiver(post_delete, sender=Performance)
+def bump_performance_version(sender, instance, **kwargs):
+    bump_version(Performance)
+    bump_version((Performance, instance.pk))
+
+
+@receiver(post_save, sender=Ticket)
+@receiver(post_delete, sender=Ticket)
+def bump_seats_version(sender, instance, **kwargs):
+    bump_version(Ticket)
+    bump_version((Performance, instance.performance_id))
+    previous_performance_id = getattr(
+        instance, "_previous_performance_id", None
+    )
+
+    if previous_performance_id:
+        bump_version((Performance, previous_performance_id))
+
+
+@receiver(post_save, sender=Performance)
+def refresh_performance_rollup(sender, instance, **kwargs):
+    refresh_rollups(Performance.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=TheatreHall)
+def refresh_hall_rollups(sender, instance, created, **kwargs):
+    if not created:
+        refresh_rollups(Performance.objects.filter(theatre_hall=instance))
+
+
+@receiver(connection_created)
+def configure_sqlite_connection(sender, connection, **kwargs):
+    if connection.vendor == "sqlite" and getattr(
+        settings, "THEATRE_SQLITE_WAL", False
+    ):
+        enable_sqlite_wal(connection)
+
+
+@receiver(connection_created)
+def record_connection_queries(sender, connection, **kwargs):
+    install_query_recorder(connection)
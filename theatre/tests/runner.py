@@ -0,0 +1,22 @@
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+from theatre.throttling import MEMORY_STORE
+
+
+class TestRunner(DiscoverRunner):
+    """Keep the throttle buckets, version stamps and cached users of the
+    tests in memory, away from the stores of a local server."""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.local_settings = override_settings(
+            THEATRE_THROTTLE_STORE=MEMORY_STORE,
+            THEATRE_VERSION_CACHE="default",
+            USER_AUTH_CACHE="default",
+        )
+        self.local_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.local_settings.disable()
+        super().teardown_test_environment(**kwargs)
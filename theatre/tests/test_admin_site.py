@@ -0,0 +1,90 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from theatre.models import Reservation, Ticket
+from theatre.pagination import EstimatedCountPaginator
+from theatre.tests.test_samples import (
+    ResetCachesMixin,
+    sample_performance,
+    sample_play,
+)
+
+TICKET_CHANGELIST_URL = reverse("admin:theatre_ticket_changelist")
+
+
+class AdminChangelistTests(ResetCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = get_user_model().objects.create_superuser(
+            "admin@test.com", "password"
+        )
+        self.client.force_login(self.user)
+        self.performance = sample_performance(play=sample_play())
+        self.reservation = Reservation.objects.create(user=self.user)
+        self.seat = 0
+
+    def add_tickets(self, count):
+        for _ in range(count):
+            self.seat += 1
+            Ticket.objects.create(
+                row=1,
+                seat=self.seat,
+                performance=self.performance,
+                reservation=self.reservation,
+            )
+
+    def count_changelist_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            res = self.client.get(url)
+
+        self.assertEqual(res.status_code, 200)
+        return len(context)
+
+    def test_ticket_changelist_queries_do_not_grow_with_rows(self):
+        self.add_tickets(1)
+        queries = self.count_changelist_queries(TICKET_CHANGELIST_URL)
+
+        self.add_tickets(5)
+        self.assertEqual(
+            self.count_changelist_queries(TICKET_CHANGELIST_URL), queries
+        )
+
+    def test_changelists_with_date_hierarchy(self):
+        self.add_tickets(1)
+
+        for model in ("reservation", "performance"):
+            res = self.client.get(reverse(f"admin:theatre_{model}_changelist"))
+            self.assertEqual(res.status_code, 200)
+
+    def test_big_tables_are_estimated(self):
+        self.add_tickets(5)
+        Ticket.objects.filter(seat=2).delete()
+        tickets = Ticket.objects.order_by("-id")
+
+        with mock.patch.object(
+            EstimatedCountPaginator, "exact_count_limit", 3
+        ):
+            # The estimate does not see the deleted ticket
+            self.assertEqual(
+                EstimatedCountPaginator(tickets, 2).count,
+                Ticket.objects.order_by("-id").first().id,
+            )
+            self.assertEqual(
+                EstimatedCountPaginator(tickets.filter(row=1), 2).count, 4
+            )
+
+        self.assertEqual(EstimatedCountPaginator(tickets, 2).count, 4)
+
+    def test_filtered_counts_are_capped(self):
+        self.add_tickets(5)
+
+        with mock.patch.object(EstimatedCountPaginator, "max_count", 3):
+            paginator = EstimatedCountPaginator(
+                Ticket.objects.filter(row=1), 2
+            )
+            self.assertEqual(paginator.count, 3)
@@ -0,0 +1,158 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from theatre.models import Reservation, Ticket
+from theatre.tests.test_samples import (
+    ResetCachesMixin,
+    sample_actor,
+    sample_genre,
+    sample_performance,
+    sample_play,
+)
+
+ASYNC_PERFORMANCE_URL = reverse("theatre:async-performance-list")
+ASYNC_PLAY_URL = reverse("theatre:async-play-list")
+PERFORMANCE_URL = reverse("theatre:performance-list")
+PLAY_URL = reverse("theatre:play-list")
+
+
+class AsyncReadViewTests(ResetCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = get_user_model().objects.create_user(
+            "user@test.com", "password"
+        )
+        token = f"Bearer {AccessToken.for_user(self.user)}"
+        self.auth = {"HTTP_AUTHORIZATION": token}
+        self.async_auth = {"authorization": token}
+        self.play = sample_play(title="Hamlet")
+        self.play.genres.add(sample_genre())
+        self.play.actors.add(sample_actor())
+        self.performance = sample_performance(play=self.play)
+        Ticket.objects.create(
+            row=2,
+            seat=3,
+            performance=self.performance,
+            reservation=Reservation.objects.create(user=self.user),
+        )
+
+    async def sync_json(self, url):
+        res = await sync_to_async(self.client.get)(url, **self.auth)
+        return res.json()
+
+    async def test_requires_authentication(self):
+        res = await self.async_client.get(ASYNC_PERFORMANCE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("WWW-Authenticate", res.headers)
+
+    async def test_performance_list_matches_sync_endpoint(self):
+        res = await self.async_client.get(
+            ASYNC_PERFORMANCE_URL, **self.async_auth
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), await self.sync_json(PERFORMANCE_URL))
+
+    async def test_performance_detail_matches_sync_endpoint(self):
+        args = [self.performance.id]
+        res = await self.async_client.get(
+            reverse("theatre:async-performance-detail", args=args),
+            **self.async_auth,
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.json(),
+            await self.sync_json(
+                reverse("theatre:performance-detail", args=args)
+            ),
+        )
+        self.assertEqual(res.json()["taken_places"], [{"row": 2, "seat": 3}])
+
+    async def test_play_list_filters_like_sync_endpoint(self):
+        await sync_to_async(sample_play)(title="Macbeth")
+
+        res = await self.async_client.get(
+            ASYNC_PLAY_URL, {"title": "ham"}, **self.async_auth
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.json(), await self.sync_json(f"{PLAY_URL}?title=ham")
+        )
+        self.assertEqual(len(res.json()["results"]), 1)
+
+    async def test_play_detail_matches_sync_endpoint(self):
+        args = [self.play.id]
+        res = await self.async_client.get(
+            reverse("theatre:async-play-detail", args=args),
+            **self.async_auth,
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.json(),
+            await self.sync_json(reverse("theatre:play-detail", args=args)),
+        )
+
+    async def test_missing_object_returns_404(self):
+        res = await self.async_client.get(
+            reverse("theatre:async-play-detail", args=[0]),
+            **self.async_auth,
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_errors_match_sync_endpoint(self):
+        res = await self.async_client.get(
+            ASYNC_PERFORMANCE_URL, {"play": "abc"}, **self.async_auth
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            res.json(), await self.sync_json(f"{PERFORMANCE_URL}?play=abc")
+        )
+        self.assertIn("play", res.json())
+
+    async def test_seat_map(self):
+        res = await self.async_client.get(
+            reverse(
+                "theatre:async-performance-seat-map",
+                args=[self.performance.id],
+            ),
+            **self.async_auth,
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()["seats"][1], "2.1x17.")
+        self.assertEqual(res.json()["layout"]["rows"], 20)
+
+    async def test_play_list_shares_the_response_cache(self):
+        first = await self.async_client.get(ASYNC_PLAY_URL, **self.async_auth)
+        second = await self.async_client.get(ASYNC_PLAY_URL, **self.async_auth)
+
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.json(), first.json())
+
+    async def test_matching_etag_returns_304(self):
+        args = [self.performance.id]
+        url = reverse("theatre:async-performance-detail", args=args)
+        etag = (await self.async_client.get(url, **self.async_auth))["ETag"]
+        sync_res = await sync_to_async(self.client.get)(
+            reverse("theatre:performance-detail", args=args), **self.auth
+        )
+
+        res = await self.async_client.get(
+            url, **self.async_auth, **{"if-none-match": etag}
+        )
+
+        self.assertEqual(etag, sync_res["ETag"])
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res["ETag"], etag)
@@ -51,7 +51,7 @@ class AuthenticatedCinemaTests(TestCase):
         serializer = PlayListSerializer(plays, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
 
     def test_filter_play_by_title_genre_actor(self):
         play1 = sample_play(title="play 1")
@@ -76,8 +76,8 @@ class AuthenticatedCinemaTests(TestCase):
             },
         )
 
-        self.assertIn(serializer1.data, res.data)
-        self.assertNotIn(serializer2.data, res.data)
+        self.assertIn(serializer1.data, res.data["results"])
+        self.assertNotIn(serializer2.data, res.data["results"])
 
     def test_retrieve_play_detail(self):
         play = sample_play()
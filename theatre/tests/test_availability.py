@@ -0,0 +1,102 @@
+import base64
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from theatre.models import Reservation, Ticket
+from theatre.occupancy import SeatOccupancy
+from theatre.tests.test_samples import (
+    ResetCachesMixin,
+    sample_performance,
+    sample_play,
+)
+
+AVAILABILITY_URL = reverse("theatre:performance-availability")
+
+
+class AvailabilityApiTests(ResetCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "password"
+        )
+        self.client.force_authenticate(self.user)
+        self.play = sample_play()
+        self.performances = [
+            sample_performance(
+                play=self.play, show_time=f"2024-05-0{day} 19:00:00+03:00"
+            )
+            for day in range(1, 6)
+        ]
+        reservation = Reservation.objects.create(user=self.user)
+        for performance, seats in zip(self.performances, range(5)):
+            for seat in range(1, seats + 1):
+                Ticket.objects.create(
+                    row=2,
+                    seat=seat,
+                    performance=performance,
+                    reservation=reservation,
+                )
+
+    def ids(self, performances):
+        return ",".join(str(performance.id) for performance in performances)
+
+    def test_counts_in_one_query(self):
+        with self.assertNumQueries(1):
+            res = self.client.get(
+                AVAILABILITY_URL, {"ids": self.ids(self.performances)}
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["taken"] for item in res.data], [0, 1, 2, 3, 4])
+        self.assertEqual(res.data[4]["available"], 396)
+        self.assertNotIn("bitmap", res.data[0])
+
+    def test_bitmaps_of_cold_and_warm_cache(self):
+        params = {"ids": self.ids(self.performances), "bitmap": "true"}
+
+        with self.assertNumQueries(2):
+            self.client.get(AVAILABILITY_URL, params)
+
+        with self.assertNumQueries(1):
+            res = self.client.get(AVAILABILITY_URL, params)
+
+        bits = base64.b64decode(res.data[2]["bitmap"])
+        occupancy = SeatOccupancy(20, 20, bits)
+        self.assertTrue(occupancy.is_taken(2, 2))
+        self.assertFalse(occupancy.is_taken(2, 3))
+        self.assertEqual(occupancy.taken_count, res.data[2]["taken"])
+
+    def test_play_and_date_range(self):
+        res = self.client.get(
+            AVAILABILITY_URL,
+            {
+                "play": self.play.id,
+                "date_from": "2024-05-02",
+                "date_to": "2024-05-03",
+            },
+        )
+
+        self.assertEqual(
+            [item["id"] for item in res.data],
+            [performance.id for performance in self.performances[1:3]],
+        )
+
+    def test_selection_is_required_and_bounded(self):
+        res = self.client.get(AVAILABILITY_URL)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.client.get(AVAILABILITY_URL, {"ids": "1,x"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("ids", res.data)
+
+        with mock.patch("theatre.views.MAX_AVAILABILITY_PERFORMANCES", 3):
+            res = self.client.get(AVAILABILITY_URL, {"play": self.play.id})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
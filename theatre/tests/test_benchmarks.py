@@ -0,0 +1,108 @@
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.urls import reverse
+
+from theatre.benchmarks import (
+    ClientTransport,
+    auth_headers,
+    benchmark_environment,
+    compare_results,
+    load_catalog,
+    percentile,
+    seed_catalog,
+    summarize,
+    throttling_disabled,
+)
+from theatre.models import Performance, Reservation
+from theatre.tests.test_samples import ResetCachesMixin
+
+RESERVATION_URL = reverse("theatre:reservation-list")
+
+
+class BenchmarkHelpersTests(TestCase):
+    def test_percentile(self):
+        values = list(range(1, 101))
+
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertIsNone(percentile([], 0.5))
+
+    def test_summarize(self):
+        summary = summarize([0.1, 0.2, 0.3, 0.4], elapsed=2, errors=1)
+
+        self.assertEqual(summary["requests"], 4)
+        self.assertEqual(summary["errors"], 1)
+        self.assertEqual(summary["throughput"], 2)
+        self.assertEqual(summary["p50_ms"], 200)
+        self.assertEqual(summary["p99_ms"], 400)
+
+    def test_compare_results(self):
+        baseline = {"endpoints": {"list": {"throughput": 100, "p95_ms": 10}}}
+        current = {"endpoints": {"list": {"throughput": 120, "p95_ms": 5}}}
+
+        self.assertEqual(
+            compare_results(current, baseline),
+            {"list": {"throughput": 0.2, "p95_ms": -0.5}},
+        )
+
+
+class SeedCatalogTests(ResetCachesMixin, TestCase):
+    def test_seed_is_repeatable(self):
+        performance_ids, users = seed_catalog(
+            halls=1, plays=2, performances=3, users=2
+        )
+        Reservation.objects.create(user=users[0])
+
+        self.assertEqual(
+            seed_catalog(halls=1, plays=2, performances=3, users=2),
+            (performance_ids, users),
+        )
+        self.assertEqual(Performance.objects.count(), 3)
+        self.assertFalse(Reservation.objects.exists())
+
+    def test_load_catalog_only_reads(self):
+        self.assertEqual(load_catalog(performances=3, users=2), ([], []))
+
+        seeded = seed_catalog(halls=1, plays=2, performances=3, users=2)
+        Reservation.objects.create(user=seeded[1][0])
+
+        self.assertEqual(load_catalog(performances=3, users=2), seeded)
+        self.assertTrue(Reservation.objects.exists())
+
+    def test_command_does_not_seed_unless_asked(self):
+        with self.assertRaises(CommandError):
+            call_command("bench_reservations")
+
+        with self.assertRaises(CommandError):
+            call_command(
+                "bench_reservations",
+                "--create-catalog",
+                "--url",
+                "http://localhost:8000",
+            )
+
+        self.assertFalse(Performance.objects.exists())
+
+    def test_client_transport_counts_queries(self):
+        performance_ids, users = seed_catalog(
+            halls=1, plays=1, performances=1, users=1
+        )
+        transport = ClientTransport(auth_headers(users[0]))
+        payload = {
+            "tickets": [
+                {"row": 1, "seat": 1, "performance": performance_ids[0]}
+            ]
+        }
+
+        with benchmark_environment(), throttling_disabled():
+            status_code, queries = transport.request(
+                "post", RESERVATION_URL, payload
+            )
+            conflict_code, _ = transport.request(
+                "post", RESERVATION_URL, payload
+            )
+
+        self.assertEqual(status_code, 201)
+        self.assertGreater(queries, 0)
+        self.assertEqual(conflict_code, 400)
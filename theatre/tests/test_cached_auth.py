@@ -0,0 +1,102 @@
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.cache.backends.filebased import FileBasedCache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from theatre.models import Reservation
+from theatre.tests.test_samples import ResetCachesMixin
+from user.authentication import USER_CACHE_KEY
+
+GENRE_URL = reverse("theatre:genre-list")
+RESERVATION_URL = reverse("theatre:reservation-list")
+MANAGE_USER_URL = reverse("user:manage")
+
+
+class CachedJWTAuthenticationTests(ResetCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "user@test.com", "password"
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+
+    def test_steady_state_needs_no_user_query(self):
+        self.client.get(GENRE_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(GENRE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_cached_user_filters_own_reservations(self):
+        Reservation.objects.create(user=self.user)
+        self.client.get(GENRE_URL)
+
+        res = self.client.get(RESERVATION_URL)
+
+        self.assertEqual(len(res.data["results"]), 1)
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get(GENRE_URL)
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(GENRE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivation_reaches_other_workers(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        other_worker = FileBasedCache(directory.name, {})
+        caches_setting = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            },
+            "auth": {
+                "BACKEND": "django.core.cache.backends.filebased."
+                "FileBasedCache",
+                "LOCATION": directory.name,
+            },
+        }
+
+        with override_settings(CACHES=caches_setting, USER_AUTH_CACHE="auth"):
+            self.client.get(GENRE_URL)
+            self.assertIsNotNone(
+                other_worker.get(USER_CACHE_KEY.format(user_id=self.user.id))
+            )
+
+            self.user.is_active = False
+            self.user.save()
+
+        self.assertIsNone(
+            other_worker.get(USER_CACHE_KEY.format(user_id=self.user.id))
+        )
+
+    def test_promotion_is_seen_immediately(self):
+        self.client.get(GENRE_URL)
+        self.user.is_staff = True
+        self.user.save()
+
+        res = self.client.post(GENRE_URL, {"name": "Comedy"})
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_manage_user_update_invalidates_cache(self):
+        self.client.get(GENRE_URL)
+        manage_client = APIClient()
+        manage_client.force_authenticate(self.user)
+
+        manage_client.patch(MANAGE_USER_URL, {"email": "new@test.com"})
+
+        with self.assertNumQueries(1):
+            self.client.get(GENRE_URL)
@@ -0,0 +1,124 @@
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from theatre.cache import VERSION_KEY
+from theatre.models import Reservation, Ticket
+from theatre.tests.test_samples import (
+    ResetCachesMixin,
+    sample_genre,
+    sample_performance,
+    sample_play,
+)
+
+GENRE_URL = reverse("theatre:genre-list")
+PERFORMANCE_URL = reverse("theatre:performance-list")
+RESERVATION_URL = reverse("theatre:reservation-list")
+
+
+class ConditionalGetTests(ResetCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "admin@test.com", "password", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        self.performance = sample_performance(play=sample_play())
+        self.detail_url = reverse(
+            "theatre:performance-detail", args=[self.performance.id]
+        )
+
+    def test_matching_etag_returns_304_without_queries(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+
+        with self.assertNumQueries(0):
+            res = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res["ETag"], etag)
+        self.assertFalse(res.content)
+
+    def test_if_modified_since_is_not_honoured(self):
+        last_modified = self.client.get(PERFORMANCE_URL)["Last-Modified"]
+        sample_performance(play=self.performance.play)
+
+        res = self.client.get(
+            PERFORMANCE_URL, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["results"]), 2)
+
+    def test_unknown_row_version_expires(self):
+        url = reverse("theatre:performance-detail", args=[10**6])
+        key = VERSION_KEY.format(label=f"theatre.performance:{10**6}")
+
+        with override_settings(THEATRE_ROW_VERSION_TIMEOUT=60):
+            res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertIsNotNone(cache.get(key))
+
+        with mock.patch(
+            "django.core.cache.backends.locmem.time.time",
+            return_value=time.time() + 61,
+        ):
+            self.assertIsNone(cache.get(key))
+
+    def test_reservation_changes_seat_map_etag(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+        list_etag = self.client.get(PERFORMANCE_URL)["ETag"]
+
+        self.client.post(
+            RESERVATION_URL,
+            {
+                "tickets": [
+                    {"row": 1, "seat": 1, "performance": self.performance.id}
+                ]
+            },
+            format="json",
+        )
+        res = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        list_res = self.client.get(
+            PERFORMANCE_URL, HTTP_IF_NONE_MATCH=list_etag
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["taken_places"], [{"row": 1, "seat": 1}])
+        self.assertEqual(list_res.status_code, status.HTTP_200_OK)
+
+    def test_ticket_delete_changes_seat_map_etag(self):
+        ticket = Ticket.objects.create(
+            row=1,
+            seat=1,
+            performance=self.performance,
+            reservation=Reservation.objects.create(user=self.user),
+        )
+        etag = self.client.get(self.detail_url)["ETag"]
+
+        ticket.delete()
+        res = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_catalog_change_changes_etag(self):
+        etag = self.client.get(GENRE_URL)["ETag"]
+
+        sample_genre()
+        res = self.client.get(GENRE_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+
+    def test_writes_are_not_conditional(self):
+        res = self.client.post(GENRE_URL, {"name": "Comedy"})
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn("ETag", res)
@@ -0,0 +1,115 @@
+import os
+import tempfile
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from theatre.db import STICKY_COOKIE, ReplicaRouter, primary_pinning
+from theatre.middleware import PrimaryPinningMiddleware
+from theatre.models import Play
+from theatre.views import PlayViewSet, ReservationViewSet
+
+PRIMARY, REPLICA = "default", "replica"
+
+
+@override_settings(THEATRE_DB_REPLICAS=[REPLICA])
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+
+    def test_reads_go_to_replicas_and_writes_to_primary(self):
+        self.assertEqual(self.router.db_for_read(Play), REPLICA)
+        self.assertEqual(self.router.db_for_write(Play), PRIMARY)
+
+    def test_pinned_reads_go_to_primary(self):
+        with primary_pinning(True):
+            self.assertEqual(self.router.db_for_read(Play), PRIMARY)
+
+        self.assertEqual(self.router.db_for_read(Play), REPLICA)
+
+    @override_settings(THEATRE_DB_REPLICAS=[])
+    def test_no_replicas(self):
+        self.assertEqual(self.router.db_for_read(Play), PRIMARY)
+
+    def test_replicas_are_not_migrated(self):
+        self.assertFalse(self.router.allow_migrate(REPLICA, "theatre"))
+        self.assertIsNone(self.router.allow_migrate(PRIMARY, "theatre"))
+
+    def route(self, request, view=None):
+        """Database the reads of the request are routed to."""
+        routed = []
+
+        def get_response(request):
+            if view is not None:
+                middleware.process_view(request, view, (), {})
+            routed.append(self.router.db_for_read(Play))
+            return HttpResponse()
+
+        middleware = PrimaryPinningMiddleware(get_response)
+        self.response = middleware(request)
+
+        return routed[0]
+
+    def test_client_reads_its_own_writes(self):
+        self.assertEqual(self.route(self.factory.post("/")), PRIMARY)
+        writer = RequestFactory()
+        writer.cookies = self.response.cookies
+
+        self.assertEqual(self.route(writer.get("/")), PRIMARY)
+        self.assertEqual(self.route(self.factory.get("/")), REPLICA)
+
+        with override_settings(THEATRE_DB_STICKY_SECONDS=-1):
+            self.assertEqual(self.route(writer.get("/")), REPLICA)
+
+    def test_sticky_cookie_must_be_signed(self):
+        self.factory.cookies[STICKY_COOKIE] = "1"
+
+        self.assertEqual(self.route(self.factory.get("/")), REPLICA)
+
+    def test_reservation_flows_read_from_primary(self):
+        reservations = ReservationViewSet.as_view({"get": "list"})
+        plays = PlayViewSet.as_view({"get": "list"})
+
+        self.assertEqual(
+            self.route(self.factory.get("/"), reservations), PRIMARY
+        )
+        self.assertEqual(self.route(self.factory.get("/"), plays), REPLICA)
+
+    async def test_async_requests_are_pinned(self):
+        reservations = ReservationViewSet.as_view({"get": "list"})
+        routed = []
+
+        async def get_response(request):
+            await middleware.process_view(request, reservations, (), {})
+            routed.append(self.router.db_for_read(Play))
+            return HttpResponse()
+
+        middleware = PrimaryPinningMiddleware(get_response)
+        await middleware(self.factory.get("/"))
+
+        self.assertEqual(routed, [PRIMARY])
+        self.assertEqual(self.router.db_for_read(Play), REPLICA)
+
+
+class SQLiteWalTests(SimpleTestCase):
+    def test_new_connections_use_wal(self):
+        with tempfile.TemporaryDirectory() as directory:
+            wrapper = DatabaseWrapper(
+                {
+                    **connection.settings_dict,
+                    "NAME": os.path.join(directory, "db.sqlite3"),
+                },
+                alias="wal",
+            )
+
+            try:
+                with wrapper.cursor() as cursor:
+                    cursor.execute("PRAGMA journal_mode")
+                    self.assertEqual(cursor.fetchone()[0], "wal")
+            finally:
+                wrapper.close()
@@ -0,0 +1,135 @@
+import csv
+import io
+import json
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from theatre.models import Reservation, Ticket
+from theatre.tests.test_samples import (
+    ResetCachesMixin,
+    sample_performance,
+    sample_play,
+)
+
+TICKET_EXPORT_URL = reverse("theatre:ticket-export")
+RESERVATION_EXPORT_URL = reverse("theatre:reservation-export")
+
+
+def read_stream(response):
+    return b"".join(response.streaming_content).decode()
+
+
+class ExportTests(ResetCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "admin@test.com", "password", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+
+        play = sample_play()
+        self.june = sample_performance(
+            play=play, show_time="2022-06-02 14:00:00"
+        )
+        self.july = sample_performance(
+            play=play, show_time="2022-07-02 14:00:00"
+        )
+        for performance, seats in ((self.june, 2), (self.july, 1)):
+            reservation = Reservation.objects.create(user=self.user)
+            for seat in range(1, seats + 1):
+                Ticket.objects.create(
+                    row=1,
+                    seat=seat,
+                    performance=performance,
+                    reservation=reservation,
+                )
+
+    def test_export_requires_staff(self):
+        self.user.is_staff = False
+        self.user.save()
+
+        res = self.client.get(TICKET_EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_ticket_csv_of_a_performance(self):
+        res = self.client.get(
+            TICKET_EXPORT_URL, {"performance": self.june.id}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        self.assertEqual(res["Content-Type"], "text/csv")
+        self.assertIn(
+            f"tickets-performance-{self.june.id}.csv",
+            res["Content-Disposition"],
+        )
+        rows = list(csv.DictReader(io.StringIO(read_stream(res))))
+        self.assertEqual([row["seat"] for row in rows], ["1", "2"])
+        self.assertEqual(rows[0]["play"], "Sample play")
+        self.assertEqual(rows[0]["user"], "admin@test.com")
+
+    def test_reservation_ndjson_of_a_date_range(self):
+        res = self.client.get(
+            RESERVATION_EXPORT_URL,
+            {"output": "ndjson", "date_from": "2022-07-01"},
+        )
+
+        self.assertEqual(res["Content-Type"], "application/x-ndjson")
+        lines = read_stream(res).splitlines()
+        self.assertEqual(len(lines), 1)
+        reservation = json.loads(lines[0])
+        self.assertEqual(reservation["tickets"], 1)
+        self.assertEqual(reservation["user"], "admin@test.com")
+
+    def test_invalid_parameters(self):
+        for params in (
+            {"output": "xml"},
+            {"performance": "first"},
+            {"date_to": "July"},
+        ):
+            res = self.client.get(TICKET_EXPORT_URL, params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_malformed_performance_ids(self):
+        for url in (TICKET_EXPORT_URL, RESERVATION_EXPORT_URL):
+            for performance in ("\u00b2", str(2**70), "1,2"):
+                res = self.client.get(url, {"performance": performance})
+                self.assertEqual(
+                    res.status_code, status.HTTP_400_BAD_REQUEST
+                )
+
+    def test_rows_are_fetched_without_serializers(self):
+        res = self.client.get(TICKET_EXPORT_URL)
+
+        with self.assertNumQueries(1):
+            read_stream(res)
+
+    def test_export_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tickets.ndjson")
+            call_command(
+                "export_box_office",
+                "tickets",
+                "--format=ndjson",
+                "--date-to=2022-06-30",
+                f"--output={path}",
+                stderr=io.StringIO(),
+            )
+
+            with open(path) as export_file:
+                tickets = [json.loads(line) for line in export_file]
+
+        self.assertEqual(len(tickets), 2)
+        self.assertEqual(
+            {ticket["performance"] for ticket in tickets}, {self.june.id}
+        )
@@ -0,0 +1,126 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from theatre.models import Reservation, SeatHold
+from theatre.tests.test_samples import (
+    ResetCachesMixin,
+    sample_play,
+    sample_performance,
+)
+
+HOLD_URL = reverse("theatre:seathold-list")
+RESERVATION_URL = reverse("theatre:reservation-list")
+
+
+def confirm_url(token):
+    return reverse("theatre:seathold-confirm", args=[token])
+
+
+def hold_detail_url(token):
+    return reverse("theatre:seathold-detail", args=[token])
+
+
+class SeatHoldTests(ResetCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "password", is_staff=True
+        )
+        self.other_user = get_user_model().objects.create_user(
+            "other@test.com", "password", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        self.performance = sample_performance(play=sample_play())
+
+    def tickets(self, seats):
+        return {
+            "tickets": [
+                {"row": row, "seat": seat, "performance": self.performance.id}
+                for row, seat in seats
+            ]
+        }
+
+    def hold(self, seats):
+        return self.client.post(HOLD_URL, self.tickets(seats), format="json")
+
+    def test_hold_and_confirm(self):
+        res = self.hold([(1, 1), (1, 2)])
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(SeatHold.objects.count(), 2)
+
+        res = self.client.post(confirm_url(res.data["token"]))
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        reservation = Reservation.objects.get(id=res.data["id"])
+        self.assertEqual(reservation.tickets.count(), 2)
+        self.assertFalse(SeatHold.objects.exists())
+
+    def test_held_seats_are_not_available_to_others(self):
+        self.hold([(1, 1)])
+        self.client.force_authenticate(self.other_user)
+
+        hold_res = self.hold([(1, 1)])
+        reservation_res = self.client.post(
+            RESERVATION_URL, self.tickets([(1, 1)]), format="json"
+        )
+
+        self.assertEqual(hold_res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            reservation_res.status_code, status.HTTP_400_BAD_REQUEST
+        )
+
+    def test_out_of_range_performance_is_reported(self):
+        self.performance.id = 2**70
+
+        res = self.hold([(1, 1)])
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(SeatHold.objects.exists())
+
+    def test_out_of_range_seat_is_reported(self):
+        res = self.hold([(2**70, 1), (1, 2**70)])
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("row", res.data["tickets"][0])
+        self.assertIn("seat", res.data["tickets"][1])
+        self.assertFalse(SeatHold.objects.exists())
+
+    def test_expired_hold_cannot_be_confirmed_and_is_replaced(self):
+        token = self.hold([(1, 1)]).data["token"]
+        SeatHold.objects.update(expires_at=timezone.now() - timedelta(1))
+
+        confirm_res = self.client.post(confirm_url(token))
+        self.client.force_authenticate(self.other_user)
+        hold_res = self.hold([(1, 1)])
+
+        self.assertEqual(confirm_res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(hold_res.status_code, status.HTTP_201_CREATED)
+
+    def test_release_hold(self):
+        token = self.hold([(1, 1)]).data["token"]
+
+        res = self.client.delete(hold_detail_url(token))
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(SeatHold.objects.exists())
+
+    def test_sweep_expired_holds(self):
+        self.hold([(1, 1), (1, 2), (1, 3)])
+        self.hold([(2, 1)])
+        SeatHold.objects.exclude(row=2).update(
+            expires_at=timezone.now() - timedelta(1)
+        )
+
+        call_command("sweep_seat_holds", "--batch-size", "2", stdout=None)
+
+        self.assertEqual(list(SeatHold.objects.values_list("row")), [(2,)])
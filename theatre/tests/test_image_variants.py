@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+
+from PIL import Image
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from theatre.images import IMAGE_VARIANTS
+from theatre.tests.test_samples import (
+    ResetCachesMixin,
+    sample_play,
+    image_upload_url,
+    detail_url,
+)
+
+PLAY_URL = reverse("theatre:play-list")
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, THEATRE_IMAGE_WORKERS=0)
+class PlayImageVariantsTests(ResetCachesMixin, TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_superuser(
+            "admin@myproject.com", "password"
+        )
+        self.client.force_authenticate(self.user)
+        self.play = sample_play()
+
+    def upload_image(self, size=(2000, 1000)):
+        with tempfile.NamedTemporaryFile(suffix=".jpg") as ntf:
+            Image.new("RGB", size).save(ntf, format="JPEG")
+            ntf.seek(0)
+            with self.captureOnCommitCallbacks(execute=True):
+                return self.client.post(
+                    image_upload_url(self.play.id),
+                    {"image": ntf},
+                    format="multipart",
+                )
+
+    def test_upload_generates_resized_variants(self):
+        res = self.upload_image()
+        self.play.refresh_from_db()
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(self.play.image_variants), set(IMAGE_VARIANTS))
+        for variant, size in IMAGE_VARIANTS.items():
+            path = os.path.join(MEDIA_ROOT, self.play.image_variants[variant])
+            with Image.open(path) as image:
+                self.assertEqual(image.format, "WEBP")
+                self.assertEqual(max(image.size), size)
+
+    def test_variant_urls_in_list_and_detail(self):
+        self.upload_image()
+
+        list_res = self.client.get(PLAY_URL)
+        detail_res = self.client.get(detail_url(self.play.id))
+
+        list_variants = list_res.data["results"][0]["image_variants"]
+        self.assertEqual(set(list_variants), set(IMAGE_VARIANTS))
+        self.assertTrue(list_variants["card"].endswith("-card.webp"))
+        self.assertEqual(detail_res.data["image_variants"], list_variants)
+
+    def test_play_without_image_has_no_variants(self):
+        res = self.client.get(detail_url(self.play.id))
+
+        self.assertEqual(res.data["image_variants"], {})
@@ -0,0 +1,153 @@
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from theatre.models import Performance, Reservation, Ticket
+from theatre.occupancy import (
+    SeatOccupancy,
+    get_occupancies,
+    get_occupancy,
+    get_occupancy_cache,
+)
+from theatre.tests.test_samples import (
+    recording_read_pinning,
+    sample_play,
+    sample_performance,
+)
+
+
+def performance_detail_url(performance_id):
+    return reverse("theatre:performance-detail", args=[performance_id])
+
+
+class SeatOccupancyTests(TestCase):
+    def test_take_and_release_seats(self):
+        occupancy = SeatOccupancy(3, 5)
+
+        occupancy.take(1, 1)
+        occupancy.take(3, 5)
+        occupancy.take(2, 4)
+        occupancy.release(2, 4)
+
+        self.assertTrue(occupancy.is_taken(1, 1))
+        self.assertTrue(occupancy.is_taken(3, 5))
+        self.assertFalse(occupancy.is_taken(2, 4))
+        self.assertEqual(occupancy.taken_count, 2)
+        self.assertEqual(
+            occupancy.taken_places(),
+            [{"row": 1, "seat": 1}, {"row": 3, "seat": 5}],
+        )
+
+    def test_seat_outside_of_hall(self):
+        occupancy = SeatOccupancy(3, 5)
+
+        with self.assertRaises(ValueError):
+            occupancy.take(4, 1)
+
+    def test_cache_round_trip(self):
+        occupancy = SeatOccupancy.from_seats(3, 5, [(2, 2), (3, 1)])
+
+        restored = SeatOccupancy.from_cache(occupancy.to_cache())
+
+        self.assertEqual(restored.taken_places(), occupancy.taken_places())
+
+
+class PerformanceOccupancyTests(TestCase):
+    def setUp(self):
+        get_occupancy_cache().clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "password"
+        )
+        self.client.force_authenticate(self.user)
+        self.performance = sample_performance(play=sample_play())
+        self.reservation = Reservation.objects.create(user=self.user)
+
+    def reload_performance(self):
+        self.performance = Performance.objects.select_related(
+            "theatre_hall"
+        ).get(id=self.performance.id)
+
+    def create_ticket(self, row, seat):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Ticket.objects.create(
+                row=row,
+                seat=seat,
+                performance=self.performance,
+                reservation=self.reservation,
+            )
+
+    def test_detail_returns_taken_places(self):
+        self.create_ticket(1, 2)
+        self.create_ticket(5, 7)
+
+        res = self.client.get(performance_detail_url(self.performance.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data["taken_places"],
+            [{"row": 1, "seat": 2}, {"row": 5, "seat": 7}],
+        )
+
+    def test_detail_reads_seats_from_cache(self):
+        self.create_ticket(1, 2)
+        self.reload_performance()
+        get_occupancy(self.performance)
+
+        with self.assertNumQueries(0):
+            occupancy = get_occupancy(self.performance)
+
+        self.assertTrue(occupancy.is_taken(1, 2))
+
+    def test_ticket_changes_move_the_cache_key(self):
+        ticket = self.create_ticket(1, 1)
+        moved = self.create_ticket(2, 2)
+        self.reload_performance()
+        get_occupancy(self.performance)
+
+        ticket.delete()
+        self.create_ticket(5, 5)
+        moved.seat = 3
+        moved.save()
+        self.reload_performance()
+        occupancy = get_occupancy(self.performance)
+
+        self.assertEqual(
+            occupancy.taken_places(),
+            [{"row": 2, "seat": 3}, {"row": 5, "seat": 5}],
+        )
+
+    def test_cached_seat_maps_expire(self):
+        with override_settings(THEATRE_OCCUPANCY_CACHE_TIMEOUT=60):
+            get_occupancy(self.performance)
+
+        with mock.patch(
+            "django.core.cache.backends.locmem.time.time",
+            return_value=time.time() + 61,
+        ):
+            with self.assertNumQueries(1):
+                get_occupancy(self.performance)
+
+    def test_rebuild_on_cache_miss(self):
+        self.create_ticket(4, 4)
+        get_occupancy_cache().clear()
+
+        self.assertTrue(get_occupancy(self.performance).is_taken(4, 4))
+
+    def test_rebuild_reads_from_primary(self):
+        self.create_ticket(4, 4)
+        self.reload_performance()
+        get_occupancy_cache().clear()
+
+        with recording_read_pinning() as pinned:
+            get_occupancy(self.performance)
+            get_occupancy_cache().clear()
+            get_occupancies([self.performance])
+
+        self.assertEqual(pinned, [True, True])
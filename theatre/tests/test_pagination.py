@@ -0,0 +1,135 @@
+import base64
+import json
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from theatre.models import Performance, Reservation
+from theatre.tests.test_samples import (
+    ResetCachesMixin,
+    sample_play,
+    sample_performance,
+)
+
+PERFORMANCE_URL = reverse("theatre:performance-list")
+PLAY_URL = reverse("theatre:play-list")
+RESERVATION_URL = reverse("theatre:reservation-list")
+TICKET_URL = reverse("theatre:ticket-list")
+
+
+class KeysetPaginationTests(ResetCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "password"
+        )
+        self.client.force_authenticate(self.user)
+        play = sample_play()
+        performance = sample_performance(play=play)
+        show_time = timezone.make_aware(datetime(2024, 1, 1, 19))
+        Performance.objects.bulk_create(
+            [
+                Performance(
+                    play=play,
+                    theatre_hall=performance.theatre_hall,
+                    show_time=show_time + timedelta(days=index // 2),
+                )
+                for index in range(11)
+            ]
+        )
+        self.expected_ids = list(
+            Performance.objects.order_by("show_time", "id").values_list(
+                "id", flat=True
+            )
+        )
+
+    def collect_pages(self, url):
+        ids = []
+        pages = 0
+
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            ids.extend(item["id"] for item in res.data["results"])
+            url = res.data["next"]
+            pages += 1
+
+        return ids, pages
+
+    def test_pages_cover_every_row_once_in_order(self):
+        ids, pages = self.collect_pages(f"{PERFORMANCE_URL}?page_size=3")
+
+        self.assertEqual(ids, self.expected_ids)
+        self.assertEqual(pages, 4)
+
+    def test_previous_link_returns_previous_page(self):
+        first = self.client.get(PERFORMANCE_URL, {"page_size": 5})
+        second = self.client.get(first.data["next"])
+        previous = self.client.get(second.data["previous"])
+
+        self.assertIsNone(first.data["previous"])
+        self.assertEqual(previous.data["results"], first.data["results"])
+
+    def test_deep_page_runs_single_query(self):
+        res = self.client.get(PERFORMANCE_URL, {"page_size": 10})
+
+        with self.assertNumQueries(1):
+            res = self.client.get(res.data["next"])
+
+        self.assertEqual(
+            [item["id"] for item in res.data["results"]],
+            self.expected_ids[10:],
+        )
+        self.assertIsNone(res.data["next"])
+
+    def test_invalid_cursor(self):
+        res = self.client.get(PERFORMANCE_URL, {"cursor": "invalid"})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_with_invalid_values(self):
+        for values in (["yesterday", 1], ["2024-05-01T19:00:00", "x"], 5):
+            cursor = base64.urlsafe_b64encode(
+                json.dumps([values, False]).encode()
+            ).decode()
+
+            res = self.client.get(PERFORMANCE_URL, {"cursor": cursor})
+
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_with_null_or_out_of_range_values(self):
+        edges = {
+            PERFORMANCE_URL: "2024-01-01T19:00:00+00:00",
+            PLAY_URL: "Hamlet",
+            TICKET_URL: 1,
+            RESERVATION_URL: "2024-01-01T19:00:00+00:00",
+        }
+
+        for url, edge in edges.items():
+            for values in ([None, None], [edge, None], [edge, 2**70]):
+                cursor = base64.urlsafe_b64encode(
+                    json.dumps([values, False]).encode()
+                ).decode()
+
+                res = self.client.get(url, {"cursor": cursor})
+
+                self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_reservations_are_paginated_newest_first(self):
+        reservations = [
+            Reservation.objects.create(user=self.user) for _ in range(3)
+        ]
+        Reservation.objects.update(created_at=timezone.now())
+
+        ids, _ = self.collect_pages(f"{RESERVATION_URL}?page_size=2")
+
+        self.assertEqual(
+            ids, [reservation.id for reservation in reversed(reservations)]
+        )
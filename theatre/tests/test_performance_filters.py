@@ -0,0 +1,124 @@
+from datetime import datetime
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from theatre.models import Performance, TheatreHall
+from theatre.tests.test_samples import ResetCachesMixin, sample_play
+from theatre.views import filter_performances
+
+PERFORMANCE_URL = reverse("theatre:performance-list")
+
+
+def aware(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+class PerformanceFilterTests(ResetCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "user@test.com", "password"
+        )
+        self.client.force_authenticate(self.user)
+        self.hamlet = sample_play(title="Hamlet")
+        self.macbeth = sample_play(title="Macbeth")
+        self.blue = TheatreHall.objects.create(
+            name="Blue", rows=1, seats_in_row=2
+        )
+        self.red = TheatreHall.objects.create(
+            name="Red", rows=10, seats_in_row=10
+        )
+        self.monday = Performance.objects.create(
+            play=self.hamlet,
+            theatre_hall=self.blue,
+            show_time=aware(2024, 5, 6, 19),
+        )
+        self.sunday = Performance.objects.create(
+            play=self.macbeth,
+            theatre_hall=self.red,
+            show_time=aware(2024, 5, 12, 23, 30),
+        )
+        self.next_week = Performance.objects.create(
+            play=self.hamlet,
+            theatre_hall=self.red,
+            show_time=aware(2024, 5, 13, 10),
+        )
+
+    def get_ids(self, **params):
+        res = self.client.get(PERFORMANCE_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [performance["id"] for performance in res.data["results"]]
+
+    def test_filter_by_date_range(self):
+        self.assertEqual(
+            self.get_ids(date_from="2024-05-06", date_to="2024-05-12"),
+            [self.monday.id, self.sunday.id],
+        )
+        self.assertEqual(
+            self.get_ids(date_from="2024-05-07"),
+            [self.sunday.id, self.next_week.id],
+        )
+
+    def test_invalid_date(self):
+        res = self.client.get(PERFORMANCE_URL, {"date_from": "2024-13-01"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("date_from", res.data)
+
+    def test_invalid_ids(self):
+        for params in (
+            {"play": "abc"},
+            {"play": "1,"},
+            {"play": "0"},
+            {"theatre_hall": "x"},
+            {"theatre_hall": "9" * 20},
+        ):
+            res = self.client.get(PERFORMANCE_URL, params)
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn(next(iter(params)), res.data)
+
+    def test_filter_by_play_and_hall(self):
+        self.assertEqual(
+            self.get_ids(play=self.hamlet.id),
+            [self.monday.id, self.next_week.id],
+        )
+        self.assertEqual(
+            self.get_ids(play=self.hamlet.id, theatre_hall=self.red.id),
+            [self.next_week.id],
+        )
+        self.assertEqual(
+            self.get_ids(theatre_hall=f"{self.blue.id},{self.red.id}"),
+            [self.monday.id, self.sunday.id, self.next_week.id],
+        )
+
+    def test_filter_available(self):
+        Performance.objects.filter(pk=self.monday.pk).update(tickets_sold=2)
+
+        self.assertEqual(
+            self.get_ids(available="true"),
+            [self.sunday.id, self.next_week.id],
+        )
+
+    @skipUnless(connection.vendor == "sqlite", "SQLite query plan")
+    def test_week_query_uses_index(self):
+        queryset = filter_performances(
+            Performance.objects.all(),
+            {"date_from": "2024-05-06", "date_to": "2024-05-12"},
+        )
+        sql, params = queryset.query.sql_with_params()
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = " ".join(str(row) for row in cursor.fetchall())
+
+        self.assertIn("USING INDEX theatre_per_show_ti", plan)
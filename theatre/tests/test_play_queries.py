@@ -0,0 +1,77 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from theatre.tests.test_samples import (
+    ResetCachesMixin,
+    sample_actor,
+    sample_genre,
+    sample_performance,
+    sample_play,
+    detail_url,
+)
+
+PLAY_URL = reverse("theatre:play-list")
+
+
+class PlayQueryCountTests(ResetCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "password"
+        )
+        self.client.force_authenticate(self.user)
+        self.genres = [sample_genre(name=f"Genre {i}") for i in range(3)]
+        self.actors = [sample_actor(last_name=f"Actor {i}") for i in range(3)]
+
+    def create_plays(self, count):
+        plays = []
+        for index in range(count):
+            play = sample_play(title=f"Play {count}-{index}")
+            play.genres.set(self.genres)
+            play.actors.set(self.actors)
+            plays.append(play)
+        return plays
+
+    def test_list_query_count_does_not_depend_on_size(self):
+        for count in (1, 10, 20):
+            self.create_plays(count)
+
+            with self.assertNumQueries(3):
+                res = self.client.get(PLAY_URL, {"page_size": 100})
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_filtered_list_returns_each_play_once(self):
+        play = self.create_plays(1)[0]
+
+        with self.assertNumQueries(3):
+            res = self.client.get(
+                PLAY_URL,
+                {
+                    "genres": ",".join(str(genre.id) for genre in self.genres),
+                    "actors": ",".join(str(actor.id) for actor in self.actors),
+                },
+            )
+
+        self.assertEqual(
+            [item["id"] for item in res.data["results"]], [play.id]
+        )
+
+    def test_detail_query_count(self):
+        play = self.create_plays(1)[0]
+
+        with self.assertNumQueries(3):
+            self.client.get(detail_url(play.id))
+
+    def test_performance_detail_query_count(self):
+        performance = sample_performance(play=self.create_plays(1)[0])
+        url = reverse("theatre:performance-detail", args=[performance.id])
+
+        self.client.get(url)
+        with self.assertNumQueries(3):
+            self.client.get(url)
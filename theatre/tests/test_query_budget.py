@@ -0,0 +1,158 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from theatre.middleware import QueryRecorder
+from theatre.models import Genre, Reservation, Ticket
+from theatre.tests.test_samples import (
+    QueryBudgetMixin,
+    ResetCachesMixin,
+    sample_actor,
+    sample_genre,
+    sample_performance,
+    sample_play,
+)
+
+ASYNC_PLAY_URL = reverse("theatre:async-play-list")
+GENRE_URL = reverse("theatre:genre-list")
+PLAY_URL = reverse("theatre:play-list")
+PERFORMANCE_URL = reverse("theatre:performance-list")
+RESERVATION_URL = reverse("theatre:reservation-list")
+TICKET_URL = reverse("theatre:ticket-list")
+
+
+class QueryBudgetMiddlewareTests(ResetCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+
+    def test_staff_gets_query_headers(self):
+        user = get_user_model().objects.create_user(
+            "admin@test.com", "password", is_staff=True
+        )
+        self.client.force_authenticate(user)
+
+        res = self.client.get(GENRE_URL)
+
+        self.assertEqual(res["X-DB-Queries"], "1")
+        self.assertIn("X-DB-Time-Ms", res)
+        self.assertEqual(res["X-DB-Duplicates"], "0")
+
+    def test_regular_user_gets_no_query_headers(self):
+        user = get_user_model().objects.create_user(
+            "user@test.com", "password"
+        )
+        self.client.force_authenticate(user)
+
+        res = self.client.get(GENRE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn("X-DB-Queries", res)
+
+    @override_settings(THEATRE_QUERY_BUDGETS={"theatre:genre-list": 0})
+    def test_request_over_budget_is_logged(self):
+        user = get_user_model().objects.create_user(
+            "user@test.com", "password"
+        )
+        self.client.force_authenticate(user)
+
+        with self.assertLogs("theatre.middleware", "WARNING") as logs:
+            self.client.get(GENRE_URL)
+
+        self.assertIn("ran 1 queries (budget 0)", logs.output[0])
+
+    @override_settings(THEATRE_QUERY_BUDGETS={"theatre:genre-list": 0})
+    def test_unsafe_requests_are_not_budgeted(self):
+        user = get_user_model().objects.create_user(
+            "admin@test.com", "password", is_staff=True
+        )
+        self.client.force_authenticate(user)
+
+        with self.assertNoLogs("theatre.middleware", "WARNING"):
+            res = self.client.post(GENRE_URL, {"name": "Drama"})
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertNotEqual(res["X-DB-Queries"], "0")
+
+    def test_recorder_reports_repeated_statements(self):
+        recorder = QueryRecorder()
+        sql = str(Genre.objects.filter(pk=1).query)
+
+        for _ in range(3):
+            recorder(lambda *args: None, sql, (), False, {})
+        recorder(lambda *args: None, "SELECT 1", (), False, {})
+
+        self.assertEqual(recorder.count, 4)
+        self.assertEqual(recorder.duplicates, {sql: 3})
+
+
+@override_settings(DEBUG=True)
+class AsyncQueryBudgetTests(ResetCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        user = get_user_model().objects.create_user(
+            "admin@test.com", "password", is_staff=True
+        )
+        self.auth = {"authorization": f"Bearer {AccessToken.for_user(user)}"}
+        sample_play()
+
+    async def test_async_view_is_not_adapted_to_sync(self):
+        with self.assertNoLogs("django.request", "DEBUG"):
+            res = await self.async_client.get(ASYNC_PLAY_URL, **self.auth)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertGreater(int(res["X-DB-Queries"]), 0)
+
+
+class EndpointQueryBudgetTests(ResetCachesMixin, QueryBudgetMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "admin@test.com", "password", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+
+    def add_performance(self, index):
+        play = sample_play(title=f"Play {index}")
+        play.genres.add(sample_genre(name=f"Genre {index}"))
+        play.actors.add(sample_actor(last_name=f"Actor {index}"))
+        return sample_performance(play=play)
+
+    def add_ticket(self, index):
+        Ticket.objects.create(
+            row=1,
+            seat=1,
+            performance=self.add_performance(index),
+            reservation=Reservation.objects.create(user=self.user),
+        )
+
+    def test_play_list(self):
+        self.assert_query_budget(PLAY_URL, self.add_performance)
+
+    def test_performance_list(self):
+        self.assert_query_budget(PERFORMANCE_URL, self.add_ticket)
+
+    def test_performance_detail(self):
+        performance = self.add_performance(0)
+        reservation = Reservation.objects.create(user=self.user)
+
+        self.assert_query_budget(
+            reverse("theatre:performance-detail", args=[performance.id]),
+            lambda index: Ticket.objects.create(
+                row=1,
+                seat=index + 1,
+                performance=performance,
+                reservation=reservation,
+            ),
+        )
+
+    def test_reservation_list(self):
+        self.assert_query_budget(RESERVATION_URL, self.add_ticket)
+
+    def test_ticket_list(self):
+        self.assert_query_budget(TICKET_URL, self.add_ticket)
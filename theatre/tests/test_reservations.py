@@ -0,0 +1,182 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework.utils.encoders import JSONEncoder
+
+from theatre.models import Reservation, Ticket
+from theatre.serializers import ReservationListSerializer
+from theatre.tests.test_samples import (
+    ResetCachesMixin,
+    sample_play,
+    sample_performance,
+)
+
+RESERVATION_URL = reverse("theatre:reservation-list")
+
+
+class ReservationCreateTests(ResetCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "password", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        self.performance = sample_performance(play=sample_play())
+
+    def reserve(self, seats):
+        payload = {
+            "tickets": [
+                {"row": row, "seat": seat, "performance": self.performance.id}
+                for row, seat in seats
+            ]
+        }
+        return self.client.post(RESERVATION_URL, payload, format="json")
+
+    def test_create_reservation_with_tickets(self):
+        res = self.reserve([(1, 1), (1, 2)])
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        reservation = Reservation.objects.get(id=res.data["id"])
+        self.assertEqual(reservation.user, self.user)
+        self.assertEqual(reservation.tickets.count(), 2)
+
+    def test_query_count_does_not_grow_with_seats(self):
+        with self.assertNumQueries(10):
+            self.reserve([(1, 1), (1, 2)])
+
+        with self.assertNumQueries(10):
+            self.reserve([(2, seat) for seat in range(1, 21)])
+
+    def test_all_conflicting_seats_are_reported(self):
+        self.reserve([(1, 1), (1, 2)])
+
+        res = self.reserve([(1, 1), (1, 2), (1, 3), (21, 1), (1, 3)])
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        conflicts = {
+            (int(error["row"]), int(error["seat"]))
+            for error in res.data["tickets"]
+        }
+        self.assertEqual(conflicts, {(1, 1), (1, 2), (21, 1), (1, 3)})
+        self.assertEqual(Ticket.objects.count(), 2)
+
+    def test_invalid_performance_is_reported(self):
+        res = self.client.post(
+            RESERVATION_URL,
+            {"tickets": [{"row": 1, "seat": 1, "performance": 0}]},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Reservation.objects.exists())
+
+    def test_out_of_range_performance_is_reported(self):
+        res = self.client.post(
+            RESERVATION_URL,
+            {"tickets": [{"row": 1, "seat": 1, "performance": 2**70}]},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("performance", res.data["tickets"][0])
+
+    def test_out_of_range_seat_is_reported(self):
+        res = self.client.post(
+            RESERVATION_URL,
+            {
+                "tickets": [
+                    {"row": 2**70, "seat": 2**70, "performance": 1}
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("row", res.data["tickets"][0])
+        self.assertIn("seat", res.data["tickets"][0])
+        self.assertFalse(Reservation.objects.exists())
+
+    def test_update_keeps_tickets(self):
+        reservation_id = self.reserve([(1, 1)]).data["id"]
+        url = reverse("theatre:reservation-detail", args=[reservation_id])
+
+        res = self.client.put(
+            url,
+            {"tickets": [{"row": 5, "seat": 5, "performance": 0}]},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            list(Ticket.objects.values_list("row", "seat")), [(1, 1)]
+        )
+
+
+class ReservationListTests(ResetCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "password"
+        )
+        self.client.force_authenticate(self.user)
+        performances = [
+            sample_performance(play=sample_play(title=f"Play {index}"))
+            for index in range(3)
+        ]
+        for index in range(25):
+            reservation = Reservation.objects.create(user=self.user)
+            for seat in range(1, 3):
+                Ticket.objects.create(
+                    row=index // 3 + 1,
+                    seat=seat,
+                    performance=performances[index % 3],
+                    reservation=reservation,
+                )
+        Reservation.objects.create(user=self.user)
+
+    def test_list_matches_nested_serializer(self):
+        res = self.client.get(RESERVATION_URL)
+        reservations = Reservation.objects.filter(
+            id__in=[item["id"] for item in res.data["results"]]
+        ).order_by("-created_at", "-id")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["results"]), 20)
+        self.assertEqual(res.data["results"][0]["tickets"], [])
+        self.assertEqual(
+            json.loads(json.dumps(res.data["results"], cls=JSONEncoder)),
+            json.loads(
+                json.dumps(
+                    ReservationListSerializer(reservations, many=True).data,
+                    cls=JSONEncoder,
+                )
+            ),
+        )
+
+    def test_list_is_a_single_query(self):
+        with self.assertNumQueries(1):
+            res = self.client.get(RESERVATION_URL)
+
+        with self.assertNumQueries(1):
+            next_page = self.client.get(res.data["next"])
+
+        self.assertEqual(len(next_page.data["results"]), 6)
+        self.assertIsNone(next_page.data["next"])
+
+    def test_list_only_shows_own_reservations(self):
+        other = get_user_model().objects.create_user(
+            "other@test.com", "password"
+        )
+        Reservation.objects.create(user=other)
+        self.client.force_authenticate(other)
+
+        res = self.client.get(RESERVATION_URL)
+
+        self.assertEqual(len(res.data["results"]), 1)
@@ -0,0 +1,164 @@
+import tempfile
+import time
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from theatre.cache import VERSION_KEY, bump_version, get_cache_stats
+from theatre.checks import check_shared_caches
+from theatre.models import Genre
+from theatre.tests.test_samples import (
+    ResetCachesMixin,
+    recording_read_pinning,
+    sample_actor,
+    sample_genre,
+    sample_play,
+)
+
+GENRE_URL = reverse("theatre:genre-list")
+PLAY_URL = reverse("theatre:play-list")
+
+
+class CatalogResponseCacheTests(ResetCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "admin@test.com", "password", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_repeated_list_is_served_from_cache(self):
+        sample_genre()
+        self.client.get(GENRE_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(GENRE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["X-Cache"], "HIT")
+        self.assertEqual(res.data[0]["name"], "Drama")
+        self.assertEqual(get_cache_stats(), {"hit": 1, "miss": 1})
+
+    def test_miss_reads_from_primary(self):
+        sample_genre()
+
+        with recording_read_pinning() as pinned:
+            self.client.get(GENRE_URL)
+
+        self.assertEqual(pinned, [True])
+
+    def test_create_invalidates_list(self):
+        self.client.get(GENRE_URL)
+
+        self.client.post(GENRE_URL, {"name": "Comedy"})
+        res = self.client.get(GENRE_URL)
+
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual([genre["name"] for genre in res.data], ["Comedy"])
+
+    def test_related_changes_invalidate_play_list(self):
+        play = sample_play()
+        genre = sample_genre()
+        self.client.get(PLAY_URL)
+
+        play.genres.add(genre)
+        res = self.client.get(PLAY_URL)
+        self.assertEqual(res.data["results"][0]["genres"], ["Drama"])
+
+        genre.name = "Comedy"
+        genre.save()
+        res = self.client.get(PLAY_URL)
+        self.assertEqual(res.data["results"][0]["genres"], ["Comedy"])
+
+        play.actors.add(sample_actor())
+        res = self.client.get(PLAY_URL)
+        self.assertEqual(
+            res.data["results"][0]["actors"], ["George Clooney"]
+        )
+
+    def test_query_params_are_cached_separately(self):
+        sample_play(title="Hamlet")
+        sample_play(title="Macbeth")
+
+        self.client.get(PLAY_URL, {"title": "hamlet"})
+        res = self.client.get(PLAY_URL, {"title": "macbeth"})
+
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(res.data["results"][0]["title"], "Macbeth")
+
+    def test_stats_command(self):
+        self.client.get(GENRE_URL)
+        self.client.get(GENRE_URL)
+        out = StringIO()
+
+        call_command("response_cache_stats", "--reset", stdout=out)
+
+        self.assertIn("hits: 1, misses: 1, hit rate: 50.0%", out.getvalue())
+        self.assertEqual(get_cache_stats(), {"hit": 0, "miss": 0})
+
+
+class SharedVersionCacheTests(ResetCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "admin@test.com", "password", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.caches = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            },
+            "versions": {
+                "BACKEND": "django.core.cache.backends.filebased."
+                "FileBasedCache",
+                "LOCATION": self.directory.name,
+            },
+        }
+
+    def test_versions_are_shared_between_workers(self):
+        other_worker = FileBasedCache(self.directory.name, {})
+        key = VERSION_KEY.format(label="theatre.genre")
+
+        with override_settings(
+            CACHES=self.caches, THEATRE_VERSION_CACHE="versions"
+        ):
+            bump_version(Genre)
+            self.assertIsNotNone(other_worker.get(key))
+
+            self.client.get(GENRE_URL)
+            other_worker.set(key, time.time_ns(), timeout=None)
+            res = self.client.get(GENRE_URL)
+
+        self.assertEqual(res["X-Cache"], "MISS")
+
+    def test_deploy_check_warns_about_process_local_caches(self):
+        with override_settings(
+            THEATRE_VERSION_CACHE="default", USER_AUTH_CACHE="default"
+        ):
+            self.assertEqual(
+                [error.msg for error in check_shared_caches(None)],
+                [
+                    "THEATRE_VERSION_CACHE uses the process-local cache "
+                    "'default'.",
+                    "USER_AUTH_CACHE uses the process-local cache "
+                    "'default'.",
+                ],
+            )
+
+        with override_settings(
+            CACHES=self.caches,
+            THEATRE_VERSION_CACHE="versions",
+            USER_AUTH_CACHE="versions",
+        ):
+            self.assertEqual(check_shared_caches(None), [])
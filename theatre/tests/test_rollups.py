@@ -0,0 +1,165 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from theatre.models import PerformanceRollup, Play, Reservation, Ticket
+from theatre.tests.test_samples import (
+    ResetCachesMixin,
+    sample_performance,
+    sample_play,
+)
+
+OCCUPANCY_URL = reverse("theatre:occupancy-analytics-list")
+RESERVATION_URL = reverse("theatre:reservation-list")
+
+
+class RollupTests(ResetCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "admin@test.com", "password", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        self.hamlet = sample_play(title="Hamlet")
+        self.macbeth = sample_play(title="Macbeth")
+        self.first = sample_performance(
+            play=self.hamlet, show_time="2024-05-01 19:00:00+03:00"
+        )
+        self.second = sample_performance(
+            play=self.hamlet, show_time="2024-05-02 19:00:00+03:00"
+        )
+        self.third = sample_performance(
+            play=self.macbeth, show_time="2024-05-02 12:00:00+03:00"
+        )
+
+    def reserve(self, performance, seats):
+        return self.client.post(
+            RESERVATION_URL,
+            {
+                "tickets": [
+                    {"row": 1, "seat": seat, "performance": performance.id}
+                    for seat in seats
+                ]
+            },
+            format="json",
+        )
+
+    def test_rollups_follow_the_write_path(self):
+        self.reserve(self.first, [1, 2, 3])
+        rollup = PerformanceRollup.objects.get(performance=self.first)
+
+        self.assertEqual(str(rollup.day), "2024-05-01")
+        self.assertEqual(rollup.play, self.hamlet)
+        self.assertEqual(rollup.seats_sold, 3)
+        self.assertEqual(rollup.capacity, 400)
+
+        Ticket.objects.filter(seat=1).delete()
+        self.first.theatre_hall.rows = 10
+        self.first.theatre_hall.save()
+
+        rollup.refresh_from_db()
+        self.assertEqual(rollup.seats_sold, 2)
+        self.assertEqual(rollup.capacity, 200)
+
+    def test_report_per_play(self):
+        self.reserve(self.first, [1, 2, 3, 4])
+        self.reserve(self.third, [1])
+
+        with CaptureQueriesContext(connection) as context:
+            res = self.client.get(OCCUPANCY_URL, {"group_by": "play"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertFalse(
+            any("theatre_ticket" in query["sql"] for query in context)
+        )
+        self.assertEqual(
+            res.data,
+            [
+                {
+                    "play": self.hamlet.id,
+                    "play_title": "Hamlet",
+                    "performances": 2,
+                    "seats_sold": 4,
+                    "capacity": 800,
+                    "fill_rate": 0.005,
+                },
+                {
+                    "play": self.macbeth.id,
+                    "play_title": "Macbeth",
+                    "performances": 1,
+                    "seats_sold": 1,
+                    "capacity": 400,
+                    "fill_rate": 0.0025,
+                },
+            ],
+        )
+
+    def test_report_per_day_and_hall_with_filters(self):
+        res = self.client.get(
+            OCCUPANCY_URL,
+            {
+                "group_by": "day,theatre_hall",
+                "date_from": "2024-05-02",
+                "play": self.hamlet.id,
+            },
+        )
+
+        self.assertEqual(len(res.data), 1)
+        self.assertEqual(str(res.data[0]["day"]), "2024-05-02")
+        self.assertEqual(
+            res.data[0]["theatre_hall"], self.second.theatre_hall_id
+        )
+
+    def test_report_validation_and_permissions(self):
+        res = self.client.get(OCCUPANCY_URL, {"group_by": "ticket"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        for params in ({"play": "x"}, {"theatre_hall": "1,x"}):
+            res = self.client.get(OCCUPANCY_URL, params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.user.is_staff = False
+        self.user.save()
+        res = self.client.get(OCCUPANCY_URL)
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_rebuild_command_recounts_tickets(self):
+        Ticket.objects.create(
+            row=1,
+            seat=1,
+            performance=self.first,
+            reservation=Reservation.objects.create(user=self.user),
+        )
+        PerformanceRollup.objects.update(seats_sold=0)
+        PerformanceRollup.objects.filter(performance=self.third).delete()
+
+        call_command("rebuild_rollups", stdout=StringIO())
+
+        self.assertEqual(PerformanceRollup.objects.count(), 3)
+        self.assertEqual(
+            PerformanceRollup.objects.get(performance=self.first).seats_sold,
+            1,
+        )
+
+    def test_deleting_sold_performances_leaves_no_rollup(self):
+        self.reserve(self.first, [1, 2])
+        self.reserve(self.third, [1])
+
+        res = self.client.delete(
+            reverse("theatre:performance-detail", args=[self.first.id])
+        )
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+
+        Play.objects.all().delete()
+
+        connection.check_constraints()
+        self.assertFalse(PerformanceRollup.objects.exists())
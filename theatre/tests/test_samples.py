@@ -1,11 +1,42 @@
+from contextlib import contextmanager
+from unittest import mock
+
+from django.core.cache import cache
 from django.urls import reverse
 
+from theatre.db import ReplicaRouter, is_pinned_to_primary
+from theatre.middleware import get_query_budget
 from theatre.models import Play, Performance, TheatreHall, Genre, Actor
+from theatre.throttling import reset_throttles
 
 PLAY_URL = reverse("theatre:play-list")
 PERFORMANCE_URL = reverse("theatre:performance-list")
 
 
+@contextmanager
+def recording_read_pinning():
+    """Collect, for every routed read, whether it was pinned to the
+    primary. Test transactions keep all reads there anyway."""
+    pinned = []
+    db_for_read = ReplicaRouter.db_for_read
+
+    def record(router, model, **hints):
+        pinned.append(is_pinned_to_primary())
+        return db_for_read(router, model, **hints)
+
+    with mock.patch.object(ReplicaRouter, "db_for_read", record):
+        yield pinned
+
+
+class ResetCachesMixin:
+    """Start every test with an empty cache and full throttle buckets."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        reset_throttles()
+
+
 def sample_play(**params):
     defaults = {
         "title": "Sample play",
@@ -55,4 +86,32 @@ def image_upload_url(play_id):
 
 
 def detail_url(play_id):
-    return reverse("theatre:play-detail", args=[play_id])
\ No newline at end of file
+    return reverse("theatre:play-detail", args=[play_id])
+
+
+class QueryBudgetMixin:
+    """Assert endpoints stay within their query budget as data grows.
+
+    Needs a staff user on ``self.client`` to read the query headers.
+    """
+
+    dataset_sizes = (1, 5, 10)
+
+    def assert_query_budget(self, url, add_row):
+        counts, rows = [], 0
+        for size in self.dataset_sizes:
+            for index in range(rows, size):
+                add_row(index)
+            rows = size
+            cache.clear()
+            reset_throttles()
+
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, 200)
+            counts.append(int(res["X-DB-Queries"]))
+
+        budget = get_query_budget(res.resolver_match.view_name)
+        self.assertLessEqual(max(counts), budget)
+        self.assertEqual(
+            len(set(counts)), 1, f"Query count grows with data: {counts}"
+        )
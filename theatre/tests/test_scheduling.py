@@ -0,0 +1,125 @@
+from datetime import date, datetime, time
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from theatre.models import Performance, TheatreHall
+from theatre.scheduling import expand_recurrence
+from theatre.tests.test_samples import ResetCachesMixin, sample_play
+
+PERFORMANCE_URL = reverse("theatre:performance-list")
+SCHEDULE_URL = reverse("theatre:performance-schedule")
+
+
+class RecurrenceTests(TestCase):
+    def test_expand_recurrence(self):
+        show_times = expand_recurrence(
+            date(2024, 3, 4), date(2024, 3, 17), {0, 5}, [time(19, 0)]
+        )
+
+        self.assertEqual(
+            [show_time.date() for show_time in show_times],
+            [
+                date(2024, 3, 4),
+                date(2024, 3, 9),
+                date(2024, 3, 11),
+                date(2024, 3, 16),
+            ],
+        )
+        self.assertTrue(all(timezone.is_aware(value) for value in show_times))
+
+
+@override_settings(THEATRE_PERFORMANCE_DURATION=180)
+class ScheduleApiTests(ResetCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "admin@test.com", "password", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        self.play = sample_play()
+        self.hall = TheatreHall.objects.create(
+            name="Blue", rows=10, seats_in_row=10
+        )
+        self.payload = {
+            "play": self.play.id,
+            "theatre_hall": self.hall.id,
+            "start_date": "2024-01-01",
+            "end_date": "2024-12-29",
+            "weekdays": [1, 3, 5],
+            "times": ["14:00", "19:00"],
+        }
+
+    def test_schedule_season(self):
+        res = self.client.post(SCHEDULE_URL, self.payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data["created"], 312)
+        self.assertEqual(res.data["play"], self.play.id)
+        self.assertNotIn("weekdays", res.data)
+        self.assertEqual(
+            Performance.objects.filter(theatre_hall=self.hall).count(), 312
+        )
+
+    def test_schedule_runs_fixed_number_of_queries(self):
+        self.payload["end_date"] = "2024-01-31"
+
+        with self.assertNumQueries(8):
+            res = self.client.post(SCHEDULE_URL, self.payload, format="json")
+
+        self.assertEqual(res.data["created"], 26)
+
+    def test_schedule_invalidates_performance_list(self):
+        self.client.get(PERFORMANCE_URL)
+        etag = self.client.get(PERFORMANCE_URL)["ETag"]
+
+        self.client.post(SCHEDULE_URL, self.payload, format="json")
+        res = self.client.get(PERFORMANCE_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["results"]), 20)
+
+    def test_hall_double_booking_rejected(self):
+        Performance.objects.create(
+            play=self.play,
+            theatre_hall=self.hall,
+            show_time=timezone.make_aware(datetime(2024, 1, 4, 17, 30)),
+        )
+
+        res = self.client.post(SCHEDULE_URL, self.payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(res.data["theatre_hall"]), 1)
+        self.assertIn("2024-01-04T19:00", res.data["theatre_hall"][0])
+        self.assertEqual(Performance.objects.count(), 1)
+
+    def test_overlapping_times_rejected(self):
+        self.payload["times"] = ["14:00", "15:00"]
+
+        res = self.client.post(SCHEDULE_URL, self.payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Performance.objects.exists())
+
+    def test_invalid_date_range(self):
+        self.payload["end_date"] = "2023-12-01"
+
+        res = self.client.post(SCHEDULE_URL, self.payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("end_date", res.data)
+
+    def test_regular_user_cannot_schedule(self):
+        self.client.force_authenticate(
+            get_user_model().objects.create_user("user@test.com", "password")
+        )
+
+        res = self.client.post(SCHEDULE_URL, self.payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
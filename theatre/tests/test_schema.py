@@ -0,0 +1,63 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from theatre import schema
+from theatre.tests.test_samples import ResetCachesMixin
+
+SCHEMA_URL = reverse("schema")
+
+
+class CachedSchemaTests(ResetCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        schema.clear_schema_cache()
+        self.addCleanup(schema.clear_schema_cache)
+        self.client = APIClient()
+
+    def test_schema_is_generated_once_per_process(self):
+        with mock.patch.object(
+            schema, "generate_schema", wraps=schema.generate_schema
+        ) as generate, override_settings(THEATRE_SCHEMA_FILE=None):
+            first = self.client.get(SCHEMA_URL)
+            second = self.client.get(SCHEMA_URL, {"format": "json"})
+
+        self.assertEqual(generate.call_count, 1)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(first["Content-Type"], "application/vnd.oai.openapi")
+        self.assertIn(b"/api/theatre/performances/", first.content)
+        components = json.loads(second.content)["components"]
+        self.assertIn("jwtAuth", components["securitySchemes"])
+        self.assertNotEqual(first["ETag"], second["ETag"])
+
+    def test_etag_revalidation(self):
+        with override_settings(THEATRE_SCHEMA_FILE=None):
+            etag = self.client.get(SCHEMA_URL)["ETag"]
+            res = self.client.get(SCHEMA_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.content, b"")
+
+    def test_schema_file_from_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "schema.json")
+
+            with override_settings(THEATRE_SCHEMA_FILE=path):
+                call_command("build_schema", stdout=StringIO())
+
+                with mock.patch.object(schema, "generate_schema") as generate:
+                    res = self.client.get(SCHEMA_URL, {"format": "json"})
+
+        generate.assert_not_called()
+        self.assertEqual(
+            json.loads(res.content)["info"]["title"], "Theatre Service API"
+        )
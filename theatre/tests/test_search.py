@@ -0,0 +1,82 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from theatre.search import get_search_backend
+from theatre.tests.test_samples import (
+    ResetCachesMixin,
+    sample_actor,
+    sample_genre,
+    sample_play,
+)
+
+PLAY_URL = reverse("theatre:play-list")
+
+
+class PlaySearchTests(ResetCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "password"
+        )
+        self.client.force_authenticate(self.user)
+        self.hamlet = sample_play(
+            title="Hamlet", description="The prince of Denmark"
+        )
+        self.lear = sample_play(
+            title="King Lear", description="An old king and Hamlet fans"
+        )
+        self.seagull = sample_play(
+            title="The Seagull", description="A Russian country estate"
+        )
+
+    def search(self, query):
+        res = self.client.get(PLAY_URL, {"search": query})
+        return [play["title"] for play in res.data["results"]]
+
+    def test_search_ranks_title_matches_first(self):
+        self.assertEqual(self.search("hamlet"), ["Hamlet", "King Lear"])
+
+    def test_search_by_prefix_and_description(self):
+        self.assertEqual(self.search("russ"), ["The Seagull"])
+
+    def test_index_follows_relation_changes(self):
+        actor = sample_actor(first_name="Ian", last_name="McKellen")
+        genre = sample_genre(name="Tragedy")
+
+        self.lear.actors.add(actor)
+        genre.plays.add(self.hamlet)
+
+        self.assertEqual(self.search("mckellen"), ["King Lear"])
+        self.assertEqual(self.search("tragedy"), ["Hamlet"])
+
+        actor.last_name = "Serkis"
+        actor.save()
+        genre.plays.clear()
+
+        self.assertEqual(self.search("mckellen"), [])
+        self.assertEqual(self.search("serkis"), ["King Lear"])
+        self.assertEqual(self.search("tragedy"), [])
+
+    def test_deleted_play_leaves_index(self):
+        self.seagull.delete()
+
+        self.assertEqual(self.search("seagull"), [])
+
+    def test_rebuild_command(self):
+        if connection.vendor == "sqlite":
+            with connection.cursor() as cursor:
+                cursor.execute("DELETE FROM theatre_play_fts")
+
+        call_command("rebuild_search_index", stdout=StringIO())
+
+        self.assertEqual(
+            get_search_backend().search("seagull", 10), [self.seagull.id]
+        )
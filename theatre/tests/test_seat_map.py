@@ -0,0 +1,142 @@
+import base64
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from theatre.models import Reservation, TheatreHall, Ticket
+from theatre.occupancy import SeatOccupancy
+from theatre.seat_map import encode_rle, get_hall_layout
+from theatre.tests.test_samples import (
+    ResetCachesMixin,
+    sample_performance,
+    sample_play,
+)
+
+
+def seat_map_url(performance_id):
+    return reverse("theatre:performance-seat-map", args=[performance_id])
+
+
+class SeatMapEncodingTests(ResetCachesMixin, TestCase):
+    def test_rle_rows(self):
+        occupancy = SeatOccupancy.from_seats(
+            3, 10, [(1, 1), (1, 2), (2, 10), (3, 4)]
+        )
+
+        self.assertEqual(
+            encode_rle(occupancy), ["2x8.", "9.1x", "3.1x6."]
+        )
+
+    def test_hall_layout_is_cached(self):
+        hall = TheatreHall.objects.create(name="Red", rows=5, seats_in_row=8)
+        get_hall_layout(hall)
+
+        with self.assertNumQueries(0):
+            layout = get_hall_layout(hall)
+
+        self.assertEqual(layout["capacity"], 40)
+        self.assertEqual(layout["empty_row"], "8.")
+
+    def test_hall_layout_follows_hall_changes(self):
+        hall = TheatreHall.objects.create(name="Red", rows=5, seats_in_row=8)
+        get_hall_layout(hall)
+
+        hall.name = "Blue"
+        hall.save()
+
+        self.assertEqual(get_hall_layout(hall)["name"], "Blue")
+
+    def test_hall_layout_follows_resize_without_signals(self):
+        hall = TheatreHall.objects.create(name="Red", rows=5, seats_in_row=8)
+        get_hall_layout(hall)
+
+        TheatreHall.objects.filter(pk=hall.pk).update(rows=2)
+        hall.refresh_from_db()
+        layout = get_hall_layout(hall)
+
+        self.assertEqual(layout["rows"], 2)
+        self.assertEqual(layout["capacity"], 16)
+
+
+class SeatMapApiTests(ResetCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "user@test.com", "password"
+        )
+        self.client.force_authenticate(self.user)
+        self.hall = TheatreHall.objects.create(
+            name="Grand", rows=40, seats_in_row=50
+        )
+        self.performance = sample_performance(
+            play=sample_play(), theatre_hall=self.hall
+        )
+        reservation = Reservation.objects.create(user=self.user)
+        Ticket.objects.bulk_create(
+            Ticket(
+                row=row,
+                seat=seat,
+                performance=self.performance,
+                reservation=reservation,
+            )
+            for row in range(1, 41)
+            for seat in range(1, 51)
+            if (row + seat) % 2
+        )
+        self.performance.tickets_sold = 1000
+        self.performance.save()
+
+    def test_rle_seat_map(self):
+        res = self.client.get(seat_map_url(self.performance.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["encoding"], "rle")
+        self.assertEqual(len(res.data["seats"]), 40)
+        self.assertEqual(res.data["seats"][0], "1." + "1x1." * 24 + "1x")
+        self.assertEqual(res.data["taken"], 1000)
+        self.assertEqual(res.data["available"], 1000)
+        self.assertEqual(res.data["layout"]["seats_in_row"], 50)
+
+    def test_bitmap_seat_map(self):
+        res = self.client.get(
+            seat_map_url(self.performance.id), {"encoding": "bitmap"}
+        )
+        bits = base64.b64decode(res.data["seats"])
+        occupancy = SeatOccupancy(40, 50, bits)
+
+        self.assertTrue(occupancy.is_taken(1, 2))
+        self.assertFalse(occupancy.is_taken(1, 1))
+        self.assertEqual(occupancy.taken_count, 1000)
+
+    def test_unknown_encoding(self):
+        res = self.client.get(
+            seat_map_url(self.performance.id), {"encoding": "png"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bitmap_is_an_order_of_magnitude_smaller(self):
+        detail = self.client.get(
+            reverse("theatre:performance-detail", args=[self.performance.id])
+        )
+        seat_map = self.client.get(
+            seat_map_url(self.performance.id), {"encoding": "bitmap"}
+        )
+        places_size = len(json.dumps(detail.data["taken_places"]))
+
+        self.assertLess(len(seat_map.content) * 10, places_size)
+
+    def test_seat_map_not_modified(self):
+        etag = self.client.get(seat_map_url(self.performance.id))["ETag"]
+
+        res = self.client.get(
+            seat_map_url(self.performance.id), HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
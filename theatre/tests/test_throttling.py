@@ -0,0 +1,125 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from theatre.tests.test_samples import (
+    ResetCachesMixin,
+    sample_performance,
+    sample_play,
+)
+from theatre.throttling import (
+    MemoryBucketStore,
+    ScopedBucketThrottle,
+    SQLiteBucketStore,
+)
+
+GENRE_URL = reverse("theatre:genre-list")
+RESERVATION_URL = reverse("theatre:reservation-list")
+TEST_RATES = {
+    "anon": "2/minute",
+    "user": "3/minute",
+    "catalog": "5/minute",
+    "reservations": "1/minute",
+}
+
+
+class BucketStoreTests(TestCase):
+    def check_bucket(self, store):
+        self.assertEqual(store.consume("key", 2, 1, now=100), 0)
+        self.assertEqual(store.consume("key", 2, 1, now=100), 0)
+        self.assertEqual(store.consume("key", 2, 1, now=100), 1)
+        self.assertEqual(store.consume("key", 2, 1, now=100.5), 0.5)
+        self.assertEqual(store.consume("key", 2, 1, now=101), 0)
+        self.assertEqual(store.consume("other", 2, 1, now=101), 0)
+
+    def test_memory_store(self):
+        self.check_bucket(MemoryBucketStore())
+
+    def test_memory_store_drops_oldest_keys(self):
+        store = MemoryBucketStore(max_keys=2)
+
+        for key in ("a", "b", "c"):
+            store.consume(key, 1, 1, now=0)
+
+        self.assertEqual(list(store.buckets), ["b", "c"])
+
+    def test_sqlite_store_is_shared(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "throttle.sqlite3")
+            self.check_bucket(SQLiteBucketStore(path))
+
+            other_worker = SQLiteBucketStore(path)
+            self.assertEqual(other_worker.consume("key", 2, 1, now=101), 1)
+
+            other_worker.clear()
+            self.assertEqual(other_worker.consume("key", 2, 1, now=101), 0)
+
+    def test_sqlite_store_prunes_idle_buckets(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = SQLiteBucketStore(
+                os.path.join(directory, "throttle.sqlite3"),
+                max_idle=60,
+                prune_interval=30,
+            )
+            store.consume("idle", 2, 1, now=0)
+            store.consume("busy", 2, 1, now=50)
+            store.consume("busy", 2, 1, now=100)
+
+            rows = store.get_connection().execute(
+                "SELECT key FROM throttle_bucket"
+            )
+            self.assertEqual(rows.fetchall(), [("busy",)])
+
+
+@mock.patch.object(ScopedBucketThrottle, "THROTTLE_RATES", TEST_RATES)
+class ScopedThrottleTests(ResetCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "admin@test.com", "password", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        self.performance = sample_performance(play=sample_play())
+
+    def reserve(self, seat):
+        return self.client.post(
+            RESERVATION_URL,
+            {
+                "tickets": [
+                    {
+                        "row": 1,
+                        "seat": seat,
+                        "performance": self.performance.id,
+                    }
+                ]
+            },
+            format="json",
+        )
+
+    def test_catalog_reads_use_catalog_rate(self):
+        statuses = [self.client.get(GENRE_URL).status_code for _ in range(6)]
+
+        self.assertEqual(statuses[:5], [status.HTTP_200_OK] * 5)
+        self.assertEqual(statuses[5], status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_reservations_are_charged_separately(self):
+        self.assertEqual(self.reserve(1).status_code, status.HTTP_201_CREATED)
+
+        res = self.reserve(2)
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", res)
+        self.assertEqual(
+            self.client.get(GENRE_URL).status_code, status.HTTP_200_OK
+        )
+        self.assertEqual(
+            self.client.get(RESERVATION_URL).status_code, status.HTTP_200_OK
+        )
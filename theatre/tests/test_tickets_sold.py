@@ -0,0 +1,123 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from theatre.models import (
+    Performance,
+    PerformanceRollup,
+    Reservation,
+    Ticket,
+)
+from theatre.tests.test_samples import (
+    ResetCachesMixin,
+    sample_play,
+    sample_performance,
+)
+
+PERFORMANCE_URL = reverse("theatre:performance-list")
+RESERVATION_URL = reverse("theatre:reservation-list")
+
+
+class TicketsSoldCounterTests(ResetCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "password", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        self.performance = sample_performance(play=sample_play())
+
+    def reserve(self, seats):
+        return self.client.post(
+            RESERVATION_URL,
+            {
+                "tickets": [
+                    {
+                        "row": row,
+                        "seat": seat,
+                        "performance": self.performance.id,
+                    }
+                    for row, seat in seats
+                ]
+            },
+            format="json",
+        )
+
+    def assert_tickets_sold(self, count):
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.tickets_sold, count)
+
+    def test_reservation_increments_counter(self):
+        self.reserve([(1, 1), (1, 2), (1, 3)])
+
+        self.assert_tickets_sold(3)
+
+    def test_rejected_reservation_keeps_counter(self):
+        self.reserve([(1, 1)])
+        self.reserve([(1, 1), (1, 2)])
+
+        self.assert_tickets_sold(1)
+
+    def test_ticket_create_and_delete_update_counter(self):
+        reservation = Reservation.objects.create(user=self.user)
+        ticket = Ticket.objects.create(
+            row=1,
+            seat=1,
+            performance=self.performance,
+            reservation=reservation,
+        )
+        self.assert_tickets_sold(1)
+
+        ticket.delete()
+        self.assert_tickets_sold(0)
+
+    def test_reservation_delete_updates_counter(self):
+        res = self.reserve([(1, 1), (1, 2)])
+
+        Reservation.objects.get(id=res.data["id"]).delete()
+
+        self.assert_tickets_sold(0)
+
+    def test_list_shows_tickets_available_without_aggregation(self):
+        self.reserve([(1, 1), (1, 2)])
+
+        with self.assertNumQueries(1):
+            res = self.client.get(PERFORMANCE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"][0]["tickets_available"], 398)
+
+    def test_reconcile_fixes_drifted_counters(self):
+        self.reserve([(1, 1), (1, 2)])
+        Performance.objects.update(tickets_sold=7)
+
+        call_command("reconcile_tickets_sold", stdout=StringIO())
+
+        self.assert_tickets_sold(2)
+
+    def test_reconcile_refreshes_etags_and_rollups(self):
+        self.reserve([(1, 1)])
+        Performance.objects.update(tickets_sold=7)
+        etag = self.client.get(PERFORMANCE_URL)["ETag"]
+
+        call_command("reconcile_tickets_sold", stdout=StringIO())
+        res = self.client.get(PERFORMANCE_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"][0]["tickets_available"], 399)
+        self.assertEqual(PerformanceRollup.objects.get().seats_sold, 1)
+
+    def test_reconcile_dry_run_keeps_counters(self):
+        self.reserve([(1, 1)])
+        Performance.objects.update(tickets_sold=7)
+
+        call_command("reconcile_tickets_sold", "--dry-run", stdout=StringIO())
+
+        self.assert_tickets_sold(7)
@@ -0,0 +1,224 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import SimpleRateThrottle
+
+MEMORY_STORE = "theatre.throttling.MemoryBucketStore"
+SQLITE_STORE = "theatre.throttling.SQLiteBucketStore"
+
+
+def _refill(tokens, updated, capacity, refill_rate, now):
+    return min(capacity, tokens + (now - updated) * refill_rate)
+
+
+class MemoryBucketStore:
+    """Token buckets of the current process, least recently used keys
+    are dropped past ``max_keys``."""
+
+    def __init__(self, max_keys=100_000):
+        self.max_keys = max_keys
+        self.buckets = OrderedDict()
+        self.lock = threading.Lock()
+
+    def consume(self, key, capacity, refill_rate, now):
+        """Take a token from the bucket, return the seconds to wait for
+        one or 0 when the request is allowed."""
+        with self.lock:
+            tokens, updated = self.buckets.pop(key, (capacity, now))
+            tokens = _refill(tokens, updated, capacity, refill_rate, now)
+            wait = 0 if tokens >= 1 else (1 - tokens) / refill_rate
+            self.buckets[key] = (tokens - 1 if not wait else tokens, now)
+
+            while len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+
+        return wait
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+class SQLiteBucketStore:
+    """Token buckets in a SQLite file, shared by the workers of a node.
+
+    Every ``prune_interval`` seconds the buckets left untouched for
+    ``max_idle`` seconds are deleted. The longest rate period is a day,
+    so such buckets are full again and a missing row means the same.
+    """
+
+    def __init__(
+        self, path=None, timeout=5, max_idle=86_400, prune_interval=300
+    ):
+        self.path = str(
+            path
+            or getattr(settings, "THEATRE_THROTTLE_DB", None)
+            or os.path.join(settings.BASE_DIR, "throttle.sqlite3")
+        )
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.prune_interval = prune_interval
+        self.pruned_at = 0
+        self.local = threading.local()
+
+    def get_connection(self):
+        connection = getattr(self.local, "connection", None)
+
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS throttle_bucket ("
+                "key TEXT PRIMARY KEY, tokens REAL, updated REAL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS throttle_bucket_updated "
+                "ON throttle_bucket (updated)"
+            )
+            self.local.connection = connection
+
+        return connection
+
+    def consume(self, key, capacity, refill_rate, now):
+        connection = self.get_connection()
+        connection.execute("BEGIN IMMEDIATE")
+
+        try:
+            row = connection.execute(
+                "SELECT tokens, updated FROM throttle_bucket WHERE key = ?",
+                (key,),
+            ).fetchone()
+            tokens, updated = row or (capacity, now)
+            tokens = _refill(tokens, updated, capacity, refill_rate, now)
+            wait = 0 if tokens >= 1 else (1 - tokens) / refill_rate
+            connection.execute(
+                "INSERT OR REPLACE INTO throttle_bucket (key, tokens, updated)"
+                " VALUES (?, ?, ?)",
+                (key, tokens - 1 if not wait else tokens, now),
+            )
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+        connection.execute("COMMIT")
+
+        if now - self.pruned_at >= self.prune_interval:
+            self.prune(now)
+
+        return wait
+
+    def prune(self, now):
+        self.pruned_at = now
+        self.get_connection().execute(
+            "DELETE FROM throttle_bucket WHERE updated < ?",
+            (now - self.max_idle,),
+        )
+
+    def clear(self):
+        self.get_connection().execute("DELETE FROM throttle_bucket")
+
+
+@lru_cache(maxsize=None)
+def _load_store(path):
+    return import_string(path)()
+
+
+def get_throttle_store():
+    return _load_store(
+        getattr(settings, "THEATRE_THROTTLE_STORE", MEMORY_STORE)
+    )
+
+
+def reset_throttles():
+    get_throttle_store().clear()
+
+
+class BucketRateThrottle(SimpleRateThrottle):
+    """``SimpleRateThrottle`` charging a token bucket per key instead of
+    rewriting a list of request timestamps in the cache.
+
+    A rate of ``N/period`` allows bursts of N requests and refills N
+    tokens per period.
+    """
+
+    timer = time.time
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.wait_seconds = get_throttle_store().consume(
+            self.key,
+            self.num_requests,
+            self.num_requests / self.duration,
+            self.timer(),
+        )
+        return not self.wait_seconds
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class AnonBucketThrottle(BucketRateThrottle):
+    scope = "anon"
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return None
+
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
+
+
+class ScopedBucketThrottle(BucketRateThrottle):
+    """Charge authenticated users per ``throttle_scope`` of the view.
+
+    Unsafe requests use ``write_throttle_scope`` when the view sets one,
+    views without a scope share the ``user`` rate.
+    """
+
+    default_scope = "user"
+
+    def __init__(self):
+        # The rate depends on the view, it is resolved in allow_request
+        pass
+
+    def get_scope(self, request, view):
+        if request.method not in SAFE_METHODS:
+            write_scope = getattr(view, "write_throttle_scope", None)
+            if write_scope:
+                return write_scope
+
+        return getattr(view, "throttle_scope", None) or self.default_scope
+
+    def allow_request(self, request, view):
+        self.scope = self.get_scope(request, view)
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+
+        return super().allow_request(request, view)
+
+    def get_cache_key(self, request, view):
+        if not (request.user and request.user.is_authenticated):
+            return None
+
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": request.user.pk,
+        }
@@ -1,5 +1,12 @@
 from django.urls import path, include
 from rest_framework import routers
+from .async_views import (
+    PerformanceDetailView,
+    PerformanceListView,
+    PerformanceSeatMapView,
+    PlayDetailView,
+    PlayListView,
+)
 from .views import (
     TheatreHallViewSet,
     GenreViewSet,
@@ -8,6 +15,8 @@ from .views import (
     PerformanceViewSet,
     ReservationViewSet,
     TicketViewSet,
+    SeatHoldViewSet,
+    OccupancyAnalyticsViewSet,
 )
 
 router = routers.DefaultRouter()
@@ -18,9 +27,36 @@ router.register(r"plays", PlayViewSet)
 router.register(r"performances", PerformanceViewSet)
 router.register(r"reservations", ReservationViewSet)
 router.register(r"tickets", TicketViewSet)
+router.register(r"holds", SeatHoldViewSet)
+router.register(
+    r"analytics/occupancy",
+    OccupancyAnalyticsViewSet,
+    basename="occupancy-analytics",
+)
 
 urlpatterns = [
     path("", include(router.urls)),
+    path(
+        "async/performances/",
+        PerformanceListView.as_view(),
+        name="async-performance-list",
+    ),
+    path(
+        "async/performances/<int:pk>/",
+        PerformanceDetailView.as_view(),
+        name="async-performance-detail",
+    ),
+    path(
+        "async/performances/<int:pk>/seat-map/",
+        PerformanceSeatMapView.as_view(),
+        name="async-performance-seat-map",
+    ),
+    path("async/plays/", PlayListView.as_view(), name="async-play-list"),
+    path(
+        "async/plays/<int:pk>/",
+        PlayDetailView.as_view(),
+        name="async-play-detail",
+    ),
 ]
 
 
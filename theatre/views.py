@@ -1,13 +1,21 @@
-from django.db.models import F, Count
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Case, Exists, F, IntegerField, OuterRef, When
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 from rest_framework import viewsets, status, mixins
 from rest_framework.decorators import action
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework.viewsets import GenericViewSet
 
 from .models import (
+    MAX_ID,
     TheatreHall,
     Genre,
     Actor,
@@ -15,9 +23,40 @@ from .models import (
     Performance,
     Reservation,
     Ticket,
+    SeatHold,
+    PerformanceRollup,
+)
+from .cache import CachedListMixin
+from .conditional import ConditionalGetMixin
+from .exports import (
+    CONTENT_TYPES,
+    EXPORT_FORMATS,
+    get_export_filename,
+    stream_export,
+)
+from .images import schedule_variants
+from .holds import confirm_hold, release_hold
+from .pagination import (
+    PerformancePagination,
+    PlayPagination,
+    ReservationPagination,
+    TicketPagination,
+)
+from .occupancy import get_occupancies, get_occupancy
+from .rollups import ROLLUP_GROUPS, occupancy_report
+from .search import get_search_backend, get_search_limit
+from .seat_map import (
+    MAX_AVAILABILITY_PERFORMANCES,
+    SEAT_MAP_ENCODINGS,
+    build_availability,
+    build_seat_map,
+    get_seat_map_encoding,
 )
 from .permissions import IsAdminOrIfAuthenticatedReadOnly
 from .serializers import (
+    RESERVATION_ROW_FIELDS,
+    group_reservation_rows,
+    reservation_list_data,
     TheatreHallSerializer,
     GenreSerializer,
     ActorSerializer,
@@ -29,8 +68,14 @@ from .serializers import (
     PlayDetailSerializer,
     PerformanceListSerializer,
     PerformanceDetailSerializer,
+    PerformanceScheduleSerializer,
     ReservationListSerializer,
+    ReservationUpdateSerializer,
     PlayImageSerializer,
+    SeatHoldSerializer,
+    SeatMapSerializer,
+    OccupancyReportSerializer,
+    PerformanceAvailabilitySerializer,
 )
 
 
@@ -38,7 +83,113 @@ def _params_to_ints(params) -> list:
     return [int(str_id) for str_id in params.split(",")]
 
 
+def _param_to_ids(query_params, name):
+    value = query_params.get(name)
+
+    if not value:
+        return None
+
+    try:
+        ids = _params_to_ints(value)
+    except ValueError:
+        ids = None
+
+    if not ids or not all(0 < id_ <= MAX_ID for id_ in ids):
+        raise ValidationError({name: "Use comma-separated ids (ex. 1,2)"})
+
+    return ids
+
+
+def filter_plays(queryset, query_params):
+    actors_ids = _param_to_ids(query_params, "actors")
+    genres_ids = _param_to_ids(query_params, "genres")
+    title = query_params.get("title")
+    search = query_params.get("search")
+
+    if actors_ids:
+        queryset = queryset.filter(
+            Exists(
+                Play.actors.through.objects.filter(
+                    play_id=OuterRef("pk"), actor_id__in=actors_ids
+                )
+            )
+        )
+
+    if genres_ids:
+        queryset = queryset.filter(
+            Exists(
+                Play.genres.through.objects.filter(
+                    play_id=OuterRef("pk"), genre_id__in=genres_ids
+                )
+            )
+        )
+
+    if title:
+        queryset = queryset.filter(title__icontains=title)
+
+    if search:
+        play_ids = get_search_backend().search(search, get_search_limit())
+        queryset = queryset.filter(id__in=play_ids).annotate(
+            search_rank=Case(
+                *[
+                    When(id=play_id, then=rank)
+                    for rank, play_id in enumerate(play_ids)
+                ],
+                output_field=IntegerField(),
+            )
+        )
+
+    return queryset
+
+
+def _param_to_date(query_params, name):
+    value = query_params.get(name)
+
+    if not value:
+        return None
+
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+
+    if parsed is None:
+        raise ValidationError({name: "Use the YYYY-MM-DD format"})
+
+    return timezone.make_aware(datetime.combine(parsed, time.min))
+
+
+def filter_performances(queryset, query_params):
+    date_from = _param_to_date(query_params, "date_from")
+    date_to = _param_to_date(query_params, "date_to")
+    plays = _param_to_ids(query_params, "play")
+    theatre_halls = _param_to_ids(query_params, "theatre_hall")
+    available = query_params.get("available")
+
+    if date_from:
+        queryset = queryset.filter(show_time__gte=date_from)
+
+    if date_to:
+        queryset = queryset.filter(show_time__lt=date_to + timedelta(days=1))
+
+    if plays:
+        queryset = queryset.filter(play_id__in=plays)
+
+    if theatre_halls:
+        queryset = queryset.filter(theatre_hall_id__in=theatre_halls)
+
+    if available in ("1", "true", "True"):
+        queryset = queryset.filter(
+            tickets_sold__lt=F("theatre_hall__rows")
+            * F("theatre_hall__seats_in_row")
+        )
+
+    return queryset
+
+
 class TheatreHallViewSet(
+    ConditionalGetMixin,
+    CachedListMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     GenericViewSet,
@@ -46,9 +197,13 @@ class TheatreHallViewSet(
     queryset = TheatreHall.objects.all()
     serializer_class = TheatreHallSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    cache_models = (TheatreHall,)
+    throttle_scope = "catalog"
 
 
 class GenreViewSet(
+    ConditionalGetMixin,
+    CachedListMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     GenericViewSet,
@@ -56,9 +211,13 @@ class GenreViewSet(
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    cache_models = (Genre,)
+    throttle_scope = "catalog"
 
 
 class ActorViewSet(
+    ConditionalGetMixin,
+    CachedListMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     GenericViewSet,
@@ -66,9 +225,13 @@ class ActorViewSet(
     queryset = Actor.objects.all()
     serializer_class = ActorSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    cache_models = (Actor,)
+    throttle_scope = "catalog"
 
 
 class PlayViewSet(
+    ConditionalGetMixin,
+    CachedListMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
@@ -77,25 +240,17 @@ class PlayViewSet(
     queryset = Play.objects.all()
     serializer_class = PlaySerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    pagination_class = PlayPagination
+    cache_models = (Play, Genre, Actor)
+    throttle_scope = "catalog"
 
     def get_queryset(self):
-        queryset = self.queryset
-        actors = self.request.query_params.get("actors")
-        genres = self.request.query_params.get("genres")
-        title = self.request.query_params.get("title")
+        queryset = filter_plays(self.queryset, self.request.query_params)
 
-        if actors:
-            actors_ids = self._params_to_ints(actors)
-            queryset = queryset.filter(actors__id__in=actors_ids)
+        if self.action in ("list", "retrieve"):
+            queryset = queryset.prefetch_related("genres", "actors")
 
-        if genres:
-            genres_ids = self._params_to_ints(genres)
-            queryset = queryset.filter(genres__id__in=genres_ids)
-
-        if title:
-            queryset = queryset.filter(title__icontains=title)
-
-        return queryset.distinct()
+        return queryset
 
     def get_serializer_class(self):
         serializer_class = self.serializer_class
@@ -122,13 +277,21 @@ class PlayViewSet(
         serializer = self.get_serializer(play, data=request.data)
 
         if serializer.is_valid():
-            serializer.save()
+            serializer.save(image_variants={})
+            transaction.on_commit(lambda: schedule_variants(play.id))
             return Response(serializer.data, status=status.HTTP_200_OK)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     @extend_schema(
         parameters=[
+            OpenApiParameter(
+                "search",
+                type=str,
+                description="Full-text search over title, description, "
+                "actors and genres, best matches first (ex. ?search=hamlet)",
+                required=False,
+            ),
             OpenApiParameter(
                 "title",
                 type=str,
@@ -153,20 +316,76 @@ class PlayViewSet(
         return super().list(request, *args, **kwargs)
 
 
-class PerformanceViewSet(viewsets.ModelViewSet):
+PERFORMANCE_FILTER_PARAMETERS = [
+    OpenApiParameter(
+        "date_from",
+        type=OpenApiTypes.DATE,
+        description="Performances from this day on "
+        "(ex. ?date_from=2024-05-01)",
+        required=False,
+    ),
+    OpenApiParameter(
+        "date_to",
+        type=OpenApiTypes.DATE,
+        description="Performances up to and including this day "
+        "(ex. ?date_to=2024-05-07)",
+        required=False,
+    ),
+    OpenApiParameter(
+        "play",
+        type={"type": "list", "items": {"type": "number"}},
+        description="Filter by play id (ex. ?play=2,5)",
+        required=False,
+    ),
+    OpenApiParameter(
+        "theatre_hall",
+        type={"type": "list", "items": {"type": "number"}},
+        description="Filter by theatre hall id (ex. ?theatre_hall=1)",
+        required=False,
+    ),
+    OpenApiParameter(
+        "available",
+        type=bool,
+        description="Only performances with free seats "
+        "(ex. ?available=true)",
+        required=False,
+    ),
+]
+
+
+class PerformanceViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Performance.objects.select_related("play", "theatre_hall")
     serializer_class = PerformanceSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    pagination_class = PerformancePagination
+    conditional_actions = ("list", "retrieve", "seat_map", "availability")
+    throttle_scope = "catalog"
+
+    def get_version_sources(self):
+        if self.action == "seat_map":
+            return TheatreHall, (Performance, self.kwargs["pk"])
+
+        if self.action == "retrieve":
+            return (
+                Performance,
+                Play,
+                Genre,
+                Actor,
+                TheatreHall,
+                (Performance, self.kwargs["pk"]),
+            )
+
+        return Performance, Play, TheatreHall, Ticket
 
     def get_queryset(self):
         queryset = self.queryset
 
         if self.action == "list":
-            queryset = queryset.select_related(
-                "play", "theatre_hall").annotate(
-                tickets_available=F("theatre_hall__seats_in_row")
-                * F("theatre_hall__rows")
-                - Count("tickets")
+            queryset = filter_performances(queryset, self.request.query_params)
+
+        if self.action == "retrieve":
+            queryset = queryset.prefetch_related(
+                "play__genres", "play__actors"
             )
 
         return queryset
@@ -182,40 +401,313 @@ class PerformanceViewSet(viewsets.ModelViewSet):
 
         return serializer_class
 
+    @extend_schema(parameters=PERFORMANCE_FILTER_PARAMETERS)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @extend_schema(
+        request=PerformanceScheduleSerializer,
+        responses=PerformanceScheduleSerializer,
+    )
+    @action(methods=["POST"], detail=False)
+    def schedule(self, request):
+        """Create a recurring season of performances in one request"""
+        serializer = PerformanceScheduleSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "encoding",
+                type=str,
+                enum=SEAT_MAP_ENCODINGS,
+                description="Run-length strings per row (default) or a "
+                "base64 bitmap, one bit per seat, row-major and least "
+                "significant bit first",
+            ),
+        ],
+        responses=SeatMapSerializer,
+    )
+    @action(methods=["GET"], detail=True, url_path="seat-map")
+    def seat_map(self, request, pk=None):
+        """Hall layout and occupancy of the performance in compact form"""
+        encoding = get_seat_map_encoding(request.query_params)
+        performance = self.get_object()
+
+        return Response(
+            build_seat_map(performance, get_occupancy(performance), encoding)
+        )
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "ids",
+                type={"type": "list", "items": {"type": "number"}},
+                description="Performance ids (ex. ?ids=3,4,8), or filter "
+                "by play and dates instead",
+            ),
+            OpenApiParameter(
+                "bitmap",
+                type=bool,
+                description="Add the base64 occupancy bitmap of every "
+                "performance (ex. ?bitmap=true)",
+            ),
+            *PERFORMANCE_FILTER_PARAMETERS,
+        ],
+        responses=PerformanceAvailabilitySerializer(many=True),
+    )
+    @action(methods=["GET"], detail=False)
+    def availability(self, request):
+        """Free seats of up to 100 performances in at most two queries"""
+        query_params = request.query_params
+        ids = _param_to_ids(query_params, "ids")
+        performances = filter_performances(
+            Performance.objects.select_related("theatre_hall"), query_params
+        )
+
+        if ids:
+            performances = performances.filter(id__in=ids)
+        elif not query_params.get("play"):
+            raise ValidationError({"ids": "Pass performance ids or a play"})
+
+        performances = list(
+            performances.order_by("show_time", "id")[
+                : MAX_AVAILABILITY_PERFORMANCES + 1
+            ]
+        )
+        if len(performances) > MAX_AVAILABILITY_PERFORMANCES:
+            raise ValidationError(
+                {
+                    "ids": f"Ask for at most {MAX_AVAILABILITY_PERFORMANCES} "
+                    f"performances at once"
+                }
+            )
+
+        occupancies = {}
+        if query_params.get("bitmap") in ("1", "true", "True"):
+            occupancies = get_occupancies(performances)
+
+        return Response(
+            [
+                build_availability(
+                    performance, occupancies.get(performance.id)
+                )
+                for performance in performances
+            ]
+        )
+
+
+EXPORT_PARAMETERS = [
+    OpenApiParameter(
+        "output",
+        type=OpenApiTypes.STR,
+        enum=EXPORT_FORMATS,
+        description="Export format (ex. ?output=ndjson), defaults to csv",
+    ),
+    OpenApiParameter(
+        "performance",
+        type=OpenApiTypes.INT,
+        description="Only export this performance (ex. ?performance=2)",
+    ),
+    OpenApiParameter(
+        "date_from",
+        type=OpenApiTypes.DATE,
+        description="Performances shown from this day on",
+    ),
+    OpenApiParameter(
+        "date_to",
+        type=OpenApiTypes.DATE,
+        description="Performances shown until the end of this day",
+    ),
+]
+
+
+def export_response(kind, query_params):
+    """Stream an export as CSV or NDJSON without serializers"""
+    export_format = query_params.get("output", "csv")
+    if export_format not in EXPORT_FORMATS:
+        raise ValidationError(
+            {"output": f"Choose one of: {', '.join(EXPORT_FORMATS)}"}
+        )
+
+    performances = _param_to_ids(query_params, "performance")
+    if performances and len(performances) > 1:
+        raise ValidationError({"performance": "Use a performance id"})
+    performance = performances and performances[0]
+
+    lines = stream_export(
+        kind,
+        export_format,
+        performance_id=performance,
+        date_from=_param_to_date(query_params, "date_from"),
+        date_to=_param_to_date(query_params, "date_to"),
+    )
+    response = StreamingHttpResponse(
+        lines, content_type=CONTENT_TYPES[export_format]
+    )
+    filename = get_export_filename(kind, export_format, performance)
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
 
-class ReservationPagination(PageNumberPagination):
-    page_size = 2
-    page_size_query_param = "page_size"
-    max_page_size = 100
+    return response
 
 
 class ReservationViewSet(viewsets.ModelViewSet):
     queryset = Reservation.objects.all()
     serializer_class = ReservationSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    pagination_class = ReservationPagination
+    write_throttle_scope = "reservations"
+    use_primary_db = True
 
     def get_queryset(self):
-        queryset = self.queryset.filter(user=self.request.user)
-
-        if self.action == "list":
-            queryset = queryset.prefetch_related(
-                "tickets__performance__theatre_hall",
-                "tickets__performance__play"
-            )
-
-        return queryset
+        return self.queryset.filter(user=self.request.user)
 
     def get_serializer_class(self):
         if self.action == "list":
             return ReservationListSerializer
 
+        if self.action in ("update", "partial_update"):
+            return ReservationUpdateSerializer
+
         return ReservationSerializer
 
+    def list(self, request, *args, **kwargs):
+        """Build the page from the rows of one join, without instantiating
+        tickets, performances, plays or halls"""
+        page = self.paginator.get_page_queryset(
+            self.get_queryset(), request, self
+        )
+        rows = (
+            Reservation.objects.filter(id__in=page.values("id"))
+            .order_by(*page.query.order_by, "tickets__id")
+            .values(*RESERVATION_ROW_FIELDS)
+        )
+        reservations = self.paginator.paginate_results(
+            group_reservation_rows(rows)
+        )
+
+        return self.paginator.get_paginated_response(
+            reservation_list_data(reservations)
+        )
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+    @extend_schema(parameters=EXPORT_PARAMETERS, responses=OpenApiTypes.STR)
+    @action(methods=["GET"], detail=False, permission_classes=[IsAdminUser])
+    def export(self, request):
+        """Reservations of all users, streamed for box-office reconciliation"""
+        return export_response("reservations", request.query_params)
+
+
+class SeatHoldViewSet(
+    mixins.CreateModelMixin,
+    GenericViewSet,
+):
+    queryset = SeatHold.objects.all()
+    serializer_class = SeatHoldSerializer
+    permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    lookup_field = "token"
+    lookup_value_regex = "[0-9a-f-]{36}"
+    write_throttle_scope = "reservations"
+    use_primary_db = True
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    def destroy(self, request, token=None):
+        if not release_hold(request.user, token):
+            return Response(status=status.HTTP_404_NOT_FOUND)
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @extend_schema(request=None, responses=ReservationSerializer)
+    @action(methods=["POST"], detail=True)
+    def confirm(self, request, token=None):
+        reservation = confirm_hold(request.user, token)
+        serializer = ReservationSerializer(reservation)
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
 
 class TicketViewSet(viewsets.ModelViewSet):
     queryset = Ticket.objects.all()
     serializer_class = TicketSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    pagination_class = TicketPagination
+
+    @extend_schema(parameters=EXPORT_PARAMETERS, responses=OpenApiTypes.STR)
+    @action(methods=["GET"], detail=False, permission_classes=[IsAdminUser])
+    def export(self, request):
+        """Tickets streamed for box-office reconciliation"""
+        return export_response("tickets", request.query_params)
+
+
+class OccupancyAnalyticsViewSet(GenericViewSet):
+    queryset = PerformanceRollup.objects.all()
+    serializer_class = OccupancyReportSerializer
+    permission_classes = (IsAdminUser,)
+
+    def get_queryset(self):
+        query_params = self.request.query_params
+        date_from = _param_to_date(query_params, "date_from")
+        date_to = _param_to_date(query_params, "date_to")
+        plays = _param_to_ids(query_params, "play")
+        theatre_halls = _param_to_ids(query_params, "theatre_hall")
+        queryset = self.queryset
+
+        if date_from:
+            queryset = queryset.filter(day__gte=date_from.date())
+
+        if date_to:
+            queryset = queryset.filter(day__lte=date_to.date())
+
+        if plays:
+            queryset = queryset.filter(play_id__in=plays)
+
+        if theatre_halls:
+            queryset = queryset.filter(theatre_hall_id__in=theatre_halls)
+
+        return queryset
+
+    def get_group_by(self):
+        group_by = self.request.query_params.get("group_by", "day").split(",")
+
+        if not set(group_by) <= set(ROLLUP_GROUPS):
+            raise ValidationError(
+                {"group_by": f"Combine any of: {', '.join(ROLLUP_GROUPS)}"}
+            )
+
+        return list(dict.fromkeys(group_by))
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "group_by",
+                type=OpenApiTypes.STR,
+                description="Comma separated groups out of day, play and "
+                "theatre_hall (ex. ?group_by=play,day), defaults to day",
+            ),
+            OpenApiParameter("date_from", type=OpenApiTypes.DATE),
+            OpenApiParameter("date_to", type=OpenApiTypes.DATE),
+            OpenApiParameter(
+                "play",
+                type={"type": "list", "items": {"type": "number"}},
+                description="Filter by play id (ex. ?play=2,5)",
+            ),
+            OpenApiParameter(
+                "theatre_hall",
+                type={"type": "list", "items": {"type": "number"}},
+                description="Filter by theatre hall id (ex. ?theatre_hall=1)",
+            ),
+        ]
+    )
+    def list(self, request):
+        """Seats sold and fill rate from the performance rollups, the
+        tickets table is never aggregated"""
+        return Response(
+            occupancy_report(self.get_queryset(), self.get_group_by())
+        )
@@ -14,3 +14,7 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "theatre_api.settings")
 
 application = get_asgi_application()
+
+from theatre.schema import warm_schema_cache  # noqa: E402
+
+warm_schema_cache()
@@ -33,6 +33,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "theatre.middleware.QueryBudgetMiddleware",
+    "theatre.middleware.PrimaryPinningMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -68,7 +70,44 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
-    }
+        "CONN_MAX_AGE": 60,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {"timeout": 20},
+    },
+    # Read replicas are declared next to the primary and listed in
+    # THEATRE_DB_REPLICAS, e.g.
+    # "replica": {
+    #     "ENGINE": "django.db.backends.postgresql",
+    #     "HOST": "replica.internal",
+    #     "CONN_MAX_AGE": 60,
+    #     "CONN_HEALTH_CHECKS": True,
+    #     "TEST": {"MIRROR": "default"},
+    # },
+}
+
+DATABASE_ROUTERS = ["theatre.db.ReplicaRouter"]
+
+
+# Caches
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Version stamps invalidating cached responses and ETags, shared by
+    # the workers of a node. Use Redis or Memcached across several nodes.
+    "versions": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR / "cache" / "versions",
+        "OPTIONS": {"MAX_ENTRIES": 100_000},
+    },
+    # Users resolved from JWTs, shared so a deactivated or demoted user
+    # loses access on every worker at once
+    "auth": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR / "cache" / "auth",
+        "OPTIONS": {"MAX_ENTRIES": 100_000},
+    },
 }
 
 
@@ -119,12 +158,17 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "theatre.throttling.AnonBucketThrottle",
+        "theatre.throttling.ScopedBucketThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {"anon": "10/minute", "user": "30/minute"},
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": "10/minute",
+        "user": "30/minute",
+        "catalog": "120/minute",
+        "reservations": "10/minute",
+    },
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.CachedJWTAuthentication",
     ),
 }
 
@@ -140,3 +184,69 @@ SPECTACULAR_SETTINGS = {
         "defaultModelExpandDepth": 2,
     },
 }
+
+# Cache alias and timeout (seconds) of the per-performance seat
+# occupancy bitmaps, keyed by the version stamp of their performance
+THEATRE_OCCUPANCY_CACHE = "default"
+THEATRE_OCCUPANCY_CACHE_TIMEOUT = 3600
+
+# Seconds a seat hold stays valid before it has to be confirmed
+THEATRE_SEAT_HOLD_TTL = 300
+
+# Play search index, defaults to SQLite FTS5 on SQLite databases
+# THEATRE_SEARCH_BACKEND = "theatre.search.DatabaseSearchBackend"
+THEATRE_SEARCH_LIMIT = 500
+
+# Cache alias and timeout (seconds) of the catalog list responses
+THEATRE_RESPONSE_CACHE = "default"
+THEATRE_RESPONSE_CACHE_TIMEOUT = 600
+
+# Cache alias of the version stamps, must be shared by every worker
+THEATRE_VERSION_CACHE = "versions"
+
+# Seconds the version stamp of a single row lives without writes
+THEATRE_ROW_VERSION_TIMEOUT = 86_400
+
+# Threads rendering play image variants, 0 renders them in the request
+THEATRE_IMAGE_WORKERS = 2
+
+# Most queries a safe request may run before it is logged, per URL name
+THEATRE_DEFAULT_QUERY_BUDGET = 10
+THEATRE_QUERY_BUDGETS = {
+    "theatre:play-list": 4,
+    "theatre:play-detail": 4,
+    "theatre:performance-list": 3,
+    "theatre:performance-detail": 5,
+    "theatre:performance-availability": 2,
+    "theatre:reservation-list": 2,
+    "theatre:ticket-list": 3,
+}
+
+# Minutes a performance keeps its hall busy when scheduling a season
+THEATRE_PERFORMANCE_DURATION = 180
+
+# Token buckets of the API throttles, shared by the workers of a node
+THEATRE_THROTTLE_STORE = "theatre.throttling.SQLiteBucketStore"
+THEATRE_THROTTLE_DB = BASE_DIR / "throttle.sqlite3"
+
+# Runs the tests with in-memory throttle buckets
+TEST_RUNNER = "theatre.tests.runner.TestRunner"
+
+# Cache alias and timeout (seconds) of the users resolved from JWTs, the
+# alias must be shared by every worker
+USER_AUTH_CACHE = "auth"
+USER_AUTH_CACHE_TIMEOUT = 60
+
+# Database aliases serving the safe reads, empty keeps them on the primary
+THEATRE_DB_REPLICAS = []
+
+# Seconds a client keeps reading from the primary after a write
+THEATRE_DB_STICKY_SECONDS = 10
+
+# Write-ahead log for SQLite, readers no longer wait for the writer
+THEATRE_SQLITE_WAL = True
+
+# OpenAPI schema built on deploy with "manage.py build_schema", processes
+# generate it once themselves while the file is missing
+THEATRE_SCHEMA_FILE = BASE_DIR / "openapi-schema.json"
+THEATRE_SCHEMA_PRELOAD = True
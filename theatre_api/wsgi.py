@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "theatre_api.settings")
 
 application = get_wsgi_application()
+
+from theatre.schema import warm_schema_cache  # noqa: E402
+
+warm_schema_cache()
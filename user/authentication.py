@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+USER_CACHE_KEY = "user:auth:{user_id}"
+CACHED_USER_FIELDS = ("id", "email", "is_staff", "is_superuser", "is_active")
+
+
+def get_user_cache():
+    return caches[getattr(settings, "USER_AUTH_CACHE", "default")]
+
+
+def _cache_key(user_id):
+    return USER_CACHE_KEY.format(user_id=user_id)
+
+
+def invalidate_cached_user(user_id):
+    get_user_cache().delete(_cache_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT authentication resolving the user from a short-lived cache.
+
+    Only the fields permission checks need are cached; the user comes
+    back with every other field deferred, so reading one of them still
+    loads it from the database.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(jwt_settings.USER_ID_CLAIM)
+
+        if user_id is None or jwt_settings.CHECK_REVOKE_TOKEN:
+            return super().get_user(validated_token)
+
+        cache = get_user_cache()
+        key = _cache_key(user_id)
+        values = cache.get(key)
+
+        if values is None:
+            user = super().get_user(validated_token)
+            cache.set(
+                key,
+                tuple(getattr(user, field) for field in CACHED_USER_FIELDS),
+                timeout=getattr(settings, "USER_AUTH_CACHE_TIMEOUT", 60),
+            )
+            return user
+
+        # from_db expects the values in the model's field order
+        user = self.user_model.from_db(
+            DEFAULT_DB_ALIAS,
+            CACHED_USER_FIELDS,
+            [
+                values[CACHED_USER_FIELDS.index(field.attname)]
+                for field in self.user_model._meta.concrete_fields
+                if field.attname in CACHED_USER_FIELDS
+            ],
+        )
+        if not user.is_active:
+            return super().get_user(validated_token)
+
+        return user